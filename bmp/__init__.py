@@ -17,12 +17,10 @@
     along with this program.  If not, see <https://www.gnu.org/licenses/gpl-3.0.html>.
 """
 
-import bmp.audio as audio
 import bmp.base as base
+import bmp.bench as bench
 import bmp.color as color
-import bmp.editor as editor
-import bmp.execute as execute
-import bmp.game as game
+import bmp.history as history
 import bmp.lang as lang
 import bmp.level as level
 import bmp.levelpack as levelpack
@@ -32,11 +30,21 @@ import bmp.opt as opt
 import bmp.ref as ref
 import bmp.render as render
 import bmp.rule as rule
+import bmp.sim as sim
+import bmp.solve as solve
 import bmp.space as space
-import bmp.sub as sub
+import bmp.speculate as speculate
+import bmp.ticker as ticker
+if not base.headless:
+    import bmp.audio as audio
+    import bmp.editor as editor
+    import bmp.execute as execute
+    import bmp.game as game
+    import bmp.sub as sub
                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                           # monika was there ;)
 __all__ = [
-    "audio", "base", "color", "editor",
-    "execute", "game", "lang", "level", "levelpack",
-    "loc", "obj", "opt", "ref", "render", "rule", "space", "sub",
-]
\ No newline at end of file
+    "base", "bench", "color", "history", "lang", "level", "levelpack",
+    "loc", "obj", "opt", "ref", "render", "rule", "sim", "solve", "space", "speculate", "ticker",
+]
+if not base.headless:
+    __all__ += ["audio", "editor", "execute", "game", "sub"]
\ No newline at end of file
@@ -1,12 +1,17 @@
 import os
 
+import bmp.base
+
 import pygame
 
-pygame.mixer.init()
 sounds: dict[str, pygame.mixer.Sound] = {}
 
-for name in [n for n in os.listdir("sounds") if n.endswith(".ogg")]:
-    sounds[name[:-4]] = pygame.mixer.Sound(os.path.join("sounds", name))
+if not bmp.base.headless:
+    pygame.mixer.init()
+    for name in [n for n in os.listdir("sounds") if n.endswith(".ogg")]:
+        sounds[name[:-4]] = pygame.mixer.Sound(os.path.join("sounds", name))
 
 def play(name: str) -> None:
+    if bmp.base.headless:
+        return
     sounds[name].play()
\ No newline at end of file
@@ -1,8 +1,18 @@
 from typing import Literal, Optional, TypedDict, Callable, NotRequired
+import hashlib
+import os
 import platform
 
+headless_env = "BMP_HEADLESS"
+headless: bool = os.environ.get(headless_env) == "TRUE"
+if headless:
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
 import pygame
-pygame.init()
+if not headless:
+    pygame.init()
 
 def remove_same_elements[T](a_list: list[T], a_func: Optional[Callable[[T, T], bool]] = None) -> list[T]:
     if a_func is None:
@@ -28,6 +38,11 @@ def clampf(__min: float, __num: float, __max: float, /) -> float:
 def absclampf(__num: float, __lim: float, /) -> float:
     return min(abs(__lim), max(__num, -abs(__lim)))
 
+def stable_hash(value: object, /) -> int:
+    return int.from_bytes(hashlib.blake2b(repr(value).encode("utf-8"), digest_size=8).digest())
+
+hash_mask: int = (1 << 64) - 1
+
 def snake_to_camel(__str: str, /, *, is_big: bool) -> str:
     word_list = __str.split("_")
     camel_head = word_list[0].capitalize() if is_big else word_list[0].lower()
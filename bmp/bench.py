@@ -0,0 +1,52 @@
+import random
+import sys
+import time
+
+import bmp.obj
+import bmp.ref
+import bmp.space
+
+type Pattern = list[type[bmp.obj.Text]]
+
+rule_sentence: Pattern = [bmp.obj.TextCursor, bmp.obj.TextIs, bmp.obj.TextPush, bmp.obj.TextAnd, bmp.obj.TextWin]
+rule_words: Pattern = [bmp.obj.TextCursor, bmp.obj.TextLevel, bmp.obj.TextIs, bmp.obj.TextYou, bmp.obj.TextWin, bmp.obj.TextAnd]
+default_sizes: list[int] = [100, 200]
+
+def make_text_space(size: int, pattern: str) -> bmp.space.Space:
+    rng = random.Random(size)
+    object_list: list[bmp.obj.Object] = []
+    for x in range(size):
+        for y in range(size):
+            if pattern == "random":
+                object_list.append(rng.choice(rule_words)((x, y)))
+            else:
+                object_list.append(rule_sentence[(x + y) % len(rule_sentence)]((x, y)))
+    return bmp.space.Space(bmp.ref.SpaceID("bench"), (size, size), object_list=object_list)
+
+def bench_rule(size: int, pattern: str) -> tuple[float, float, int]:
+    space = make_text_space(size, pattern)
+    start = time.perf_counter()
+    space.set_rule()
+    full_time = time.perf_counter() - start
+    text_obj = space.get_objs_from_pos((size // 2, size // 2))[0]
+    space.set_obj_pos(text_obj, text_obj.pos)
+    start = time.perf_counter()
+    space.set_rule()
+    dirty_time = time.perf_counter() - start
+    return full_time, dirty_time, len(space.rule_list)
+
+def main(argv: list[str]) -> int:
+    if len(argv) < 1 or argv[0] != "rule":
+        print("usage: benchbmp.py rule [<size> ...] [--pattern=sentence|random]", file=sys.stderr)
+        return 2
+    pattern = "sentence"
+    size_list: list[int] = []
+    for arg in argv[1:]:
+        if arg.startswith("--pattern="):
+            pattern = arg.removeprefix("--pattern=")
+        else:
+            size_list.append(int(arg))
+    for size in size_list or default_sizes:
+        full_time, dirty_time, rule_count = bench_rule(size, pattern)
+        print(f"{pattern} {size}x{size}: full {full_time * 1000:.1f} ms, one text moved {dirty_time * 1000:.1f} ms, {rule_count} rules")
+    return 0
@@ -1,3 +1,4 @@
+from abc import ABC, abstractmethod
 from typing import Optional
 import os
 import copy
@@ -18,11 +19,178 @@ import bmp.space
 
 import pygame
 
+def insert_item[K, V](dictionary: dict[K, V], index: int, key: K, value: V) -> None:
+    item_list = list(dictionary.items())
+    item_list.insert(index, (key, value))
+    dictionary.clear()
+    dictionary.update(item_list)
+
+class EditCommand(ABC):
+    @abstractmethod
+    def do(self, levelpack: bmp.levelpack.Levelpack) -> None: ...
+    @abstractmethod
+    def undo(self, levelpack: bmp.levelpack.Levelpack) -> None: ...
+
+class PlaceObjects(EditCommand):
+    def __init__(self, space: bmp.space.Space, object_list: list[bmp.obj.Object]) -> None:
+        self.space: bmp.space.Space = space
+        self.object_list: list[bmp.obj.Object] = object_list
+    def do(self, levelpack: bmp.levelpack.Levelpack) -> None:
+        for obj in self.object_list:
+            self.space.new_obj(obj)
+    def undo(self, levelpack: bmp.levelpack.Levelpack) -> None:
+        for obj in reversed(self.object_list):
+            self.space.del_obj(obj)
+
+class PasteObjects(PlaceObjects):
+    def __init__(self, level: bmp.level.Level, space: bmp.space.Space, object_list: list[bmp.obj.Object]) -> None:
+        super().__init__(space, object_list)
+        self.level: bmp.level.Level = level
+        self.old_space_list: list[tuple[bmp.ref.SpaceID, Optional[bmp.space.Space]]] = []
+    def do(self, levelpack: bmp.levelpack.Levelpack) -> None:
+        super().do(levelpack)
+        self.old_space_list = []
+        for obj in self.object_list:
+            if isinstance(obj, bmp.obj.SpaceObject):
+                for level in levelpack.level_list:
+                    space = level.get_space(obj.space_id)
+                    if space is not None:
+                        for new_space in level.space_list:
+                            self.old_space_list.append((new_space.space_id, self.level.get_space(new_space.space_id)))
+                            self.level.set_space(new_space)
+    def undo(self, levelpack: bmp.levelpack.Levelpack) -> None:
+        for space_id, old_space in reversed(self.old_space_list):
+            if old_space is None:
+                self.level.space_dict.pop(space_id)
+            else:
+                self.level.set_space(old_space, space_id)
+        super().undo(levelpack)
+
+class DeleteObjects(EditCommand):
+    def __init__(self, space: bmp.space.Space, pos: bmp.loc.Coord[int]) -> None:
+        self.space: bmp.space.Space = space
+        self.pos: bmp.loc.Coord[int] = pos
+        self.object_list: list[tuple[int, bmp.obj.Object]] = []
+    def do(self, levelpack: bmp.levelpack.Levelpack) -> None:
+        self.object_list = sorted((self.space.object_list.index(o), o) for o in self.space.get_objs_from_pos(self.pos))
+        self.space.del_objs_from_pos(self.pos)
+    def undo(self, levelpack: bmp.levelpack.Levelpack) -> None:
+        for index, obj in self.object_list:
+            self.space.insert_obj(index, obj)
+
+class NewSpace(EditCommand):
+    def __init__(self, level: bmp.level.Level, space: bmp.space.Space) -> None:
+        self.level: bmp.level.Level = level
+        self.space: bmp.space.Space = space
+        self.old_space_id: bmp.ref.SpaceID = level.current_space_id
+    def do(self, levelpack: bmp.levelpack.Levelpack) -> None:
+        self.level.space_dict[self.space.space_id] = self.space
+        self.level.current_space_id = self.space.space_id
+    def undo(self, levelpack: bmp.levelpack.Levelpack) -> None:
+        self.level.space_dict.pop(self.space.space_id)
+        self.level.current_space_id = self.old_space_id
+
+class NewLevel(EditCommand):
+    def __init__(self, level: bmp.level.Level, space: bmp.space.Space, old_level_id: bmp.ref.LevelID) -> None:
+        self.level: bmp.level.Level = level
+        self.space: bmp.space.Space = space
+        self.old_level_id: bmp.ref.LevelID = old_level_id
+    def do(self, levelpack: bmp.levelpack.Levelpack) -> None:
+        levelpack.space_dict[self.space.space_id] = self.space
+        levelpack.set_level(self.level.level_id, self.level)
+        levelpack.current_level_id = self.level.level_id
+    def undo(self, levelpack: bmp.levelpack.Levelpack) -> None:
+        levelpack.level_dict.pop(self.level.level_id)
+        levelpack.space_dict.pop(self.space.space_id)
+        levelpack.current_level_id = self.old_level_id
+
+class DeleteSpace(EditCommand):
+    def __init__(self, level: bmp.level.Level) -> None:
+        self.level: bmp.level.Level = level
+        self.space_id: bmp.ref.SpaceID = level.current_space_id
+        self.index: int = level.space_included.index(self.space_id)
+        self.space: Optional[bmp.space.Space] = None
+        self.space_index: int = 0
+        self.new_space_id: Optional[bmp.ref.SpaceID] = None
+    def do(self, levelpack: bmp.levelpack.Levelpack) -> None:
+        self.level.space_included.remove(self.space_id)
+        self.space = None
+        if all(map(lambda l: self.space_id not in l.space_included, levelpack.level_dict.values())):
+            self.space_index = list(levelpack.space_dict.keys()).index(self.space_id)
+            self.space = levelpack.space_dict.pop(self.space_id)
+        if self.new_space_id is None:
+            self.new_space_id = random.choice(self.level.space_included)
+        self.level.current_space_id = self.new_space_id
+    def undo(self, levelpack: bmp.levelpack.Levelpack) -> None:
+        self.level.space_included.insert(self.index, self.space_id)
+        if self.space is not None:
+            insert_item(levelpack.space_dict, self.space_index, self.space_id, self.space)
+        self.level.current_space_id = self.space_id
+
+class DeleteLevel(EditCommand):
+    def __init__(self, level_id: bmp.ref.LevelID) -> None:
+        self.level_id: bmp.ref.LevelID = level_id
+        self.level: Optional[bmp.level.Level] = None
+        self.level_init_state: Optional[bmp.level.Level] = None
+        self.level_index: int = 0
+        self.new_level_id: Optional[bmp.ref.LevelID] = None
+    def do(self, levelpack: bmp.levelpack.Levelpack) -> None:
+        self.level_index = list(levelpack.level_dict.keys()).index(self.level_id)
+        self.level = levelpack.level_dict[self.level_id]
+        self.level_init_state = levelpack.level_init_state_dict[self.level_id]
+        levelpack.del_level(self.level_id)
+        if self.new_level_id is None:
+            self.new_level_id = random.choice(list(levelpack.level_dict.keys()))
+        levelpack.current_level_id = self.new_level_id
+    def undo(self, levelpack: bmp.levelpack.Levelpack) -> None:
+        if self.level is not None and self.level_init_state is not None:
+            self.level.space_dict = levelpack.space_dict
+            insert_item(levelpack.level_dict, self.level_index, self.level_id, self.level)
+            levelpack.set_level_init_state(self.level_id, self.level_init_state)
+        levelpack.current_level_id = self.level_id
+
+class EditHistory(object):
+    def __init__(self, limit: Optional[int] = None) -> None:
+        self.limit: int = limit if limit is not None else bmp.opt.options["editor"].get("history_limit", bmp.opt.default_editor_history_limit)
+        self.undo_list: list[list[EditCommand]] = []
+        self.redo_list: list[list[EditCommand]] = []
+        self.in_stroke: bool = False
+    def end_stroke(self) -> None:
+        self.in_stroke = False
+    def do(self, levelpack: bmp.levelpack.Levelpack, command: EditCommand, stroke: bool = False) -> None:
+        command.do(levelpack)
+        if stroke and self.in_stroke and len(self.undo_list) != 0:
+            self.undo_list[-1].append(command)
+        else:
+            self.undo_list.append([command])
+        self.in_stroke = stroke
+        self.redo_list.clear()
+        if self.limit > 0 and len(self.undo_list) > self.limit:
+            del self.undo_list[:len(self.undo_list) - self.limit]
+    def undo(self, levelpack: bmp.levelpack.Levelpack) -> bool:
+        self.in_stroke = False
+        if len(self.undo_list) == 0:
+            return False
+        command_list = self.undo_list.pop()
+        for command in reversed(command_list):
+            command.undo(levelpack)
+        self.redo_list.append(command_list)
+        return True
+    def redo(self, levelpack: bmp.levelpack.Levelpack) -> bool:
+        self.in_stroke = False
+        if len(self.redo_list) == 0:
+            return False
+        command_list = self.redo_list.pop()
+        for command in command_list:
+            command.do(levelpack)
+        self.undo_list.append(command_list)
+        return True
+
 def levelpack_editor(levelpack: bmp.levelpack.Levelpack) -> bmp.levelpack.Levelpack:
     for level in levelpack.level_list:
         for space in level.space_list:
             space.set_sprite_states(0)
-    history = [copy.deepcopy(levelpack)]
+    history = EditHistory()
     current_object_type: type[bmp.obj.Object] = bmp.obj.TextSpace
     current_orient = bmp.loc.Orient.S
     current_cursor_pos: bmp.loc.Coord[int] = (0, 0)
@@ -145,6 +313,8 @@ def levelpack_editor(levelpack: bmp.levelpack.Levelpack) -> bmp.levelpack.Levelp
             if current_cursor_pos != mouse_pos_in_space:
                 cursor_pos_changed = True
             current_cursor_pos = mouse_pos_in_space
+        if mouses[0] <= 1 and mouses[2] <= 1:
+            history.end_stroke()
         if any(mouses):
             if not levelpack.current_level.current_space.out_of_range(mouse_pos_in_space):
                 if mouses[0] != 0:
@@ -171,7 +341,7 @@ def levelpack_editor(levelpack: bmp.levelpack.Levelpack) -> bmp.levelpack.Levelp
                     elif mouses[0] == 1 or cursor_pos_changed:
                         # place object; with detail (shift); allow overlap (ctrl)
                         if keys["LSHIFT"] or keys["RSHIFT"] or len(levelpack.current_level.current_space.get_objs_from_pos(current_cursor_pos)) == 0:
-                            history.append(copy.deepcopy(levelpack))
+                            new_obj: bmp.obj.Object
                             if issubclass(current_object_type, bmp.obj.LevelObject):
                                 if keys["LCTRL"] or keys["RCTRL"]:
                                     bmp.lang.print(bmp.lang.seperator_line(bmp.lang.fformat("title.new")))
@@ -188,7 +358,7 @@ def levelpack_editor(levelpack: bmp.levelpack.Levelpack) -> bmp.levelpack.Levelp
                                     icon_name = "text_level"
                                     icon_color = bmp.color.current_palette[bmp.obj.default_level_object_type.sprite_palette]
                                 level_extra: bmp.obj.LevelObjectExtra = {"icon": {"name": icon_name, "color": icon_color}}
-                                levelpack.current_level.current_space.new_obj(current_object_type(current_cursor_pos, current_orient, level_id=level_id, level_extra=level_extra)) # type: ignore
+                                new_obj = current_object_type(current_cursor_pos, current_orient, level_id=level_id, level_extra=level_extra) # type: ignore
                             elif issubclass(current_object_type, bmp.obj.SpaceObject):
                                 space_id: bmp.ref.SpaceID = levelpack.current_level.current_space_id
                                 if keys["LCTRL"] or keys["RCTRL"]:
@@ -196,7 +366,7 @@ def levelpack_editor(levelpack: bmp.levelpack.Levelpack) -> bmp.levelpack.Levelp
                                     name = bmp.lang.input_str(bmp.lang.fformat("edit.space.new.name"))
                                     infinite_tier = bmp.lang.input_int(bmp.lang.fformat("edit.space.new.infinite_tier"))
                                     space_id = bmp.ref.SpaceID(name, infinite_tier)
-                                levelpack.current_level.current_space.new_obj(current_object_type(current_cursor_pos, current_orient, space_id=space_id))
+                                new_obj = current_object_type(current_cursor_pos, current_orient, space_id=space_id)
                             elif issubclass(current_object_type, bmp.obj.Path):
                                 unlocked = False
                                 conditions: dict[type[bmp.obj.Object], int] = {}
@@ -214,9 +384,10 @@ def levelpack_editor(levelpack: bmp.levelpack.Levelpack) -> bmp.levelpack.Levelp
                                         collects_count = bmp.lang.input_int(bmp.lang.fformat("input.number"))
                                         conditions[collects_type] = collects_count
                                         more_condition = bmp.lang.input_yes(bmp.lang.fformat("edit.path.new.condition"))
-                                levelpack.current_level.current_space.new_obj(current_object_type(current_cursor_pos, current_orient, unlocked=unlocked, conditions=conditions)) # type: ignore
+                                new_obj = current_object_type(current_cursor_pos, current_orient, unlocked=unlocked, conditions=conditions) # type: ignore
                             else:
-                                levelpack.current_level.current_space.new_obj(current_object_type(current_cursor_pos, current_orient))
+                                new_obj = current_object_type(current_cursor_pos, current_orient)
+                            history.do(levelpack, PlaceObjects(levelpack.current_level.current_space, [new_obj]), stroke=True)
                 elif mouses[2] != 0:
                     if mouses[2] == 1 and (keys["LALT"] or keys["RALT"]):
                         # leave space; leave level (shift)
@@ -231,8 +402,8 @@ def levelpack_editor(levelpack: bmp.levelpack.Levelpack) -> bmp.levelpack.Levelp
                                 space_changed = True
                     elif mouses[2] == 1 or cursor_pos_changed:
                         # new space; new level (alt)
-                        history.append(copy.deepcopy(levelpack))
-                        levelpack.current_level.current_space.del_objs_from_pos(current_cursor_pos)
+                        if len(levelpack.current_level.current_space.get_objs_from_pos(current_cursor_pos)) != 0:
+                            history.do(levelpack, DeleteObjects(levelpack.current_level.current_space, current_cursor_pos), stroke=True)
                 elif mouses[1] == 1:
                     # object select from cursor
                     objects_under_cursor = levelpack.current_level.current_space.get_objs_from_pos(current_cursor_pos)
@@ -301,7 +472,6 @@ def levelpack_editor(levelpack: bmp.levelpack.Levelpack) -> bmp.levelpack.Levelp
             if keys["LALT"] or keys["RALT"]:
                 bmp.lang.print(bmp.lang.seperator_line(bmp.lang.fformat("title.new")))
                 if bmp.lang.input_no(bmp.lang.fformat("edit.level.new")):
-                    history.append(copy.deepcopy(levelpack))
                     level_name = bmp.lang.input_str(bmp.lang.fformat("edit.level.new.name"))
                     level_id: bmp.ref.LevelID = bmp.ref.LevelID(level_name)
                     super_level_name = bmp.lang.input_str(bmp.lang.fformat("edit.level.new.super_level.name"))
@@ -315,25 +485,23 @@ def levelpack_editor(levelpack: bmp.levelpack.Levelpack) -> bmp.levelpack.Levelp
                         default = bmp.opt.options["editor"]["default_space"]["color"],
                     )
                     space_id = bmp.ref.SpaceID(name, infinite_tier)
-                    levelpack.space_dict[space_id] = bmp.space.Space(space_id, (width, height), space_color)
+                    new_space = bmp.space.Space(space_id, (width, height), space_color)
                     map_info: Optional[bmp.level.MapLevelExtraJson] = None
                     if bmp.lang.input_yes(bmp.lang.fformat("edit.level.new.is_map")):
                         map_info = {}
                         spore_for_blossom = bmp.lang.input_int_optional(bmp.lang.fformat("edit.level.new.spore_for_blossom"))
                         if spore_for_blossom is not None:
                             map_info["spore_for_blossom"] = spore_for_blossom
-                    levelpack.level_dict[level_id] = bmp.level.Level(
+                    new_level = bmp.level.Level(
                         level_id, [space_id], space_id,
                         super_level_id = super_level_id,
                         map_info = map_info,
                     )
-                    levelpack.level_dict[level_id].space_dict = levelpack.space_dict
-                    levelpack.current_level_id = level_id
+                    history.do(levelpack, NewLevel(new_level, new_space, levelpack.current_level_id))
                     level_changed = True
-                    del level_id, space_id
+                    del level_id, space_id, new_level, new_space
             else:
                 if bmp.lang.input_no(bmp.lang.fformat("edit.space.new")):
-                    history.append(copy.deepcopy(levelpack))
                     name = bmp.lang.input_str(bmp.lang.fformat("edit.space.new.name"))
                     width = bmp.lang.input_int(bmp.lang.fformat("edit.space.new.width"), default=bmp.opt.options["editor"]["default_space"]["width"])
                     height = bmp.lang.input_int(bmp.lang.fformat("edit.space.new.height"), default=bmp.opt.options["editor"]["default_space"]["height"])
@@ -343,8 +511,7 @@ def levelpack_editor(levelpack: bmp.levelpack.Levelpack) -> bmp.levelpack.Levelp
                         default = bmp.opt.options["editor"]["default_space"]["color"],
                     )
                     space_id = bmp.ref.SpaceID(name, infinite_tier)
-                    levelpack.current_level.space_dict[space_id] = bmp.space.Space(space_id, (width, height), space_color)
-                    levelpack.current_level.current_space_id = space_id
+                    history.do(levelpack, NewSpace(levelpack.current_level, bmp.space.Space(space_id, (width, height), space_color)))
                     space_changed = True
                     del space_id
         # delete current space / level (alt)
@@ -352,18 +519,11 @@ def levelpack_editor(levelpack: bmp.levelpack.Levelpack) -> bmp.levelpack.Levelp
             bmp.lang.print(bmp.lang.seperator_line(bmp.lang.fformat("title.delete")))
             if keys["LALT"] or keys["RALT"]:
                 if bmp.lang.input_yes(bmp.lang.fformat("edit.level.delete")):
-                    levelpack.del_level(levelpack.current_level_id)
-                    levelpack.current_level_id = random.choice(list(levelpack.level_dict.keys()))
+                    history.do(levelpack, DeleteLevel(levelpack.current_level_id))
                     level_changed = True
             else:
                 if bmp.lang.input_yes(bmp.lang.fformat("edit.space.delete")):
-                    levelpack.current_level.space_included.remove(levelpack.current_level.current_space_id)
-                    if all(map(
-                        lambda l: levelpack.current_level.current_space_id not in l.space_included,
-                        levelpack.level_dict.values()
-                    )):
-                        levelpack.space_dict.pop(levelpack.current_level.current_space_id)
-                    levelpack.current_level.current_space_id = random.choice(levelpack.current_level.space_included)
+                    history.do(levelpack, DeleteSpace(levelpack.current_level))
                     space_changed = True
         # add global rule; remove global rule (shift)
         elif keys["R"]:
@@ -401,36 +561,27 @@ def levelpack_editor(levelpack: bmp.levelpack.Levelpack) -> bmp.levelpack.Levelp
             else:
                 levelpack.current_level.current_space_id.name = bmp.lang.input_str(bmp.lang.fformat("edit.space.rename"))
                 levelpack.current_level.current_space_id.infinite_tier = bmp.lang.input_int(bmp.lang.fformat("edit.space.new.infinite_tier"))
-        # undo
+        # undo; redo (shift)
         elif keys["Z"] and (keys["LCTRL"] or keys["RCTRL"]):
-            if len(history) > 1:
-                levelpack = copy.deepcopy(history.pop())
+            if keys["LSHIFT"] or keys["RSHIFT"]:
+                history.redo(levelpack)
             else:
-                levelpack = copy.deepcopy(history[0])
+                history.undo(levelpack)
             level_changed = True
         # cut, copy, paste
         elif keys["X"] and (keys["LCTRL"] or keys["RCTRL"]):
-            history.append(copy.deepcopy(levelpack))
             current_clipboard = levelpack.current_level.current_space.get_objs_from_pos(current_cursor_pos)
             current_clipboard = copy.deepcopy(current_clipboard)
-            levelpack.current_level.current_space.del_objs_from_pos(current_cursor_pos)
+            history.do(levelpack, DeleteObjects(levelpack.current_level.current_space, current_cursor_pos))
         elif keys["C"] and (keys["LCTRL"] or keys["RCTRL"]):
-            history.append(copy.deepcopy(levelpack))
             current_clipboard = levelpack.current_level.current_space.get_objs_from_pos(current_cursor_pos)
             current_clipboard = copy.deepcopy(current_clipboard)
         elif keys["V"] and (keys["LCTRL"] or keys["RCTRL"]):
-            history.append(copy.deepcopy(levelpack))
             current_clipboard = copy.deepcopy(current_clipboard)
             for obj in current_clipboard:
-                obj.reset_uuid()
+                obj.reset_uid()
                 obj.pos = current_cursor_pos
-                levelpack.current_level.current_space.new_obj(obj)
-                if isinstance(obj, bmp.obj.SpaceObject):
-                    for level in levelpack.level_list:
-                        space = level.get_space(obj.space_id)
-                        if space is not None:
-                            for new_space in level.space_list:
-                                levelpack.current_level.set_space(new_space)
+            history.do(levelpack, PasteObjects(levelpack.current_level, levelpack.current_level.current_space, list(current_clipboard)))
         elif keys["TAB"]:
             bmp.lang.print(bmp.lang.seperator_line(bmp.lang.fformat("title.level")))
             bmp.lang.fprint("edit.level.current.name", value=levelpack.current_level_id.name)
@@ -7,6 +7,7 @@ import random
 import bmp.audio
 import bmp.base
 import bmp.color
+import bmp.history
 import bmp.lang
 import bmp.level
 import bmp.levelpack
@@ -14,7 +15,10 @@ import bmp.loc
 import bmp.obj
 import bmp.ref
 import bmp.render
+import bmp.replay
 import bmp.space
+import bmp.speculate
+import bmp.ticker
 
 import pygame
 
@@ -66,8 +70,13 @@ movements: dict[str, tuple[str, Optional[bmp.loc.Orient], bmp.loc.Coord]] = {
     " ": ("None", None, (0, 0)),
     "RETURN": ("None", None, (0, 0)),
 }
+action_keys: list[str] = ["Z", "R", "O", "P", "TAB", "ESCAPE"]
 
 def play(levelpack: bmp.levelpack.Levelpack) -> bmp.levelpack.Levelpack:
+    if levelpack.seed is None:
+        levelpack.set_seed(bmp.levelpack.new_seed())
+    replay = bmp.replay.start(levelpack)
+    space_rng = random.Random(levelpack.seed)
     levelpack.prepare()
     for level in levelpack.level_list:
         for space in level.space_list:
@@ -75,13 +84,13 @@ def play(levelpack: bmp.levelpack.Levelpack) -> bmp.levelpack.Levelpack:
         levelpack.set_level_init_state(level.level_id, copy.deepcopy(level))
     levelpack_unchanged = copy.deepcopy(levelpack)
     levelpack_info: bmp.levelpack.ReturnInfo = bmp.levelpack.default_levelpack_info.copy()
-    history: list[tuple[
-        bmp.levelpack.Levelpack,
-        bmp.levelpack.ReturnInfo
-    ]] = [(
-        copy.deepcopy(levelpack),
-        levelpack_info.copy()
-    )]
+    history = bmp.history.History(levelpack, levelpack_info)
+    speculator: Optional[bmp.speculate.Speculator] = None
+    if bmp.opt.options["gameplay"].get("speculative", False):
+        speculator = bmp.speculate.Speculator()
+    ticker = bmp.ticker.Ticker(levelpack, history, levelpack_info, speculator)
+    deferred_keys_list: list[dict[str, bool]] = []
+    continued_levelpack: Optional[bmp.levelpack.Levelpack] = None
     savepoint_dict: dict[str, tuple[bmp.levelpack.Levelpack, bmp.levelpack.ReturnInfo]] = {}
     default_savepoint_name = "_"
     window = pygame.display.set_mode((720, 720), pygame.RESIZABLE)
@@ -122,6 +131,7 @@ def play(levelpack: bmp.levelpack.Levelpack) -> bmp.levelpack.Levelpack:
     game_running = True
     display_refresh = False
     levelpack_refresh = False
+    speculation_refresh = speculator is not None
     press_key_to_continue = False
     while game_running:
         frame += 1
@@ -166,31 +176,49 @@ def play(levelpack: bmp.levelpack.Levelpack) -> bmp.levelpack.Levelpack:
             (mouse_pos[0] - space_surface_pos[0]) * levelpack.current_level.current_space.width // space_surface_size[0],
             (mouse_pos[1] - space_surface_pos[1]) * levelpack.current_level.current_space.height // space_surface_size[1]
         )
-        if not press_key_to_continue:
-            for key, (negative_key, op, (dx, dy)) in movements.items():
-                if keys[key] and not keys.get(negative_key, False):
-                    new_history: tuple[bmp.levelpack.Levelpack, bmp.levelpack.ReturnInfo] = (
-                        copy.deepcopy(levelpack),
-                        levelpack.tick(op)
-                    )
-                    history.append(new_history)
-                    levelpack_info = new_history[1]
-                    if levelpack.current_level.game_properties.enabled(bmp.obj.TextYou):
-                        game_offset[0] += dx * window.get_width() / levelpack.current_level.current_space.width
-                        game_offset[1] += dy * window.get_height() / levelpack.current_level.current_space.height
-                    if levelpack.current_level.game_properties.enabled(bmp.obj.TextPush) and levelpack_info["game_push"]:
-                        game_offset[0] += dx * window.get_width() / levelpack.current_level.current_space.width
-                        game_offset[1] += dy * window.get_height() / levelpack.current_level.current_space.height
-                    display_refresh = True
-                    levelpack_refresh = True
-                    break
-        else:
-            for key in movements.keys():
-                if keys[key]:
-                    display_refresh = True
-                    levelpack_refresh = True
-                    break
-        if not levelpack_refresh:
+        tick_result = ticker.get()
+        if tick_result is not None:
+            new_levelpack, levelpack_info, op, continued = tick_result
+            if continued:
+                continued_levelpack = new_levelpack
+            else:
+                levelpack = new_levelpack
+                replay.record_move(op)
+                dx, dy = bmp.loc.front_position((0, 0), op) if op is not None else (0, 0)
+                if levelpack.current_level.game_properties.enabled(bmp.obj.TextYou):
+                    game_offset[0] += dx * window.get_width() / levelpack.current_level.current_space.width
+                    game_offset[1] += dy * window.get_height() / levelpack.current_level.current_space.height
+                if levelpack.current_level.game_properties.enabled(bmp.obj.TextPush) and levelpack_info["game_push"]:
+                    game_offset[0] += dx * window.get_width() / levelpack.current_level.current_space.width
+                    game_offset[1] += dy * window.get_height() / levelpack.current_level.current_space.height
+                del dx, dy
+            del new_levelpack, op, continued
+            display_refresh = True
+            levelpack_refresh = True
+        # keys pressed while a tick is running wait for it, so the inputs stay in order
+        ticker_busy = levelpack_refresh or not ticker.idle()
+        action_pressed = any(keys[k] for k in action_keys)
+        if (ticker_busy and action_pressed) or (len(deferred_keys_list) != 0 and (action_pressed or any(keys[k] for k in movements.keys()))):
+            deferred_keys_list.append({k: keys[k] for k in action_keys + list(movements.keys()) + list(keymods.values())})
+            for key in action_keys + list(movements.keys()):
+                keys[key] = False
+        elif not ticker_busy and len(deferred_keys_list) != 0:
+            for key, pressed in deferred_keys_list.pop(0).items():
+                keys[key] = keys[key] or pressed
+        del action_pressed
+        for key, (negative_key, op, _) in movements.items():
+            if keys[key] and not keys.get(negative_key, False):
+                if not ticker_busy:
+                    ticker.set_state(levelpack, history, levelpack_info, press_key_to_continue)
+                # the ticker changes its levelpack in place from now on, so keep drawing a copy
+                if ticker.idle():
+                    levelpack = bmp.ticker.copy_for_render(levelpack)
+                    if continued_levelpack is not None:
+                        continued_levelpack = bmp.ticker.copy_for_render(continued_levelpack)
+                ticker.put(op)
+                ticker_busy = True
+                break
+        if not ticker_busy:
             if any(mouses) and not levelpack.current_level.current_space.out_of_range(mouse_pos_in_space):
                 visible_space_list: list[bmp.space.Space] = [
                     s for s in levelpack.current_level.space_list
@@ -208,7 +236,8 @@ def play(levelpack: bmp.levelpack.Levelpack) -> bmp.levelpack.Levelpack:
                         and not s.properties[bmp.obj.default_space_object_type].enabled(bmp.obj.TextHide)
                     ]
                     if len(sub_spaces) != 0:
-                        levelpack.current_level.current_space = random.choice(sub_spaces)
+                        levelpack.current_level.current_space = space_rng.choice(sub_spaces)
+                        replay.record_space(levelpack.current_level.current_space_id)
                         space_changed = True
                         display_refresh = True
                 elif mouses[2] == 1:
@@ -218,7 +247,8 @@ def play(levelpack: bmp.levelpack.Levelpack) -> bmp.levelpack.Levelpack:
                         and not s.properties[bmp.obj.default_space_object_type].enabled(bmp.obj.TextHide)
                     ]
                     if len(super_spaces) != 0:
-                        levelpack.current_level.current_space = random.choice(super_spaces)
+                        levelpack.current_level.current_space = space_rng.choice(super_spaces)
+                        replay.record_space(levelpack.current_level.current_space_id)
                         space_changed = True
                         display_refresh = True
                 elif mouses[1] == 1:
@@ -232,52 +262,41 @@ def play(levelpack: bmp.levelpack.Levelpack) -> bmp.levelpack.Levelpack:
                     current_space_index += 1 if mouses[3] else -1
                     current_space_index = current_space_index % len(visible_space_list) if current_space_index >= 0 else len(visible_space_list) - 1
                     levelpack.current_level.current_space = visible_space_list[current_space_index]
+                    replay.record_space(levelpack.current_level.current_space_id)
                     space_changed = True
                     display_refresh = True
                     del current_space_index
             elif keys["Z"]:
-                if len(history) >= 1:
-                    levelpack = copy.deepcopy(history[-1][0])
-                    levelpack_info = copy.deepcopy(history[-1][1])
-                    if len(history) != 1:
-                        history.pop()
-                    level_changed = True
-                    display_refresh = True
-                    press_key_to_continue = False
+                levelpack, levelpack_info = history.undo()
+                replay.record(bmp.replay.undo_input)
+                level_changed = True
+                display_refresh = True
+                press_key_to_continue = False
             elif keys["ESCAPE"]:
                 if levelpack.current_level.super_level_id is not None and levelpack.current_level.super_level_id in levelpack.level_dict.keys():
                     levelpack.current_level_id = levelpack.current_level.super_level_id
-                    new_history: tuple[bmp.levelpack.Levelpack, bmp.levelpack.ReturnInfo] = (
-                        copy.deepcopy(levelpack),
-                        bmp.levelpack.default_levelpack_info.copy()
-                    )
-                    history.append(new_history)
+                    history.push(levelpack)
+                    replay.record(bmp.replay.escape_input)
                     level_changed = True
                     display_refresh = True
             elif keys["R"]:
                 restart_failed = True
                 if not (keys["LCTRL"] or keys["RCTRL"]):
-                    for index, (old_levelpack, old_levelpack_info) in reversed(list(enumerate(history))):
-                        if index == 0 or history[index - 1][1]["select"] is not None:
-                            bmp.lang.fprint("play.level.restart")
-                            bmp.audio.play("restart")
-                            levelpack = copy.deepcopy(old_levelpack)
-                            levelpack_info = old_levelpack_info.copy()
-                            history = history[:index + 1]
-                            level_changed = True
-                            display_refresh = True
-                            press_key_to_continue = False
-                            restart_failed = False
-                            break
+                    bmp.lang.fprint("play.level.restart")
+                    bmp.audio.play("restart")
+                    levelpack, levelpack_info = history.restart()
+                    replay.record(bmp.replay.restart_input)
+                    level_changed = True
+                    display_refresh = True
+                    press_key_to_continue = False
+                    restart_failed = False
                 else:
                     bmp.lang.fprint("play.level.restart" if restart_failed else "play.levelpack.restart")
                     bmp.audio.play("restart")
                     levelpack = copy.deepcopy(levelpack_unchanged)
                     levelpack_info = bmp.levelpack.default_levelpack_info.copy()
-                    history = [(
-                        copy.deepcopy(levelpack),
-                        levelpack_info.copy()
-                    )]
+                    history = bmp.history.History(levelpack, levelpack_info)
+                    replay.record(bmp.replay.reset_input)
                     level_changed = True
                     display_refresh = True
                     press_key_to_continue = False
@@ -295,7 +314,10 @@ def play(levelpack: bmp.levelpack.Levelpack) -> bmp.levelpack.Levelpack:
                         with open(os.path.join("levelpacks", savepoint_name), "r", encoding="utf-8") as file:
                             levelpack_json = json.load(file)
                         levelpack = bmp.levelpack.json_to_levelpack(levelpack_json)
+                        if levelpack.seed is None:
+                            levelpack.set_seed(bmp.levelpack.new_seed())
                         levelpack_info = bmp.levelpack.default_levelpack_info.copy()
+                        replay = bmp.replay.start(levelpack)
                         bmp.lang.fprint("play.savepoint.loaded", value=savepoint_name)
                         level_changed = True
                         display_refresh = True
@@ -304,14 +326,26 @@ def play(levelpack: bmp.levelpack.Levelpack) -> bmp.levelpack.Levelpack:
                     savepoint_name = savepoint_name if savepoint_name != "" else default_savepoint_name
                     savepoint = savepoint_dict.get(savepoint_name)
                     if savepoint is not None:
-                        levelpack = savepoint[0]
-                        levelpack_info = savepoint[1]
+                        levelpack = copy.deepcopy(savepoint[0])
+                        levelpack_info = savepoint[1].copy()
+                        replay = bmp.replay.start(levelpack)
                         bmp.lang.fprint("play.savepoint.loaded", value=savepoint_name)
                         level_changed = True
                         display_refresh = True
                         press_key_to_continue = False
                     else:
                         bmp.lang.fwarn("warn.savepoint.not_found", value=savepoint_name)
+            elif keys["P"] and (keys["LSHIFT"] or keys["RSHIFT"]):
+                bmp.lang.print(bmp.lang.seperator_line(bmp.lang.fformat("title.replay")))
+                replay_name = ""
+                if keys["LCTRL"] or keys["RCTRL"]:
+                    replay_name = bmp.lang.input_str(bmp.lang.fformat("input.replay.name"))
+                replay_name = replay_name if replay_name != "" else default_savepoint_name
+                replay_name += "" if bmp.opt.options["debug"] or replay_name.endswith(".json") else ".json"
+                os.makedirs("replays", exist_ok=True)
+                with open(os.path.join("replays", replay_name), "w", encoding="utf-8") as file:
+                    json.dump(replay.to_json(), file, **bmp.opt.get_json_dump_kwds())
+                bmp.lang.fprint("play.replay.saved", value=replay_name, count=len(replay.input_list))
             elif keys["P"]:
                 bmp.lang.print(bmp.lang.seperator_line(bmp.lang.fformat("title.savepoint")))
                 savepoint_name = ""
@@ -466,30 +500,21 @@ def play(levelpack: bmp.levelpack.Levelpack) -> bmp.levelpack.Levelpack:
             else:
                 press_key_to_continue = False
                 level_changed = True
-                select = levelpack_info["select"]
-                if levelpack_info["win"]:
-                    levelpack.reset_level(levelpack.current_level_id)
-                    if levelpack.current_level.super_level_id is not None and levelpack.current_level.super_level_id in levelpack.level_dict.keys():
-                        levelpack.current_level_id = levelpack.current_level.super_level_id
-                elif levelpack_info["end"]:
+                if levelpack_info["end"] or levelpack_info["done"]:
                     game_running = False
-                elif levelpack_info["done"]:
-                    game_running = False
-                elif levelpack_info["transform"]:
-                    if levelpack.current_level.super_level_id is not None and levelpack.current_level.super_level_id in levelpack.level_dict.keys():
-                        levelpack.current_level_id = levelpack.current_level.super_level_id
-                elif select is not None:
-                    selected_level_id: bmp.ref.LevelID = random.choice(select)
-                    if selected_level_id in levelpack.level_dict.keys():
-                        levelpack.current_level_id = selected_level_id
-                    del selected_level_id
-                levelpack.prepare()
+                if continued_levelpack is not None:
+                    levelpack = continued_levelpack
+                    continued_levelpack = None
+                replay.record(bmp.replay.continue_input)
             levelpack_refresh = False
         if display_refresh:
-            for level in levelpack.level_list:
-                for space in levelpack.current_level.space_list:
-                    space.set_sprite_states(len(history))
+            if tick_result is None:
+                bmp.ticker.set_sprite_states(levelpack, len(history))
             display_refresh = False
+            if speculator is not None:
+                if ticker.idle():
+                    speculator.cancel()
+                speculation_refresh = not press_key_to_continue
         if not press_key_to_continue:
             monochrome = None
         if level_changed:
@@ -604,7 +629,11 @@ def play(levelpack: bmp.levelpack.Levelpack) -> bmp.levelpack.Levelpack:
         if keys["F12"]:
             bmp.opt.options["debug"] = not bmp.opt.options["debug"]
         pygame.display.flip()
+        if speculator is not None and speculation_refresh and ticker.idle():
+            speculator.start(levelpack)
+            speculation_refresh = False
         milliseconds = clock.tick(bmp.opt.options["render"]["fps"])
+    ticker.stop()
     pygame.mixer.music.stop()
     pygame.display.quit()
     return levelpack
\ No newline at end of file
@@ -0,0 +1,282 @@
+from typing import Any, Optional
+import copy
+
+import bmp.level
+import bmp.levelpack
+import bmp.loc
+import bmp.obj
+import bmp.opt
+import bmp.ref
+import bmp.space
+
+type ObjectState = tuple[
+    bmp.loc.Coord[int],
+    bmp.loc.Orient,
+    Optional[tuple[str, int]],
+    Optional[str],
+    dict[bmp.loc.Orient, bmp.loc.Orient],
+    Any,
+]
+
+def get_object_state(obj: bmp.obj.Object) -> ObjectState:
+    extra: Any = None
+    if isinstance(obj, bmp.obj.SpaceObject):
+        extra = (obj.space_extra["static_transform"], obj.space_extra["dynamic_transform"])
+    elif isinstance(obj, bmp.obj.Path):
+        extra = obj.unlocked
+    return (
+        obj.pos,
+        obj.orient,
+        (obj.space_id.name, obj.space_id.infinite_tier) if obj.space_id is not None else None,
+        obj.level_id.name if obj.level_id is not None else None,
+        obj.direct_mapping,
+        extra,
+    )
+
+def set_object_state(obj: bmp.obj.Object, state: ObjectState) -> None:
+    obj.pos = state[0]
+    obj.orient = state[1]
+    space_id = (obj.space_id.name, obj.space_id.infinite_tier) if obj.space_id is not None else None
+    if space_id != state[2]:
+        obj.space_id = bmp.ref.SpaceID(*state[2]) if state[2] is not None else None
+    level_id = obj.level_id.name if obj.level_id is not None else None
+    if level_id != state[3]:
+        obj.level_id = bmp.ref.LevelID(state[3]) if state[3] is not None else None
+    obj.direct_mapping = state[4]
+    if isinstance(obj, bmp.obj.SpaceObject):
+        obj.space_extra["static_transform"], obj.space_extra["dynamic_transform"] = state[5]
+    elif isinstance(obj, bmp.obj.Path):
+        obj.unlocked = state[5]
+
+class SpaceState(object):
+    def __init__(self, space: bmp.space.Space) -> None:
+        self.uid_list: list[int] = [o.uid for o in space.object_list]
+        self.object_dict: dict[int, tuple[bmp.obj.Object, ObjectState]] = {o.uid: (o, get_object_state(o)) for o in space.object_list}
+        self.transform: tuple[bmp.loc.SpaceTransform, bmp.loc.SpaceTransform] = (space.static_transform, space.dynamic_transform)
+    def restore(self, space: bmp.space.Space) -> None:
+        space.static_transform, space.dynamic_transform = self.transform
+        space.object_list = [self.object_dict[u][0] for u in self.uid_list]
+        for obj, state in self.object_dict.values():
+            set_object_state(obj, state)
+        space.refresh_index()
+
+class SpaceChanges(object):
+    def __init__(self, old: SpaceState, new: SpaceState) -> None:
+        self.transform: Optional[tuple[bmp.loc.SpaceTransform, bmp.loc.SpaceTransform]] = old.transform if old.transform != new.transform else None
+        self.removed: list[tuple[int, bmp.obj.Object, ObjectState]] = [(i, *old.object_dict[u]) for i, u in enumerate(old.uid_list) if u not in new.object_dict]
+        self.added: set[int] = {u for u in new.uid_list if u not in old.object_dict}
+        self.changed: list[tuple[int, ObjectState]] = [
+            (u, s) for u, (o, s) in old.object_dict.items()
+            if u in new.object_dict and new.object_dict[u][1] != s
+        ]
+        self.uid_list: Optional[list[int]] = None
+        if [u for u in old.uid_list if u in new.object_dict] != [u for u in new.uid_list if u in old.object_dict]:
+            self.uid_list = old.uid_list
+    def empty(self) -> bool:
+        return self.transform is None and self.uid_list is None and len(self.removed) == 0 and len(self.added) == 0 and len(self.changed) == 0
+    def apply(self, space: bmp.space.Space) -> None:
+        if self.transform is not None:
+            space.static_transform, space.dynamic_transform = self.transform
+        if self.uid_list is None:
+            object_list = [o for o in space.object_list if o.uid not in self.added]
+            for index, obj, state in self.removed:
+                object_list.insert(index, obj)
+        else:
+            object_dict = {o.uid: o for o in space.object_list}
+            object_dict.update({o.uid: o for _, o, _ in self.removed})
+            object_list = [object_dict[u] for u in self.uid_list]
+        for index, obj, state in self.removed:
+            set_object_state(obj, state)
+        if len(self.changed) != 0:
+            object_dict = {o.uid: o for o in object_list}
+            for uid, state in self.changed:
+                set_object_state(object_dict[uid], state)
+        space.object_list = object_list
+        space.refresh_index()
+
+class LevelState(object):
+    def __init__(self, level: bmp.level.Level) -> None:
+        self.current_space_id: bmp.ref.SpaceID = bmp.ref.SpaceID(level.current_space_id.name, level.current_space_id.infinite_tier)
+        self.space_included: tuple[bmp.ref.SpaceID, ...] = tuple(level.space_included)
+        self.all_list: tuple[type[bmp.obj.Object], ...] = tuple(level.all_list)
+    def __eq__(self, other: "LevelState") -> bool:
+        return self.current_space_id == other.current_space_id and self.space_included == other.space_included and self.all_list == other.all_list
+    def restore(self, level: bmp.level.Level) -> None:
+        level.current_space_id = bmp.ref.SpaceID(self.current_space_id.name, self.current_space_id.infinite_tier)
+        level.space_included = list(self.space_included)
+        level.all_list = list(self.all_list)
+
+class LevelpackState(object):
+    def __init__(self, levelpack: bmp.levelpack.Levelpack) -> None:
+        self.current_level_id: bmp.ref.LevelID = levelpack.current_level_id
+        self.collectibles: frozenset[bmp.obj.Collectible] = frozenset(levelpack.collectibles)
+        self.level_dict: dict[bmp.ref.LevelID, bmp.level.Level] = levelpack.level_dict.copy()
+        self.level_init_state_dict: dict[bmp.ref.LevelID, bmp.level.Level] = levelpack.level_init_state_dict.copy()
+        self.space_dict: dict[bmp.ref.SpaceID, bmp.space.Space] = levelpack.space_dict.copy()
+        self.level_states: dict[bmp.ref.LevelID, LevelState] = {i: LevelState(l) for i, l in levelpack.level_dict.items()}
+        self.space_states: dict[bmp.ref.SpaceID, SpaceState] = {i: SpaceState(s) for i, s in levelpack.space_dict.items()}
+        self.seed: Optional[int] = levelpack.seed
+        self.random_state: bmp.levelpack.RandomState = levelpack.rng.getstate()
+
+class LevelpackChanges(object):
+    def __init__(self, old: LevelpackState, new: LevelpackState) -> None:
+        self.current_level_id: Optional[bmp.ref.LevelID] = old.current_level_id if old.current_level_id != new.current_level_id else None
+        self.collectibles: Optional[frozenset[bmp.obj.Collectible]] = old.collectibles if old.collectibles != new.collectibles else None
+        self.random: Optional[tuple[Optional[int], bmp.levelpack.RandomState]] = (old.seed, old.random_state) if (old.seed, old.random_state) != (new.seed, new.random_state) else None
+        self.removed_levels: dict[bmp.ref.LevelID, bmp.level.Level] = {i: l for i, l in old.level_dict.items() if i not in new.level_dict}
+        self.added_levels: list[bmp.ref.LevelID] = [i for i in new.level_dict.keys() if i not in old.level_dict]
+        self.removed_level_init_states: dict[bmp.ref.LevelID, bmp.level.Level] = {i: l for i, l in old.level_init_state_dict.items() if i not in new.level_init_state_dict}
+        self.added_level_init_states: list[bmp.ref.LevelID] = [i for i in new.level_init_state_dict.keys() if i not in old.level_init_state_dict]
+        self.removed_spaces: dict[bmp.ref.SpaceID, tuple[bmp.space.Space, SpaceState]] = {i: (s, old.space_states[i]) for i, s in old.space_dict.items() if i not in new.space_dict}
+        self.added_spaces: list[bmp.ref.SpaceID] = [i for i in new.space_dict.keys() if i not in old.space_dict]
+        self.level_states: dict[bmp.ref.LevelID, LevelState] = {
+            i: s for i, s in old.level_states.items()
+            if i not in new.level_states or new.level_states[i] != s
+        }
+        self.space_changes: dict[bmp.ref.SpaceID, SpaceChanges] = {}
+        for space_id, space_state in old.space_states.items():
+            if space_id in new.space_states:
+                space_changes = SpaceChanges(space_state, new.space_states[space_id])
+                if not space_changes.empty():
+                    self.space_changes[space_id] = space_changes
+    def empty(self) -> bool:
+        return (
+            self.current_level_id is None and self.collectibles is None and self.random is None
+            and len(self.removed_levels) == 0 and len(self.added_levels) == 0
+            and len(self.removed_level_init_states) == 0 and len(self.added_level_init_states) == 0
+            and len(self.removed_spaces) == 0 and len(self.added_spaces) == 0
+            and len(self.level_states) == 0 and len(self.space_changes) == 0
+        )
+    def apply(self, levelpack: bmp.levelpack.Levelpack) -> None:
+        for space_id in self.added_spaces:
+            levelpack.space_dict.pop(space_id)
+        for space_id, (space, space_state) in self.removed_spaces.items():
+            levelpack.space_dict[space_id] = space
+            space_state.restore(space)
+        for space_id, space_changes in self.space_changes.items():
+            space_changes.apply(levelpack.space_dict[space_id])
+        for level_id in self.added_levels:
+            levelpack.level_dict.pop(level_id)
+        for level_id, level in self.removed_levels.items():
+            levelpack.set_level(level_id, level)
+        for level_id in self.added_level_init_states:
+            levelpack.level_init_state_dict.pop(level_id)
+        for level_id, level in self.removed_level_init_states.items():
+            levelpack.set_level_init_state(level_id, level)
+        for level_id, level_state in self.level_states.items():
+            level_state.restore(levelpack.level_dict[level_id])
+        if self.collectibles is not None:
+            levelpack.collectibles = set(self.collectibles)
+        if self.current_level_id is not None:
+            levelpack.current_level_id = self.current_level_id
+        if self.random is not None:
+            levelpack.seed = self.random[0]
+            levelpack.rng.setstate(self.random[1])
+
+def get_changes(old: LevelpackState, new: LevelpackState) -> list[LevelpackChanges]:
+    changes = LevelpackChanges(old, new)
+    return [] if changes.empty() else [changes]
+
+type HistoryBranch = tuple[bmp.levelpack.Levelpack, LevelpackState, list[LevelpackChanges]]
+
+class HistoryEntry(object):
+    def __init__(
+        self,
+        info: bmp.levelpack.ReturnInfo,
+        changes: list[LevelpackChanges],
+        *,
+        branch: Optional[HistoryBranch] = None,
+        checkpoint: Optional[bmp.levelpack.Levelpack] = None,
+    ) -> None:
+        self.info: bmp.levelpack.ReturnInfo = info
+        self.changes: list[LevelpackChanges] = changes
+        self.branch: Optional[HistoryBranch] = branch
+        self.checkpoint: Optional[bmp.levelpack.Levelpack] = checkpoint
+
+def get_history_options() -> bmp.opt.HistoryOptions:
+    return bmp.opt.options["gameplay"].get("history", bmp.opt.default_history_options)
+
+class History(object):
+    def __init__(
+        self,
+        levelpack: bmp.levelpack.Levelpack,
+        info: bmp.levelpack.ReturnInfo = bmp.levelpack.default_levelpack_info,
+        *,
+        limit: Optional[int] = None,
+        checkpoint_interval: Optional[int] = None,
+    ) -> None:
+        history_options = get_history_options()
+        self.limit: int = limit if limit is not None else history_options["limit"]
+        self.checkpoint_interval: int = checkpoint_interval if checkpoint_interval is not None else history_options["checkpoint"]
+        self.levelpack: bmp.levelpack.Levelpack = levelpack
+        self.state: LevelpackState = LevelpackState(levelpack)
+        self.pending: list[LevelpackChanges] = []
+        self.entry_list: list[HistoryEntry] = [HistoryEntry(info.copy(), [], checkpoint=copy.deepcopy(levelpack))]
+        self.push_count: int = 0
+    def __len__(self) -> int:
+        return len(self.entry_list)
+    @property
+    def info(self) -> bmp.levelpack.ReturnInfo:
+        return self.entry_list[-1].info
+    @info.setter
+    def info(self, info: bmp.levelpack.ReturnInfo) -> None:
+        self.entry_list[-1].info = info.copy()
+    def push(self, levelpack: bmp.levelpack.Levelpack, info: bmp.levelpack.ReturnInfo = bmp.levelpack.default_levelpack_info) -> None:
+        new_state = LevelpackState(levelpack)
+        branch: Optional[HistoryBranch] = None
+        if levelpack is self.levelpack:
+            changes = get_changes(self.state, new_state) + self.pending
+        else:
+            changes = []
+            branch = (self.levelpack, self.state, self.pending)
+        checkpoint: Optional[bmp.levelpack.Levelpack] = None
+        self.push_count += 1
+        if self.entry_list[-1].info["select"] is not None or (self.checkpoint_interval > 0 and self.push_count % self.checkpoint_interval == 0):
+            checkpoint = copy.deepcopy(levelpack)
+        self.levelpack = levelpack
+        self.state = new_state
+        self.pending = []
+        self.entry_list.append(HistoryEntry(info.copy(), changes, branch=branch, checkpoint=checkpoint))
+        if self.limit > 0 and len(self.entry_list) > self.limit:
+            del self.entry_list[:len(self.entry_list) - self.limit]
+            self.entry_list[0].changes = []
+            self.entry_list[0].branch = None
+    def replace(self, levelpack: bmp.levelpack.Levelpack) -> None:
+        self.levelpack = levelpack
+    def drop(self) -> None:
+        entry = self.entry_list.pop()
+        if entry.branch is not None:
+            self.levelpack, self.state, self.pending = entry.branch
+        else:
+            self.pending = self.pending + entry.changes
+    def restore(self) -> bmp.levelpack.Levelpack:
+        for changes in get_changes(self.state, LevelpackState(self.levelpack)) + self.pending:
+            changes.apply(self.levelpack)
+        if len(self.pending) != 0:
+            self.state = LevelpackState(self.levelpack)
+            self.pending = []
+        random_state = self.levelpack.rng.getstate()
+        self.levelpack.update_rules()
+        self.levelpack.rng.setstate(random_state)
+        return self.levelpack
+    def undo(self) -> tuple[bmp.levelpack.Levelpack, bmp.levelpack.ReturnInfo]:
+        levelpack = self.restore()
+        info = self.entry_list[-1].info.copy()
+        if len(self.entry_list) != 1:
+            self.drop()
+        return levelpack, info
+    def restart(self) -> tuple[bmp.levelpack.Levelpack, bmp.levelpack.ReturnInfo]:
+        index = len(self.entry_list) - 1
+        while index != 0 and self.entry_list[index - 1].info["select"] is None:
+            index -= 1
+        for checkpoint_index in range(index, len(self.entry_list)):
+            checkpoint = self.entry_list[checkpoint_index].checkpoint
+            if checkpoint is not None:
+                del self.entry_list[checkpoint_index + 1:]
+                self.levelpack = copy.deepcopy(checkpoint)
+                self.state = LevelpackState(self.levelpack)
+                self.pending = []
+                break
+        while len(self.entry_list) != index + 1:
+            self.drop()
+        return self.restore(), self.entry_list[-1].info.copy()
@@ -113,7 +113,8 @@ default_tqdm_args: dict[str, Any] = {
     "dynamic_ncols": True,
     "mininterval": 0.0625,
     "maxinterval": 1,
-    "leave": False
+    "leave": False,
+    "disable": bmp.base.headless,
 }
 
 print = print
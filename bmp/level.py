@@ -1,4 +1,4 @@
-from typing import NotRequired, Optional, TypeGuard, TypedDict
+from typing import Generator, NotRequired, Optional, TypeGuard, TypedDict
 import random
 import copy
 import math
@@ -30,7 +30,30 @@ type LevelJson = LevelJson41
 
 max_move_count: int = 120
 infinite_move_number: int = 6
+max_move_records: int = 8
 MoveInfo = tuple[bmp.obj.Object, list[tuple[bmp.ref.SpaceID, bmp.loc.Coord[int], bmp.loc.Orient]]]
+type RecursionRules = tuple[list[bmp.rule.Rule], list[bmp.rule.RuleInfo]]
+type RecursionRuleKey = tuple[tuple[bmp.ref.SpaceID, ...], tuple[tuple[int, int], ...]]
+type MoveRequest = tuple[bmp.space.Space, bmp.obj.Object, bmp.loc.Orient, Optional[bmp.loc.Coord[int]], list[bmp.ref.SpaceID], Optional[float], bool]
+type MoveFrame = Generator[MoveRequest, Optional[list[MoveInfo]], Optional[list[MoveInfo]]]
+type MoveKey = tuple[bmp.ref.SpaceID, bmp.obj.Object, bmp.loc.Orient, bmp.loc.Coord[int], Optional[float], tuple[bmp.ref.SpaceID, ...]]
+type MoveRecord = tuple[Optional[list[MoveInfo]], set[bmp.obj.Object], set[bmp.obj.Object], int, Optional[int]]
+type MoveMemo = dict[MoveKey, list[MoveRecord]]
+type MoverQueue = dict[bmp.ref.SpaceID, dict[bmp.obj.Object, int]]
+
+class MoveState(object):
+    __slots__ = ("frame", "key", "obj", "depth", "pushing", "required", "excluded", "reach", "capped")
+    def __init__(self, frame: MoveFrame, key: MoveKey, obj: bmp.obj.Object, depth: int) -> None:
+        self.frame: MoveFrame = frame
+        self.key: MoveKey = key
+        self.obj: bmp.obj.Object = obj
+        self.depth: int = depth
+        self.pushing: bool = False
+        # objects the resolved subtree saw inside / outside the pushed list it was given
+        self.required: set[bmp.obj.Object] = set()
+        self.excluded: set[bmp.obj.Object] = {obj}
+        self.reach: int = 0
+        self.capped: bool = False
 
 class Level(object):
     def __init__(
@@ -49,12 +72,16 @@ class Level(object):
         self.map_info: Optional[MapLevelExtraJson] = map_info
         # runtime properties
         self.space_dict: dict[bmp.ref.SpaceID, bmp.space.Space]
+        self.object_space_dict: dict[bmp.obj.Object, bmp.ref.SpaceID] = {}
         self.properties: dict[type[bmp.obj.LevelObject], bmp.obj.PropertyStorage] = {p: bmp.obj.PropertyStorage() for p in bmp.obj.level_object_types}
         self.special_operator_properties: dict[type[bmp.obj.LevelObject], dict[type[bmp.obj.Operator], bmp.obj.PropertyStorage]] = {p: {o: bmp.obj.PropertyStorage() for o in bmp.obj.special_operators} for p in bmp.obj.level_object_types}
         self.game_properties: bmp.obj.PropertyStorage = bmp.obj.PropertyStorage()
         self.created_levels: list["Level"] = []
         self.all_list: list[type[bmp.obj.Object]] = []
         self.group_references: dict[type[bmp.obj.GroupNoun], bmp.obj.PropertyStorage] = {p: bmp.obj.PropertyStorage() for p in bmp.obj.group_noun_types}
+        self.recursion_rule_key: Optional[RecursionRuleKey] = None
+        self.recursion_rule_spaces: list[bmp.space.Space] = []
+        self.recursion_rule_dict: dict[bmp.ref.SpaceID, RecursionRules] = {}
         self.sound_events: list[str] = []
     def __eq__(self, level: "Level") -> bool:
         return self.level_id == level.level_id
@@ -78,13 +105,24 @@ class Level(object):
     def space_list(self, __space_list: list[bmp.space.Space]) -> None:
         self.space_dict.clear()
         self.space_dict.update({s.space_id: s for s in __space_list})
+    def refresh_object_space_dict(self) -> None:
+        self.object_space_dict = {}
+        for space in self.space_list:
+            self.object_space_dict.update(dict.fromkeys(space.object_dict, space.space_id))
+    def get_obj_space(self, obj: bmp.obj.Object) -> Optional[bmp.space.Space]:
+        space = self.get_space(self.object_space_dict.get(obj))
+        if space is None or not space.has_obj(obj) or space.space_id not in self.space_included:
+            self.refresh_object_space_dict()
+            space = self.get_space(self.object_space_dict.get(obj))
+        return space
+    def new_obj(self, space: bmp.space.Space, obj: bmp.obj.Object) -> None:
+        space.new_obj(obj)
+        self.object_space_dict[obj] = space.space_id
+    def del_obj(self, space: bmp.space.Space, obj: bmp.obj.Object) -> None:
+        space.del_obj(obj)
+        self.object_space_dict.pop(obj, None)
     def find_super_spaces(self, space_object_id: bmp.ref.SpaceID) -> list[tuple[bmp.space.Space, bmp.obj.SpaceObject]]:
-        return_value: list[tuple[bmp.space.Space, bmp.obj.SpaceObject]] = []
-        for super_space_id, super_space in self.space_dict.items():
-            for obj in super_space.get_spaces():
-                if space_object_id == obj.space_id:
-                    return_value.append((super_space, obj))
-        return return_value
+        return [(s, o) for s in self.space_dict.values() if space_object_id in s.space_object_index for o in s.get_spaces_from_space_id(space_object_id)]
     def refresh_all_list(self) -> None:
         self.all_list = []
         for space in self.space_list:
@@ -92,10 +130,52 @@ class Level(object):
                 if not issubclass(type(obj), bmp.obj.types_not_in_all):
                     if type(obj) not in self.all_list:
                         self.all_list.append(type(obj))
+    def have_objs_with_prop(self, prop: type[bmp.obj.Text]) -> bool:
+        for space in self.space_list:
+            if space.get_prop_count(prop) != 0:
+                return True
+        return False
+    def have_prop(self, prop: type[bmp.obj.Text]) -> bool:
+        if self.properties[bmp.obj.default_level_object_type].enabled(prop):
+            return True
+        for space in self.space_list:
+            if space.properties[bmp.obj.default_space_object_type].enabled(prop):
+                return True
+        return self.have_objs_with_prop(prop)
+    def have_dynamic_transform(self) -> bool:
+        for space in self.space_list:
+            if space.dynamic_transform != bmp.loc.default_space_transform:
+                return True
+            for obj in space.get_spaces():
+                if obj.space_extra["dynamic_transform"] != bmp.loc.default_space_transform:
+                    return True
+        return False
     def reset_move_numbers(self) -> None:
         for space in self.space_list:
             for obj in space.object_list:
                 obj.move_number = 0
+    def get_mover_queue(self, prop: type[bmp.obj.Text]) -> MoverQueue:
+        mover_queue: MoverQueue = {}
+        for space in self.space_list:
+            for obj in space.get_objs_from_prop(prop):
+                move_count = obj.properties.count(prop)
+                if obj.move_number < move_count:
+                    mover_queue.setdefault(space.space_id, {})[obj] = move_count
+        return mover_queue
+    def update_mover_queue(self, mover_queue: MoverQueue, prop: type[bmp.obj.Text], new_obj_list: list[tuple[bmp.space.Space, bmp.obj.Object]]) -> None:
+        for space_id, movers in list(mover_queue.items()):
+            space = self.get_exact_space(space_id)
+            for obj, move_count in list(movers.items()):
+                if obj.move_number >= move_count or not space.has_obj(obj):
+                    del movers[obj]
+            if len(movers) == 0:
+                del mover_queue[space_id]
+        for space, obj in new_obj_list:
+            if space.space_id not in self.space_included or not obj.properties.enabled(prop):
+                continue
+            move_count = obj.properties.count(prop)
+            if obj.move_number < move_count:
+                mover_queue.setdefault(space.space_id, {})[obj] = move_count
     @staticmethod
     def merge_move_list(move_list: list[MoveInfo]) -> list[MoveInfo]:
         move_dict: dict[bmp.obj.Object, list[tuple[bmp.ref.SpaceID, bmp.loc.Coord[int], bmp.loc.Orient]]] = {}
@@ -103,14 +183,12 @@ class Level(object):
             move_dict.setdefault(obj, [])
             move_dict[obj].extend(new_info_list)
         return [(o, l) for o, l in move_dict.items()]
-    def move_objs_from_move_list(self, move_list: list[MoveInfo]) -> None:
+    def move_objs_from_move_list(self, move_list: list[MoveInfo]) -> list[tuple[bmp.space.Space, bmp.obj.Object]]:
         move_list = self.merge_move_list(move_list)
+        new_obj_list: list[tuple[bmp.space.Space, bmp.obj.Object]] = []
         for old_obj, new_info_list in move_list:
             new_info_list = bmp.base.remove_same_elements(new_info_list)
-            old_space: Optional[bmp.space.Space] = None
-            for space in self.space_list:
-                if old_obj in space.object_list:
-                    old_space = space
+            old_space: Optional[bmp.space.Space] = self.get_obj_space(old_obj)
             if old_space is None:
                 continue # how did we get here?
             old_obj.move_number += 1
@@ -118,24 +196,26 @@ class Level(object):
                 new_space = self.get_space(new_space_id)
                 if new_space is None:
                     continue
-                new_obj = copy.deepcopy(old_obj)
-                new_obj.reset_uuid()
+                new_obj = old_obj.clone()
+                new_obj.reset_uid()
                 new_obj.pos = new_pos
                 new_obj.orient = new_direct
-                new_space.new_obj(new_obj)
-            old_space.del_obj(old_obj)
+                self.new_obj(new_space, new_obj)
+                new_obj_list.append((new_space, new_obj))
+            self.del_obj(old_space, old_obj)
         if len(move_list) != 0 and "move" not in self.sound_events:
             self.sound_events.append("move")
-    def meet_prefix_conditions(self, space: bmp.space.Space, obj: bmp.obj.Object, prefix_info_list: list[bmp.rule.PrefixInfo], is_meta: bool = False) -> bool:
+        return new_obj_list
+    def meet_prefix_conditions(self, space: bmp.space.Space, obj: bmp.obj.Object, prefix_info_list: list[bmp.rule.PrefixInfo], is_meta: bool = False, *, rng: random.Random) -> bool:
         return_value = True
         for prefix_info in prefix_info_list:
             meet_prefix_condition = True
             if type(prefix_info.prefix) == bmp.obj.TextMeta:
                 meet_prefix_condition = is_meta and obj.space_id == space.space_id
             elif type(prefix_info.prefix) == bmp.obj.TextOften:
-                meet_prefix_condition = random.choice((True, True, True, False))
+                meet_prefix_condition = rng.choice((True, True, True, False))
             elif type(prefix_info.prefix) == bmp.obj.TextSeldom:
-                meet_prefix_condition = random.choice((True, False, False, False, False, False))
+                meet_prefix_condition = rng.choice((True, False, False, False, False, False))
             return_value = return_value and (meet_prefix_condition if not prefix_info.negated else not meet_prefix_condition)
         return return_value
     def meet_infix_conditions(self, space: bmp.space.Space, obj: bmp.obj.Object, infix_info_list: list[bmp.rule.InfixInfo]) -> bool:
@@ -175,14 +255,14 @@ class Level(object):
                             matched_objs.append(match_objs[0])
                     if not meet_infix_condition:
                         break
-            elif infix_info.infix == bmp.obj.TextFeeling:
+            elif type(infix_info.infix) == bmp.obj.TextFeeling:
                 if obj.old_state.prop is None:
                     meet_infix_condition = False
                 else:
                     for infix_noun_info in infix_info.infix_noun_info_list:
                         if obj.old_state.prop.enabled(type(infix_noun_info.infix_noun)) == infix_noun_info.negated:
                             meet_infix_condition = False
-            elif infix_info.infix == bmp.obj.TextFacing: # temporary solution, noun not supported yet
+            elif type(infix_info.infix) == bmp.obj.TextFacing: # temporary solution, noun not supported yet
                 for infix_noun_info in infix_info.infix_noun_info_list: # type: ignore
                     if isinstance(infix_noun_info.infix_noun, bmp.obj.DirectFixProperty):
                         if (obj.orient != infix_noun_info.infix_noun.ref_direct ) and not infix_noun_info.negated:
@@ -191,12 +271,13 @@ class Level(object):
                             meet_infix_condition = False
                     elif not infix_noun_info.negated:
                         meet_infix_condition = False
-            elif infix_info.infix == bmp.obj.TextWithout:
+            elif type(infix_info.infix) == bmp.obj.TextWithout:
                 meet_infix_condition = True
                 matched_objs: list[bmp.obj.Object] = [obj]
                 match_type_count: dict[tuple[bool, type[bmp.obj.Noun]], int] = {}
-                for match_negated, match_noun in infix_info[2]: # type: ignore
-                    match_noun: type[bmp.obj.Noun | bmp.obj.Property]
+                for infix_noun_info in infix_info.infix_noun_info_list:
+                    match_negated: bool = infix_noun_info.negated
+                    match_noun: type[bmp.obj.Noun | bmp.obj.Property] = type(infix_noun_info.infix_noun)
                     if issubclass(match_noun, bmp.obj.Property):
                         continue # how did we get here?
                     match_type_count.setdefault((match_negated, match_noun), 0)
@@ -219,30 +300,45 @@ class Level(object):
                         match_objs.extend([o for o in space.get_objs_from_noun(new_match_noun()) if o not in matched_objs])
                         if len(match_objs) >= match_count:
                             meet_infix_condition = False
-                        else:
+                        elif len(match_objs) != 0:
                             matched_objs.append(match_objs[0])
                     if not meet_infix_condition:
                         break
             if meet_infix_condition == infix_info.negated:
                 return False
         return True
-    def recursion_rules(self, space: bmp.space.Space, passed: Optional[list[bmp.ref.SpaceID]] = None) -> tuple[list[bmp.rule.Rule], list[bmp.rule.RuleInfo]]:
-        passed = passed if passed is not None else []
+    def get_recursion_rule_key(self) -> RecursionRuleKey:
+        return (tuple(self.space_included), tuple((s.rule_modify_count, s.space_object_modify_count) for s in self.space_dict.values()))
+    def recursion_rules(self, space: bmp.space.Space, passed: Optional[list[bmp.ref.SpaceID]] = None) -> RecursionRules:
+        if passed is not None or self.space_dict.get(space.space_id) is not space:
+            return self.collect_recursion_rules(space, passed if passed is not None else [])
+        space_list = list(self.space_dict.values())
+        key = self.get_recursion_rule_key()
+        if key != self.recursion_rule_key or len(space_list) != len(self.recursion_rule_spaces) or any(s is not c for s, c in zip(space_list, self.recursion_rule_spaces)):
+            self.recursion_rule_key = key
+            self.recursion_rule_spaces = space_list
+            self.recursion_rule_dict = {}
+        recursion_rules = self.recursion_rule_dict.get(space.space_id)
+        if recursion_rules is None:
+            recursion_rules = self.collect_recursion_rules(space, [])
+            self.recursion_rule_dict[space.space_id] = recursion_rules
+        return recursion_rules
+    def collect_recursion_rules(self, space: bmp.space.Space, passed: list[bmp.ref.SpaceID]) -> RecursionRules:
         if space.space_id in passed:
             return [], []
         passed.append(space.space_id)
-        rule_list = copy.deepcopy(space.rule_list)
-        rule_info = copy.deepcopy(space.rule_info)
-        for super_space in self.space_list:
-            for space_obj in super_space.get_spaces():
-                if space.space_id == space_obj.space_id:
-                    new_rule_list, new_rule_info = self.recursion_rules(super_space, passed)
-                    rule_list.extend(new_rule_list)
-                    rule_info.extend(new_rule_info)
-                    passed.append(super_space.space_id)
+        rule_list = space.rule_list.copy()
+        rule_info = space.rule_info.copy()
+        for super_space, _ in self.find_super_spaces(space.space_id):
+            if super_space.space_id not in self.space_included:
+                continue
+            new_rule_list, new_rule_info = self.collect_recursion_rules(super_space, passed)
+            rule_list.extend(new_rule_list)
+            rule_info.extend(new_rule_info)
+            passed.append(super_space.space_id)
         return rule_list, rule_info
     def destroy_obj(self, space: bmp.space.Space, obj: bmp.obj.Object) -> None:
-        space.del_obj(obj)
+        self.del_obj(space, obj)
         for new_noun_type, new_noun_count in obj.operator_properties[bmp.obj.TextHas].enabled_count().items(): # type: ignore
             new_noun_type: type[bmp.obj.Noun]
             if issubclass(new_noun_type, bmp.obj.RangedNoun):
@@ -253,34 +349,82 @@ class Level(object):
             for _ in range(new_noun_count):
                 if issubclass(new_object_type, bmp.obj.Game):
                     if isinstance(obj, (bmp.obj.LevelObject, bmp.obj.SpaceObject)):
-                        space.new_obj(bmp.obj.Game(obj.pos, obj.orient, ref_type=bmp.obj.get_noun_from_type(type(obj))))
+                        self.new_obj(space, bmp.obj.Game(obj.pos, obj.orient, ref_type=bmp.obj.get_noun_from_type(type(obj))))
                     else:
-                        space.new_obj(bmp.obj.Game(obj.pos, obj.orient, ref_type=type(obj)))
+                        self.new_obj(space, bmp.obj.Game(obj.pos, obj.orient, ref_type=type(obj)))
                 elif issubclass(new_object_type, bmp.obj.LevelObject):
                     level_extra: bmp.obj.LevelObjectExtra = {"icon": {"name": obj.sprite_name, "color": obj.get_color()}}
                     if obj.level_id is not None:
-                        space.new_obj(new_object_type(obj.pos, obj.orient, level_id=obj.level_id, level_extra=level_extra))
+                        self.new_obj(space, new_object_type(obj.pos, obj.orient, level_id=obj.level_id, level_extra=level_extra))
                     else:
-                        space.new_obj(new_object_type(obj.pos, obj.orient, level_id=self.level_id, level_extra=level_extra))
+                        self.new_obj(space, new_object_type(obj.pos, obj.orient, level_id=self.level_id, level_extra=level_extra))
                 elif issubclass(new_object_type, bmp.obj.SpaceObject):
                     if obj.space_id is not None:
-                        space.new_obj(new_object_type(obj.pos, obj.orient, space_id=obj.space_id))
+                        self.new_obj(space, new_object_type(obj.pos, obj.orient, space_id=obj.space_id))
                     else:
-                        space.new_obj(new_object_type(obj.pos, obj.orient, space_id=space.space_id))
+                        self.new_obj(space, new_object_type(obj.pos, obj.orient, space_id=space.space_id))
                 else:
-                    space.new_obj(new_object_type(obj.pos, obj.orient, space_id=obj.space_id, level_id=obj.level_id))
+                    self.new_obj(space, new_object_type(obj.pos, obj.orient, space_id=obj.space_id, level_id=obj.level_id))
     def get_move_list(self, space: bmp.space.Space, obj: bmp.obj.Object, \
         direct: bmp.loc.Orient, pos: Optional[bmp.loc.Coord[int]] = None, \
             pushed: Optional[list[bmp.obj.Object]] = None, passed: Optional[list[bmp.ref.SpaceID]] = None, \
-                transnum: Optional[float] = None, depth: int = 0) -> Optional[list[MoveInfo]]:
-        if depth > 100:
-            return None
-        depth += 1
-        pushed = pushed[:] if pushed is not None else []
-        if obj in pushed:
-            return None
-        passed = passed[:] if passed is not None else []
-        pos = pos if pos is not None else obj.pos
+                transnum: Optional[float] = None, depth: int = 0, memo: Optional[MoveMemo] = None) -> Optional[list[MoveInfo]]:
+        memo = memo if memo is not None else {}
+        pushed_set: set[bmp.obj.Object] = set(pushed) if pushed is not None else set()
+        stack: list[MoveState] = []
+        request: Optional[MoveRequest] = (space, obj, direct, pos, passed if passed is not None else [], transnum, False)
+        move_list: Optional[list[MoveInfo]] = None
+        while True:
+            record: Optional[MoveRecord] = None
+            if request is not None:
+                space, obj, direct, pos, passed, transnum, _ = request
+                request = None
+                request_depth = depth + len(stack)
+                if request_depth > 100:
+                    record = (None, set(), set(), 0, request_depth)
+                elif obj in pushed_set:
+                    record = (None, {obj}, set(), 0, None)
+                else:
+                    pos = pos if pos is not None else obj.pos
+                    key: MoveKey = (space.space_id, obj, direct, pos, transnum, tuple(passed))
+                    for memo_record in memo.get(key, []):
+                        if (request_depth + memo_record[3] <= 100 if memo_record[4] is None else request_depth == memo_record[4]) and memo_record[1] <= pushed_set and memo_record[2].isdisjoint(pushed_set):
+                            record = memo_record
+                            break
+                    else:
+                        stack.append(MoveState(self.get_move_list_frame(space, obj, direct, pos, passed[:], transnum), key, obj, request_depth))
+                        move_list = None
+            if record is None:
+                state = stack[-1]
+                try:
+                    request = state.frame.send(move_list)
+                except StopIteration as stop:
+                    stack.pop()
+                    record = (stop.value, state.required, state.excluded, state.reach, state.depth if state.capped else None)
+                    memo_record_list = memo.setdefault(state.key, [])
+                    if len(memo_record_list) < max_move_records:
+                        memo_record_list.append(record)
+                else:
+                    state.pushing = request[6]
+                    if state.pushing:
+                        pushed_set.add(state.obj)
+                    continue
+            move_list = record[0]
+            if len(stack) == 0:
+                return move_list
+            state = stack[-1]
+            required = record[1]
+            if state.pushing:
+                pushed_set.discard(state.obj)
+                if state.obj in required:
+                    required = required - {state.obj}
+            state.required |= required
+            state.excluded |= record[2]
+            state.reach = max(state.reach, record[3] + 1)
+            state.capped = state.capped or record[4] is not None
+    def get_move_list_frame(self, space: bmp.space.Space, obj: bmp.obj.Object, \
+        direct: bmp.loc.Orient, pos: bmp.loc.Coord[int], passed: list[bmp.ref.SpaceID], \
+            transnum: Optional[float]) -> MoveFrame:
         new_pos = bmp.loc.front_position(pos, direct)
         leave_space = False
         leave_list: list[MoveInfo] = []
@@ -302,7 +446,7 @@ class Level(object):
                         new_transnum = space.calc_leave_transnum(transnum, space_obj.pos, direct, transform)
                     else:
                         new_transnum = space.get_leave_transnum_from_pos(obj.pos, direct, transform)
-                    new_move_list = self.get_move_list(super_space, obj, new_direct, space_obj.pos, pushed, passed, new_transnum, depth)
+                    new_move_list = yield (super_space, obj, new_direct, space_obj.pos, passed, new_transnum, False)
                     if new_move_list is not None:
                         leave_space = True
                         leave_list.extend(new_move_list)
@@ -316,7 +460,7 @@ class Level(object):
         if len(push_objects) != 0 and not space.out_of_range(new_pos):
             push = True
             for push_object in push_objects:
-                new_move_list = self.get_move_list(space, push_object, direct, pushed=pushed + [obj], depth=depth)
+                new_move_list = yield (space, push_object, direct, None, [], None, True)
                 if new_move_list is None:
                     unpushable_objects.append(push_object)
                     push = False
@@ -357,7 +501,7 @@ class Level(object):
                         new_direct = bmp.loc.swap_direction(direct) if transform["flip"] and direct in (bmp.loc.Orient.A, bmp.loc.Orient.D) else direct
                         new_direct = bmp.loc.turn(new_direct, bmp.loc.Orient[transform["direct"]])
                         input_pos = squeeze_space.get_enter_pos_by_default(new_direct, transform)
-                        squeeze_move_list = self.get_move_list(squeeze_space, new_push_object, bmp.loc.swap_direction(new_direct), input_pos, pushed=pushed + [obj], depth=depth)
+                        squeeze_move_list = yield (squeeze_space, new_push_object, bmp.loc.swap_direction(new_direct), input_pos, [], None, True)
                         if squeeze_move_list is None:
                             squeeze = False
                             break
@@ -401,7 +545,7 @@ class Level(object):
                         input_pos = epsilon_space.get_enter_pos_by_default(bmp.loc.swap_direction(new_direct), inversed_transform)
                         new_transnum = 0.5
                         passed.append(space.space_id)
-                        new_move_list = self.get_move_list(epsilon_space, obj, new_direct, input_pos, pushed, passed, new_transnum, depth)
+                        new_move_list = yield (epsilon_space, obj, new_direct, input_pos, passed, new_transnum, False)
                         if new_move_list is not None:
                             enter_list.extend(new_move_list)
                             enter_space = True
@@ -417,7 +561,7 @@ class Level(object):
                     input_pos = sub_space.get_enter_pos_by_default(bmp.loc.swap_direction(direct), inversed_transform)
                     new_transnum = 0.5
                 passed.append(space.space_id)
-                new_move_list = self.get_move_list(sub_space, obj, new_direct, input_pos, pushed, passed, new_transnum, depth)
+                new_move_list = yield (sub_space, obj, new_direct, input_pos, passed, new_transnum, False)
                 if new_move_list is not None:
                     enter_list.extend(new_move_list)
                     enter_space = True
@@ -439,38 +583,41 @@ class Level(object):
         self.reset_move_numbers()
         if direct is None:
             return False
+        if not self.have_objs_with_prop(bmp.obj.TextYou):
+            return False
         pushing_game = False
-        finished = False
+        you_queue = self.get_mover_queue(bmp.obj.TextYou)
+        move_memo: MoveMemo = {}
         for _ in range(max_move_count):
-            if finished:
+            if len(you_queue) == 0:
                 return pushing_game
             move_list = []
-            finished = True
             for space in self.space_list:
-                you_objs = [o for o in space.object_list if o.move_number < o.properties.count(bmp.obj.TextYou)]
-                if len(you_objs) != 0:
-                    finished = False
-                for obj in you_objs:
-                    obj.orient = direct
-                    new_move_list = self.get_move_list(space, obj, obj.orient)
+                for obj in list(you_queue.get(space.space_id, {})):
+                    space.set_obj_orient(obj, direct)
+                    new_move_list = self.get_move_list(space, obj, obj.orient, memo=move_memo)
                     if new_move_list is not None:
                         move_list.extend(new_move_list)
                         obj.move_number += 1
                     else:
                         pushing_game = True
-            self.move_objs_from_move_list(move_list)
+            # nothing moved, so every later round would be the same
+            if len(move_list) == 0:
+                return pushing_game
+            self.update_mover_queue(you_queue, bmp.obj.TextYou, self.move_objs_from_move_list(move_list))
+            move_memo.clear()
         return pushing_game
     def select(self, direct: Optional[bmp.loc.Orient]) -> Optional[list[bmp.ref.LevelID]]:
         if direct is None:
             level_list: list[bmp.ref.LevelID] = []
             for space in self.space_list:
-                select_objs = [o for o in space.object_list if o.properties.enabled(bmp.obj.TextSelect)]
+                select_objs = space.get_objs_from_prop(bmp.obj.TextSelect)
                 for select_obj in select_objs:
                     level_list.extend([o.level_id for o in space.object_list if o.pos == select_obj.pos and o.level_id is not None and o != select_obj])
             return level_list
         else:
             for space in self.space_list:
-                select_objs = [o for o in space.object_list if o.properties.enabled(bmp.obj.TextSelect)]
+                select_objs = space.get_objs_from_prop(bmp.obj.TextSelect)
                 for select_obj in select_objs:
                     new_pos = bmp.loc.front_position(select_obj.pos, direct)
                     if not space.out_of_range(new_pos):
@@ -485,8 +632,8 @@ class Level(object):
                 for obj in space.object_list:
                     if obj.properties.enabled(prop):
                         if isinstance(obj, bmp.obj.SpaceObject):
-                            obj.space_extra["static_transform"] = prop.ref_transform.copy()
-                        obj.orient = prop.ref_direct
+                            space.set_obj_transform(obj, "static_transform", prop.ref_transform.copy())
+                        space.set_obj_orient(obj, prop.ref_direct)
                 if space.properties[bmp.obj.default_space_object_type].enabled(prop):
                     space.static_transform = prop.ref_transform.copy()
             if self.properties[bmp.obj.default_level_object_type].enabled(prop):
@@ -495,14 +642,15 @@ class Level(object):
         for space in self.space_list:
             space.dynamic_transform = bmp.loc.default_space_transform.copy()
             for obj in space.get_spaces():
-                obj.space_extra["dynamic_transform"] = bmp.loc.default_space_transform.copy()
+                if obj.space_extra["dynamic_transform"] != bmp.loc.default_space_transform:
+                    space.set_obj_transform(obj, "dynamic_transform", bmp.loc.default_space_transform.copy())
         for prop in bmp.obj.direct_mapping_properties:
             for space in self.space_list:
                 for obj in space.object_list:
                     if obj.properties.count(prop) % 2 == 1:
                         if isinstance(obj, bmp.obj.SpaceObject):
-                            obj.space_extra["dynamic_transform"] = bmp.loc.get_stacked_transform(obj.space_extra["dynamic_transform"], prop.ref_transform)
-                        obj.set_direct_mapping(prop.ref_mapping)
+                            space.set_obj_transform(obj, "dynamic_transform", bmp.loc.get_stacked_transform(obj.space_extra["dynamic_transform"], prop.ref_transform))
+                        space.set_obj_direct_mapping(obj, prop.ref_mapping)
                 if space.properties[bmp.obj.default_space_object_type].count(prop) % 2 == 1:
                     space.dynamic_transform = bmp.loc.get_stacked_transform(space.dynamic_transform, prop.ref_transform)
             if self.properties[bmp.obj.default_level_object_type].count(prop) % 2 == 1:
@@ -512,9 +660,9 @@ class Level(object):
             for obj in space.object_list:
                 turn_count = (obj.properties.count(bmp.obj.TextTurn) - obj.properties.count(bmp.obj.TextDeturn)) % 4
                 for _ in range(turn_count):
-                    obj.orient = bmp.loc.turn_right(obj.orient)
+                    space.set_obj_orient(obj, bmp.loc.turn_right(obj.orient))
                     if isinstance(obj, bmp.obj.SpaceObject):
-                        obj.space_extra["static_transform"] = bmp.loc.get_stacked_transform(obj.space_extra["static_transform"], {"direct": "A", "flip": False})
+                        space.set_obj_transform(obj, "static_transform", bmp.loc.get_stacked_transform(obj.space_extra["static_transform"], {"direct": "A", "flip": False}))
             turn_count = (space.properties[bmp.obj.default_space_object_type].count(bmp.obj.TextTurn) - space.properties[bmp.obj.default_space_object_type].count(bmp.obj.TextDeturn)) % 4
             for _ in range(turn_count):
                 space.static_transform = bmp.loc.get_stacked_transform(space.static_transform, {"direct": "A", "flip": False})
@@ -525,91 +673,108 @@ class Level(object):
         pushing_game = False
         for space in self.space_list:
             global_move_count = space.properties[bmp.obj.default_space_object_type].count(bmp.obj.TextMove) + self.properties[bmp.obj.default_level_object_type].count(bmp.obj.TextMove)
+            move_memo: MoveMemo = {}
             for _ in range(global_move_count):
                 move_list = []
                 for obj in [o for o in space.object_list if o.move_number < global_move_count]:
                     if not obj.properties.enabled(bmp.obj.TextFloat):
-                        new_move_list = self.get_move_list(space, obj, bmp.loc.Orient.S)
+                        new_move_list = self.get_move_list(space, obj, bmp.loc.Orient.S, memo=move_memo)
                         if new_move_list is not None:
                             move_list.extend(new_move_list)
                             obj.move_number += 1
                         else:
                             pushing_game = True
                 self.move_objs_from_move_list(move_list)
+                if len(move_list) != 0:
+                    move_memo.clear()
         self.reset_move_numbers()
-        finished = False
-        for _ in range(max_move_count):
-            if finished:
+        if not self.have_objs_with_prop(bmp.obj.TextMove):
+            return pushing_game
+        move_queue = self.get_mover_queue(bmp.obj.TextMove)
+        move_memo = {}
+        for move_round in range(max_move_count):
+            if len(move_queue) == 0:
                 return pushing_game
             move_list = []
-            finished = True
             for space in self.space_list:
-                move_objs = [o for o in space.object_list if o.move_number < o.properties.count(bmp.obj.TextMove)]
-                if len(move_objs) != 0:
-                    finished = False
-                for obj in move_objs:
-                    new_move_list = self.get_move_list(space, obj, obj.orient)
+                for obj in list(move_queue.get(space.space_id, {})):
+                    new_move_list = self.get_move_list(space, obj, obj.orient, memo=move_memo)
                     if new_move_list is not None:
                         move_list = new_move_list
                         obj.move_number += 1
                     else:
-                        obj.orient = bmp.loc.swap_direction(obj.orient)
-                        new_move_list = self.get_move_list(space, obj, obj.orient)
+                        space.set_obj_orient(obj, bmp.loc.swap_direction(obj.orient))
+                        new_move_list = self.get_move_list(space, obj, obj.orient, memo=move_memo)
                         if new_move_list is not None:
                             move_list = new_move_list
                             obj.move_number += 1
                         else:
                             pushing_game = True
-            self.move_objs_from_move_list(move_list)
+            # nothing moved, so every later round would only turn the blocked movers around once more
+            if len(move_list) == 0:
+                if (max_move_count - move_round) % 2 == 0:
+                    for space_id, movers in move_queue.items():
+                        for obj in movers:
+                            self.get_exact_space(space_id).set_obj_orient(obj, bmp.loc.swap_direction(obj.orient))
+                return pushing_game
+            self.update_mover_queue(move_queue, bmp.obj.TextMove, self.move_objs_from_move_list(move_list))
+            move_memo.clear()
         return pushing_game
     def shift(self) -> bool:
         self.reset_move_numbers()
         pushing_game = False
         for space in self.space_list:
             global_shift_count = space.properties[bmp.obj.default_space_object_type].count(bmp.obj.TextShift) + self.properties[bmp.obj.default_level_object_type].count(bmp.obj.TextShift)
+            move_memo: MoveMemo = {}
             for _ in range(global_shift_count):
                 move_list = []
                 for obj in [o for o in space.object_list if o.move_number < global_shift_count]:
                     if not obj.properties.enabled(bmp.obj.TextFloat):
-                        new_move_list = self.get_move_list(space, obj, bmp.loc.Orient.S)
+                        new_move_list = self.get_move_list(space, obj, bmp.loc.Orient.S, memo=move_memo)
                         if new_move_list is not None:
                             move_list.extend(new_move_list)
                             obj.move_number += 1
                         else:
                             pushing_game = True
                 self.move_objs_from_move_list(move_list)
+                if len(move_list) != 0:
+                    move_memo.clear()
         self.reset_move_numbers()
-        finished = False
+        if not self.have_objs_with_prop(bmp.obj.TextShift):
+            return pushing_game
+        shifter_queue = self.get_mover_queue(bmp.obj.TextShift)
+        move_memo = {}
         for _ in range(max_move_count):
-            if finished:
+            if len(shifter_queue) == 0:
                 return pushing_game
             move_list = []
-            finished = True
             for space in self.space_list:
-                shifter_objs = [o for o in space.object_list if o.move_number < o.properties.count(bmp.obj.TextShift)]
-                for shifter_obj in shifter_objs:
+                for shifter_obj in list(shifter_queue.get(space.space_id, {})):
                     shifted_objs = [o for o in space.get_objs_from_pos(shifter_obj.pos) if o != shifter_obj and bmp.obj.same_float_prop(o, shifter_obj)]
                     for obj in shifted_objs:
-                        new_move_list = self.get_move_list(space, obj, shifter_obj.orient)
+                        new_move_list = self.get_move_list(space, obj, shifter_obj.orient, memo=move_memo)
                         if new_move_list is not None:
                             move_list.extend(new_move_list)
                             obj.move_number += 1
-                            finished = False
                         else:
                             pushing_game = True
-            self.move_objs_from_move_list(move_list)
+            if len(move_list) == 0:
+                return pushing_game
+            self.update_mover_queue(shifter_queue, bmp.obj.TextShift, self.move_objs_from_move_list(move_list))
+            move_memo.clear()
         return pushing_game
-    def tele(self) -> None:
+    def tele(self, rng: random.Random) -> None:
         if self.properties[bmp.obj.default_level_object_type].enabled(bmp.obj.TextTele):
             pass
         for space in self.space_list:
             if space.properties[bmp.obj.default_space_object_type].enabled(bmp.obj.TextTele):
                 pass
         tele_list: list[tuple[bmp.space.Space, bmp.obj.Object, bmp.space.Space, bmp.loc.Coord[int]]] = []
-        object_list: list[tuple[bmp.space.Space, bmp.obj.Object]] = []
+        tele_objs: list[tuple[bmp.space.Space, bmp.obj.Object]] = []
         for space in self.space_list:
-            object_list.extend([(space, o) for o in space.object_list])
-        tele_objs = [t for t in object_list if t[1].properties.enabled(bmp.obj.TextTele)]
+            tele_objs.extend([(space, o) for o in space.get_objs_from_prop(bmp.obj.TextTele)])
+        if len(tele_objs) <= 1:
+            return
         tele_object_types: dict[type[bmp.obj.Object], list[tuple[bmp.space.Space, bmp.obj.Object]]] = {}
         for object_type in [n.ref_type for n in bmp.obj.noun_class_list]:
             for tele_obj in tele_objs:
@@ -625,15 +790,17 @@ class Level(object):
                     if obj == tele_obj:
                         continue
                     if bmp.obj.same_float_prop(obj, tele_obj):
-                        other_tele_space, other_tele_obj = random.choice(other_tele_objs)
+                        other_tele_space, other_tele_obj = rng.choice(other_tele_objs)
                         tele_list.append((tele_space, obj, other_tele_space, other_tele_obj.pos))
         for old_space, obj, new_space, pos in tele_list:
-            old_space.del_obj(obj)
+            self.del_obj(old_space, obj)
             obj.pos = pos
-            new_space.new_obj(obj)
+            self.new_obj(new_space, obj)
         if len(tele_list) != 0:
             self.sound_events.append("tele")
     def sink(self) -> None:
+        if not self.have_prop(bmp.obj.TextSink):
+            return
         success = False
         for space in self.space_list:
             delete_list = []
@@ -641,16 +808,20 @@ class Level(object):
                 for obj in space.object_list:
                     if not obj.properties.enabled(bmp.obj.TextFloat):
                         delete_list.append(obj)
-            sink_objs = [o for o in space.object_list if o.properties.enabled(bmp.obj.TextSink)]
+            delete_set = set(delete_list)
+            sink_objs = space.get_objs_from_prop(bmp.obj.TextSink)
             for sink_obj in sink_objs:
+                if sink_obj in delete_set:
+                    continue
                 for obj in space.get_objs_from_pos(sink_obj.pos):
                     if obj == sink_obj:
                         continue
                     if obj.pos == sink_obj.pos:
                         if bmp.obj.same_float_prop(obj, sink_obj):
-                            if obj not in delete_list and sink_obj not in delete_list:
+                            if obj not in delete_set:
                                 delete_list.append(obj)
                                 delete_list.append(sink_obj)
+                                delete_set.update((obj, sink_obj))
                                 break
             for obj in delete_list:
                 self.destroy_obj(space, obj)
@@ -659,11 +830,13 @@ class Level(object):
         if success:
             self.sound_events.append("sink")
     def hot_and_melt(self) -> None:
+        if not self.have_objs_with_prop(bmp.obj.TextMelt):
+            return
         success = False
         for space in self.space_list:
             delete_list = []
-            melt_objs = [o for o in space.object_list if o.properties.enabled(bmp.obj.TextMelt)]
-            hot_objs = [o for o in space.object_list if o.properties.enabled(bmp.obj.TextHot)]
+            melt_objs = space.get_objs_from_prop(bmp.obj.TextMelt)
+            hot_objs = space.get_objs_from_prop(bmp.obj.TextHot)
             if len(hot_objs) != 0 and (space.properties[bmp.obj.default_space_object_type].enabled(bmp.obj.TextMelt) or self.properties[bmp.obj.default_level_object_type].enabled(bmp.obj.TextMelt)):
                 for melt_obj in melt_objs:
                     if not melt_obj.properties.enabled(bmp.obj.TextFloat):
@@ -674,12 +847,13 @@ class Level(object):
                     if not melt_obj.properties.enabled(bmp.obj.TextFloat):
                         delete_list.append(melt_obj)
                 continue
+            melt_cells = space.get_prop_cells(bmp.obj.TextMelt)
+            delete_set = set()
             for hot_obj in hot_objs:
-                for melt_obj in melt_objs:
-                    if hot_obj.pos == melt_obj.pos:
-                        if bmp.obj.same_float_prop(hot_obj, melt_obj):
-                            if melt_obj not in delete_list:
-                                delete_list.append(melt_obj)
+                for melt_obj in melt_cells.get((hot_obj.pos, hot_obj.properties.enabled(bmp.obj.TextFloat)), []):
+                    if melt_obj not in delete_set:
+                        delete_list.append(melt_obj)
+                        delete_set.add(melt_obj)
             for obj in delete_list:
                 self.destroy_obj(space, obj)
             if len(delete_list) != 0:
@@ -687,24 +861,23 @@ class Level(object):
         if success:
             self.sound_events.append("melt")
     def defeat(self) -> None:
+        if not (self.have_prop(bmp.obj.TextDefeat) and self.have_prop(bmp.obj.TextYou)):
+            return
         success = False
         for space in self.space_list:
             delete_list = []
-            you_objs = [o for o in space.object_list if o.properties.enabled(bmp.obj.TextYou)]
-            defeat_objs = [o for o in space.object_list if o.properties.enabled(bmp.obj.TextDefeat)]
+            you_objs = space.get_objs_from_prop(bmp.obj.TextYou)
+            defeat_objs = space.get_objs_from_prop(bmp.obj.TextDefeat)
             if len(defeat_objs) != 0 and (space.properties[bmp.obj.default_space_object_type].enabled(bmp.obj.TextYou) or self.properties[bmp.obj.default_level_object_type].enabled(bmp.obj.TextYou)):
                 delete_list.extend(space.object_list)
                 continue
+            defeat_cells = space.get_prop_cells(bmp.obj.TextDefeat)
             for you_obj in you_objs:
                 if space.properties[bmp.obj.default_space_object_type].enabled(bmp.obj.TextDefeat) or self.properties[bmp.obj.default_level_object_type].enabled(bmp.obj.TextDefeat):
-                    if you_obj not in delete_list:
-                        delete_list.append(you_obj)
-                        continue
-                for defeat_obj in defeat_objs:
-                    if you_obj.pos == defeat_obj.pos:
-                        if bmp.obj.same_float_prop(defeat_obj, you_obj):
-                            if you_obj not in delete_list:
-                                delete_list.append(you_obj)
+                    delete_list.append(you_obj)
+                    continue
+                if (you_obj.pos, you_obj.properties.enabled(bmp.obj.TextFloat)) in defeat_cells:
+                    delete_list.append(you_obj)
             for obj in delete_list:
                 self.destroy_obj(space, obj)
             if len(delete_list) != 0:
@@ -713,49 +886,54 @@ class Level(object):
             self.sound_events.append("defeat")
     def bonus(self) -> dict[type[bmp.obj.Object], bool]:
         collected: dict[type[bmp.obj.Object], bool] = {}
+        if not (self.have_prop(bmp.obj.TextBonus) and self.have_prop(bmp.obj.TextYou)):
+            return collected
         for space in self.space_list:
             delete_list = []
-            bonus_objs = [o for o in space.object_list if o.properties.enabled(bmp.obj.TextBonus)]
-            you_objs = [o for o in space.object_list if o.properties.enabled(bmp.obj.TextYou)]
+            bonus_objs = space.get_objs_from_prop(bmp.obj.TextBonus)
+            you_objs = space.get_objs_from_prop(bmp.obj.TextYou)
             if len(you_objs) != 0 and (space.properties[bmp.obj.default_space_object_type].enabled(bmp.obj.TextBonus) or self.properties[bmp.obj.default_level_object_type].enabled(bmp.obj.TextBonus)):
                 delete_list.extend(space.object_list)
                 continue
+            you_cells = space.get_prop_cells(bmp.obj.TextYou)
             for bonus_obj in bonus_objs:
                 if space.properties[bmp.obj.default_space_object_type].enabled(bmp.obj.TextYou) or self.properties[bmp.obj.default_level_object_type].enabled(bmp.obj.TextYou):
-                    if bonus_obj not in delete_list:
-                        delete_list.append(bonus_obj)
-                        continue
-                for you_obj in you_objs:
-                    if bonus_obj.pos == you_obj.pos:
-                        if bmp.obj.same_float_prop(you_obj, bonus_obj):
-                            if bonus_obj not in delete_list:
-                                delete_list.append(bonus_obj)
-                                collected[type(bonus_obj)] = True
+                    delete_list.append(bonus_obj)
+                    continue
+                if (bonus_obj.pos, bonus_obj.properties.enabled(bmp.obj.TextFloat)) in you_cells:
+                    delete_list.append(bonus_obj)
+                    collected[type(bonus_obj)] = True
             for obj in delete_list:
                 self.destroy_obj(space, obj)
         if len(collected):
             self.sound_events.append("bonus")
         return collected
     def open_and_shut(self) -> None:
+        if not (self.have_prop(bmp.obj.TextOpen) and self.have_prop(bmp.obj.TextShut)):
+            return
         success = False
         for space in self.space_list:
             delete_list = []
-            shut_objs = [o for o in space.object_list if o.properties.enabled(bmp.obj.TextShut)]
-            open_objs = [o for o in space.object_list if o.properties.enabled(bmp.obj.TextOpen)]
+            shut_objs = space.get_objs_from_prop(bmp.obj.TextShut)
+            open_objs = space.get_objs_from_prop(bmp.obj.TextOpen)
             if len(open_objs) != 0 and (space.properties[bmp.obj.default_space_object_type].enabled(bmp.obj.TextShut) or self.properties[bmp.obj.default_level_object_type].enabled(bmp.obj.TextShut)):
                 delete_list.extend(space.object_list)
                 continue
             if len(shut_objs) != 0 and (space.properties[bmp.obj.default_space_object_type].enabled(bmp.obj.TextOpen) or self.properties[bmp.obj.default_level_object_type].enabled(bmp.obj.TextOpen)):
                 delete_list.extend(space.object_list)
                 continue
+            shut_cells = space.get_prop_cells(bmp.obj.TextShut, float_layer=False)
+            delete_set = set()
             for open_obj in open_objs:
-                for shut_obj in shut_objs:
-                    if shut_obj.pos == open_obj.pos:
-                        if shut_obj not in delete_list and open_obj not in delete_list:
-                            delete_list.append(shut_obj)
-                            if shut_obj != open_obj:
-                                delete_list.append(open_obj)
-                            break
+                if open_obj in delete_set:
+                    continue
+                for shut_obj in shut_cells.get((open_obj.pos, False), []):
+                    if shut_obj not in delete_set:
+                        delete_list.append(shut_obj)
+                        if shut_obj != open_obj:
+                            delete_list.append(open_obj)
+                        delete_set.update((shut_obj, open_obj))
+                        break
             for obj in delete_list:
                 self.destroy_obj(space, obj)
             if len(delete_list) != 0:
@@ -777,36 +955,38 @@ class Level(object):
                     for _ in range(make_noun_count):
                         if issubclass(make_object_type, bmp.obj.Game):
                             if isinstance(obj, (bmp.obj.LevelObject, bmp.obj.SpaceObject)):
-                                space.new_obj(bmp.obj.Game(obj.pos, obj.orient, ref_type=bmp.obj.get_noun_from_type(type(obj))))
+                                self.new_obj(space, bmp.obj.Game(obj.pos, obj.orient, ref_type=bmp.obj.get_noun_from_type(type(obj))))
                             else:
-                                space.new_obj(bmp.obj.Game(obj.pos, obj.orient, ref_type=type(obj)))
+                                self.new_obj(space, bmp.obj.Game(obj.pos, obj.orient, ref_type=type(obj)))
                         elif issubclass(make_object_type, bmp.obj.LevelObject):
                             if len(space.get_objs_from_pos_and_type(obj.pos, make_object_type)) == 0:
                                 level_extra: bmp.obj.LevelObjectExtra = {"icon": {"name": obj.sprite_name, "color": obj.get_color()}}
                                 if obj.level_id is not None:
-                                    space.new_obj(make_object_type(obj.pos, obj.orient, level_id=obj.level_id, level_extra=level_extra))
+                                    self.new_obj(space, make_object_type(obj.pos, obj.orient, level_id=obj.level_id, level_extra=level_extra))
                                 else:
-                                    space.new_obj(make_object_type(obj.pos, obj.orient, level_id=self.level_id, level_extra=level_extra))
+                                    self.new_obj(space, make_object_type(obj.pos, obj.orient, level_id=self.level_id, level_extra=level_extra))
                         elif issubclass(make_object_type, bmp.obj.SpaceObject):
                             if len(space.get_objs_from_pos_and_type(obj.pos, make_object_type)) == 0:
                                 if obj.space_id is not None:
-                                    space.new_obj(make_object_type(obj.pos, obj.orient, space_id=obj.space_id))
+                                    self.new_obj(space, make_object_type(obj.pos, obj.orient, space_id=obj.space_id))
                                 else:
-                                    space.new_obj(make_object_type(obj.pos, obj.orient, space_id=space.space_id))
+                                    self.new_obj(space, make_object_type(obj.pos, obj.orient, space_id=space.space_id))
                         else:
-                            space.new_obj(make_object_type(obj.pos, obj.orient, space_id=obj.space_id, level_id=obj.level_id))
+                            self.new_obj(space, make_object_type(obj.pos, obj.orient, space_id=obj.space_id, level_id=obj.level_id))
     def text_plus_and_text_minus(self) -> None:
+        if not (self.have_objs_with_prop(bmp.obj.TextTextPlus) or self.have_objs_with_prop(bmp.obj.TextTextMinus)):
+            return
         for space in self.space_list:
             delete_list = []
-            text_plus_objs = [o for o in space.object_list if o.properties.enabled(bmp.obj.TextTextPlus)]
-            text_minus_objs = [o for o in space.object_list if o.properties.enabled(bmp.obj.TextTextMinus)]
+            text_plus_objs = space.get_objs_from_prop(bmp.obj.TextTextPlus)
+            text_minus_objs = space.get_objs_from_prop(bmp.obj.TextTextMinus)
             for text_plus_obj in text_plus_objs:
                 if text_plus_obj in text_minus_objs:
                     continue
                 new_type = bmp.obj.get_noun_from_type(type(text_plus_obj))
                 if not issubclass(new_type, bmp.obj.TextText):
                     delete_list.append(text_plus_obj)
-                    space.new_obj(new_type(text_plus_obj.pos, text_plus_obj.orient, space_id=text_plus_obj.space_id, level_id=text_plus_obj.level_id))
+                    self.new_obj(space, new_type(text_plus_obj.pos, text_plus_obj.orient, space_id=text_plus_obj.space_id, level_id=text_plus_obj.level_id))
             for text_minus_obj in text_minus_objs:
                 if text_minus_obj in text_plus_objs:
                     continue
@@ -817,20 +997,20 @@ class Level(object):
                     continue
                 delete_list.append(text_minus_obj)
                 if issubclass(new_type, bmp.obj.Game):
-                    space.new_obj(bmp.obj.Game(text_minus_obj.pos, text_minus_obj.orient, ref_type=bmp.obj.TextGame))
+                    self.new_obj(space, bmp.obj.Game(text_minus_obj.pos, text_minus_obj.orient, ref_type=bmp.obj.TextGame))
                 elif issubclass(new_type, bmp.obj.LevelObject):
                     level_extra: bmp.obj.LevelObjectExtra = {"icon": {"name": text_minus_obj.json_name, "color": bmp.color.current_palette[text_minus_obj.sprite_palette]}}
                     if text_minus_obj.level_id is not None:
-                        space.new_obj(new_type(text_minus_obj.pos, text_minus_obj.orient, level_id=self.level_id, level_extra=level_extra))
+                        self.new_obj(space, new_type(text_minus_obj.pos, text_minus_obj.orient, level_id=self.level_id, level_extra=level_extra))
                     else:
-                        space.new_obj(new_type(text_minus_obj.pos, text_minus_obj.orient, level_id=self.level_id, level_extra=level_extra))
+                        self.new_obj(space, new_type(text_minus_obj.pos, text_minus_obj.orient, level_id=self.level_id, level_extra=level_extra))
                 elif issubclass(new_type, bmp.obj.SpaceObject):
                     if text_minus_obj.space_id is not None:
-                        space.new_obj(new_type(text_minus_obj.pos, text_minus_obj.orient, space_id=text_minus_obj.space_id))
+                        self.new_obj(space, new_type(text_minus_obj.pos, text_minus_obj.orient, space_id=text_minus_obj.space_id))
                     else:
-                        space.new_obj(new_type(text_minus_obj.pos, text_minus_obj.orient, space_id=space.space_id))
+                        self.new_obj(space, new_type(text_minus_obj.pos, text_minus_obj.orient, space_id=space.space_id))
                 else:
-                    space.new_obj(new_type(text_minus_obj.pos, text_minus_obj.orient, space_id=text_minus_obj.space_id, level_id=text_minus_obj.level_id))
+                    self.new_obj(space, new_type(text_minus_obj.pos, text_minus_obj.orient, space_id=text_minus_obj.space_id, level_id=text_minus_obj.level_id))
             for obj in delete_list:
                 self.destroy_obj(space, obj)
     def game(self) -> None:
@@ -846,62 +1026,58 @@ class Level(object):
     def win(self) -> bool:
         if self.properties[bmp.obj.default_level_object_type].enabled(bmp.obj.TextWin):
             return True
+        if not self.have_objs_with_prop(bmp.obj.TextYou):
+            return False
         for space in self.space_list:
-            you_objs = [o for o in space.object_list if o.properties.enabled(bmp.obj.TextYou)]
-            win_objs = [o for o in space.object_list if o.properties.enabled(bmp.obj.TextWin)]
+            you_objs = space.get_objs_from_prop(bmp.obj.TextYou)
+            win_cells = space.get_prop_cells(bmp.obj.TextWin)
             for you_obj in you_objs:
-                if you_obj in win_objs:
+                if space.has_prop_obj(bmp.obj.TextWin, you_obj):
                     return True
                 if space.properties[bmp.obj.default_space_object_type].enabled(bmp.obj.TextWin):
                     if not you_obj.properties.enabled(bmp.obj.TextFloat):
                         return True
-                for win_obj in win_objs:
-                    if you_obj.pos == win_obj.pos:
-                        if bmp.obj.same_float_prop(you_obj, win_obj):
-                            return True
+                if (you_obj.pos, you_obj.properties.enabled(bmp.obj.TextFloat)) in win_cells:
+                    return True
         return False
     def end(self) -> bool:
         if self.properties[bmp.obj.default_level_object_type].enabled(bmp.obj.TextEnd):
             return True
+        if not self.have_objs_with_prop(bmp.obj.TextYou):
+            return False
         for space in self.space_list:
-            you_objs = [o for o in space.object_list if o.properties.enabled(bmp.obj.TextYou)]
-            end_objs = [o for o in space.object_list if o.properties.enabled(bmp.obj.TextEnd)]
+            you_objs = space.get_objs_from_prop(bmp.obj.TextYou)
+            end_cells = space.get_prop_cells(bmp.obj.TextEnd)
             for you_obj in you_objs:
-                if you_obj in end_objs:
+                if space.has_prop_obj(bmp.obj.TextEnd, you_obj):
                     return True
                 if space.properties[bmp.obj.default_space_object_type].enabled(bmp.obj.TextEnd):
                     if not you_obj.properties.enabled(bmp.obj.TextFloat):
                         return True
-                for end_obj in end_objs:
-                    if you_obj.pos == end_obj.pos:
-                        if bmp.obj.same_float_prop(you_obj, end_obj):
-                            return True
+                if (you_obj.pos, you_obj.properties.enabled(bmp.obj.TextFloat)) in end_cells:
+                    return True
         return False
     def done(self) -> bool:
+        if not self.have_prop(bmp.obj.TextDone):
+            return False
         for space in self.space_list:
             delete_list = []
             if self.properties[bmp.obj.default_level_object_type].enabled(bmp.obj.TextDone):
                 delete_list.extend(space.object_list)
             if space.properties[bmp.obj.default_space_object_type].enabled(bmp.obj.TextDone):
                 delete_list.extend(space.object_list)
-            for obj in space.object_list:
-                if obj.properties.enabled(bmp.obj.TextDone):
-                    delete_list.append(obj)
+            delete_list.extend(space.get_objs_from_prop(bmp.obj.TextDone))
             for obj in delete_list:
-                space.del_obj(obj)
+                self.del_obj(space, obj)
             if len(delete_list) != 0 and "done" not in self.sound_events:
                 self.sound_events.append("done")
         for space in self.space_list:
-            for obj in [o for o in space.object_list if bmp.obj.TextAll().isreferenceof(o, all_list = self.all_list)]:
+            for obj in space.get_objs_from_noun(bmp.obj.TextAll(), all_list = self.all_list):
                 if not obj.properties.enabled(bmp.obj.TextDone):
                     return False
         return len(delete_list) > 0
     def have_you(self) -> bool:
-        for space in self.space_list:
-            for obj in space.object_list:
-                if obj.properties.enabled(bmp.obj.TextYou):
-                    return True
-        return False
+        return self.have_objs_with_prop(bmp.obj.TextYou)
     def recursion_get_object_surface_info(
         self,
         old_pos: bmp.loc.Coord[int],
@@ -1,5 +1,6 @@
 from typing import Optional, TypeGuard, TypedDict, NotRequired
 import copy
+import random
 from tqdm import tqdm
 
 import bmp.base
@@ -27,6 +28,50 @@ default_levelpack_info: ReturnInfo = {
     "select": None
 }
 
+default_seed: int = 0
+
+def new_seed() -> int:
+    return random.SystemRandom().randrange(2 ** 32)
+
+type RandomState = tuple[int, tuple[int, ...], Optional[float]]
+type RandomStateJson = list
+
+def random_state_to_json(state: RandomState) -> RandomStateJson:
+    return [state[0], list(state[1]), state[2]]
+
+def json_to_random_state(json_object: RandomStateJson) -> RandomState:
+    return (json_object[0], tuple(json_object[1]), json_object[2])
+
+class TickReport(TypedDict):
+    ran: list[str]
+    skipped: list[str]
+
+type RuleFingerprint = tuple[int, bmp.ref.SpaceID, tuple[bmp.ref.SpaceID, ...], tuple[type[bmp.obj.Object], ...], tuple[int, ...], tuple[tuple[int, int], ...], int]
+
+# a phase only runs when the last update_rules produced one of its trigger types; None means always
+phase_triggers: dict[str, Optional[tuple[type[bmp.obj.Text], ...]]] = {
+    "you": (bmp.obj.TextYou, ),
+    "move": (bmp.obj.TextMove, ),
+    "shift": (bmp.obj.TextShift, ),
+    "transform": (bmp.obj.Noun, bmp.obj.TextWrite),
+    "game": None,
+    "text_plus_and_text_minus": (bmp.obj.TextTextPlus, bmp.obj.TextTextMinus),
+    "tele": (bmp.obj.TextTele, ),
+    "select": (bmp.obj.TextSelect, ),
+    "direction": (bmp.obj.DirectFixProperty, ),
+    "flip": (bmp.obj.DirectMappingProperty, ),
+    "turn": (bmp.obj.TextTurn, bmp.obj.TextDeturn),
+    "done": (bmp.obj.TextDone, ),
+    "sink": (bmp.obj.TextSink, ),
+    "hot_and_melt": (bmp.obj.TextMelt, ),
+    "defeat": (bmp.obj.TextDefeat, ),
+    "open_and_shut": (bmp.obj.TextOpen, ),
+    "make": (bmp.obj.TextMake, ),
+    "bonus": (bmp.obj.TextBonus, ),
+    "end": (bmp.obj.TextEnd, ),
+    "win": (bmp.obj.TextWin, ),
+}
+
 class LevelpackJson41(TypedDict):
     ver: str
     name: NotRequired[str]
@@ -50,6 +95,8 @@ class LevelpackJson4102(TypedDict):
     level_init_states: NotRequired[list[bmp.level.LevelJson41]]
     space_init_states: NotRequired[list[bmp.space.SpaceJson4102]]
     rules: list[list[str]]
+    seed: NotRequired[int]
+    random_state: NotRequired[RandomStateJson]
 
 type LevelpackJson = LevelpackJson4102
 
@@ -65,6 +112,8 @@ class Levelpack(object):
         space_init_state_dict: Optional[dict[bmp.ref.SpaceID, bmp.space.Space]] = None,
         collectibles: Optional[set[bmp.obj.Collectible]] = None,
         rule_list: Optional[list[bmp.rule.Rule]] = None,
+        seed: Optional[int] = None,
+        random_state: Optional[RandomState] = None,
     ) -> None:
         self.name: Optional[str] = name
         self.author: Optional[str] = author
@@ -83,6 +132,18 @@ class Levelpack(object):
         self.current_level_id: bmp.ref.LevelID = current_level_id
         self.collectibles: set[bmp.obj.Collectible] = collectibles if collectibles is not None else set()
         self.rule_list: list[bmp.rule.Rule] = rule_list if (rule_list is not None and len(rule_list) != 0) else bmp.rule.default_rule_list
+        self.seed: Optional[int] = seed
+        self.rng: random.Random = random.Random(self.get_seed())
+        if random_state is not None:
+            self.rng.setstate(random_state)
+        self.rule_types: set[type[bmp.obj.Text]] = set()
+        self.rule_fingerprint: Optional[RuleFingerprint] = None
+        self.tick_report: TickReport = {"ran": [], "skipped": []}
+    def get_seed(self) -> int:
+        return self.seed if self.seed is not None else default_seed
+    def set_seed(self, seed: int) -> None:
+        self.seed = seed
+        self.rng.seed(seed)
     def get_exact_level(self, level_id: bmp.ref.LevelID) -> bmp.level.Level:
         return self.level_dict[level_id]
     def get_level(self, level_id: Optional[bmp.ref.LevelID]) -> Optional[bmp.level.Level]:
@@ -118,38 +179,70 @@ class Levelpack(object):
     @current_level.setter
     def current_level(self, level: bmp.level.Level) -> None:
         self.current_level_id = level.level_id
+    def get_rule_fingerprint(self) -> RuleFingerprint:
+        return (
+            id(self.current_level),
+            self.current_level.current_space_id,
+            tuple(self.current_level.space_included),
+            tuple(self.current_level.all_list),
+            tuple(id(l) for l in self.level_dict.values()),
+            tuple((id(s), s.modify_count) for s in self.space_dict.values()),
+            len(self.rule_list),
+        )
+    def refresh_rules(self) -> None:
+        fingerprint = self.get_rule_fingerprint()
+        if fingerprint == self.rule_fingerprint:
+            self.tick_report["skipped"].append("update_rules")
+            return
+        random_state = self.rng.getstate()
+        self.update_rules()
+        if self.rng.getstate() == random_state:
+            self.rule_fingerprint = fingerprint
+        self.tick_report["ran"].append("update_rules")
+    def schedule(self, phase: str, force: bool = False) -> bool:
+        triggers = phase_triggers[phase]
+        if force or triggers is None or any(issubclass(t, triggers) for t in self.rule_types):
+            self.tick_report["ran"].append(phase)
+            return True
+        self.tick_report["skipped"].append(phase)
+        return False
     def update_rules(self) -> None:
-        self.current_level.game_properties.clear()
+        self.rule_fingerprint = None
+        current_level = self.current_level
+        current_level.game_properties.clear()
         for level_object_type in bmp.obj.level_object_types:
-            self.current_level.properties[level_object_type].clear()
-            self.current_level.special_operator_properties[level_object_type] = {o: bmp.obj.PropertyStorage() for o in bmp.obj.special_operators}
+            current_level.properties[level_object_type].clear()
+            current_level.special_operator_properties[level_object_type] = {o: bmp.obj.PropertyStorage() for o in bmp.obj.special_operators}
         active_space_objs: list[bmp.obj.SpaceObject] = []
-        for space in self.current_level.space_list:
+        for space in current_level.space_list:
             for object_type in bmp.obj.space_object_types:
                 space.properties[object_type].clear()
                 space.special_operator_properties[object_type] = {o: bmp.obj.PropertyStorage() for o in bmp.obj.special_operators}
-            for obj in space.object_list:
-                obj.properties.clear()
-                obj.operator_properties = {o: bmp.obj.PropertyStorage() for o in bmp.obj.special_operators}
-            if space != self.current_level.current_space:
+            space.property_generation.value += 1
+            if space != current_level.current_space:
                 active_space_objs.extend(o for o in space.get_spaces())
         for space_obj in active_space_objs:
             space_obj.properties.clear()
         current_level_objs: list[bmp.obj.LevelObject] = []
+        current_level_obj_spaces: list[bmp.space.Space] = []
         for level in self.level_list:
             for space in level.space_list:
-                if level != self.current_level:
-                    current_level_objs.extend([
+                if level != current_level:
+                    new_level_objs = [
                         o for o in space.get_levels()
-                        if o.level_id == self.current_level.level_id
-                    ])
+                        if o.level_id == current_level.level_id
+                    ]
+                    if len(new_level_objs) != 0:
+                        current_level_objs.extend(new_level_objs)
+                        current_level_obj_spaces.append(space)
         for level_obj in current_level_objs:
             level_obj.properties.clear()
-        for space in self.current_level.space_list:
+        for space in current_level.space_list:
             space.set_rule()
+        rule_types: set[type[bmp.obj.Text]] = set()
         new_prop_list: list[tuple[bmp.obj.Object, tuple[bmp.obj.Text, bool]]] = []
         global_rule_info_list = [bmp.rule.get_info_from_rule(r) for r in self.rule_list]
-        for space in self.current_level.space_list:
+        for space in current_level.space_list:
             # space & levelpack
             for rule_info in space.rule_info + global_rule_info_list:
                 prefix_info_list = rule_info.prefix_info_list
@@ -160,11 +253,11 @@ class Levelpack(object):
                 if isinstance(noun_obj, bmp.obj.Noun):
                     if type(noun_obj) == bmp.obj.TextAll:
                         if noun_negated:
-                            new_match_obj_list = [o for o in space.object_list if isinstance(o, bmp.obj.types_in_not_all)]
+                            new_match_obj_list = space.get_objs_from_type(bmp.obj.types_in_not_all)
                         else:
-                            new_match_obj_list = [o for o in space.object_list if noun_obj.isreferenceof(o, all_list = self.current_level.all_list)]
+                            new_match_obj_list = space.get_objs_from_noun(noun_obj, all_list = current_level.all_list)
                     elif noun_negated:
-                        new_match_obj_list = [o for o in space.object_list if bmp.obj.TextAll().isreferenceof(o, all_list = self.current_level.all_list) and not noun_obj.isreferenceof(o)]
+                        new_match_obj_list = [o for o in space.get_objs_from_noun(bmp.obj.TextAll(), all_list = current_level.all_list) if not noun_obj.isreferenceof(o)]
                     else:
                         new_match_obj_list = [o for o in space.get_objs_from_noun(noun_obj)]
                         # meta object
@@ -176,15 +269,15 @@ class Levelpack(object):
                                 # meta game
                                 if issubclass(noun_obj.ref_type, bmp.obj.Game) and isinstance(oper_obj, bmp.obj.TextIs):
                                     if len(infix_info_list) == 0 and len(prefix_info_list) == 0:
-                                        self.current_level.game_properties.update(prop_obj, prop_negated)
+                                        current_level.game_properties.update(prop_obj, prop_negated)
                                 # meta level
                                 elif issubclass(noun_obj.ref_type, bmp.obj.LevelObject):
                                     level_prop_update: bool = False
                                     for level_obj in current_level_objs:
                                         if not isinstance(level_obj, noun_obj.ref_type):
                                             continue
-                                        meet_prefix_conditions = self.current_level.meet_prefix_conditions(space, level_obj, prefix_info_list, True)
-                                        meet_infix_conditions = self.current_level.meet_infix_conditions(space, level_obj, infix_info_list)
+                                        meet_prefix_conditions = current_level.meet_prefix_conditions(space, level_obj, prefix_info_list, True, rng=self.rng)
+                                        meet_infix_conditions = current_level.meet_infix_conditions(space, level_obj, infix_info_list)
                                         if len(prefix_info_list) != 0 and not meet_prefix_conditions:
                                             continue
                                         if len(infix_info_list) != 0 and not meet_infix_conditions:
@@ -198,9 +291,9 @@ class Levelpack(object):
                                         level_prop_update |= True
                                     if level_prop_update:
                                         if type(oper_obj) == bmp.obj.TextIs:
-                                            self.current_level.properties[noun_obj.ref_type].update(prop_obj, prop_negated)
+                                            current_level.properties[noun_obj.ref_type].update(prop_obj, prop_negated)
                                         else:
-                                            self.current_level.special_operator_properties[noun_obj.ref_type][type(oper_obj)].update(prop_obj, prop_negated)
+                                            current_level.special_operator_properties[noun_obj.ref_type][type(oper_obj)].update(prop_obj, prop_negated)
                                     del level_prop_update
                                 # meta space
                                 elif issubclass(noun_obj.ref_type, bmp.obj.SpaceObject):
@@ -208,8 +301,8 @@ class Levelpack(object):
                                     for space_obj in active_space_objs:
                                         if not isinstance(space_obj, noun_obj.ref_type):
                                             continue
-                                        meet_prefix_conditions = self.current_level.meet_prefix_conditions(space, space_obj, prefix_info_list, True)
-                                        meet_infix_conditions = self.current_level.meet_infix_conditions(space, space_obj, infix_info_list)
+                                        meet_prefix_conditions = current_level.meet_prefix_conditions(space, space_obj, prefix_info_list, True, rng=self.rng)
+                                        meet_infix_conditions = current_level.meet_infix_conditions(space, space_obj, infix_info_list)
                                         if len(prefix_info_list) != 0 and not meet_prefix_conditions:
                                             continue
                                         if len(infix_info_list) != 0 and not meet_infix_conditions:
@@ -229,7 +322,7 @@ class Levelpack(object):
                                     del space_prop_update
                 else:
                     if noun_negated:
-                        new_match_obj_list = [o for o in space.object_list if bmp.obj.TextAll().isreferenceof(o, all_list = self.current_level.all_list) and not noun_obj.isreferenceof(o)]
+                        new_match_obj_list = [o for o in space.get_objs_from_noun(bmp.obj.TextAll(), all_list = current_level.all_list) if not noun_obj.isreferenceof(o)]
                     else:
                         new_match_obj_list = [o for o in space.get_objs_from_noun(noun_obj)]
                 for oper_info in rule_info.oper_list:
@@ -237,14 +330,15 @@ class Levelpack(object):
                     for prop_info in oper_info.prop_list:
                         prop_obj = prop_info.prop
                         prop_negated = prop_info.prop_negated
+                        rule_types.update((type(oper_obj), type(prop_obj)))
                         for obj in new_match_obj_list:
-                            if self.current_level.meet_infix_conditions(space, obj, infix_info_list) and self.current_level.meet_prefix_conditions(space, obj, prefix_info_list):
+                            if current_level.meet_infix_conditions(space, obj, infix_info_list) and current_level.meet_prefix_conditions(space, obj, prefix_info_list, rng=self.rng):
                                 if type(oper_obj) == bmp.obj.TextIs:
                                     new_prop_list.append((obj, (prop_obj, prop_negated)))
                                 else:
                                     obj.operator_properties[type(oper_obj)].update(prop_obj, prop_negated)
             # outer space
-            outer_space_rule_info = self.current_level.recursion_rules(space)[1]
+            outer_space_rule_info = current_level.recursion_rules(space)[1]
             for rule_info in outer_space_rule_info:
                 prefix_info_list = rule_info.prefix_info_list
                 noun_negated = rule_info.noun_negated
@@ -254,17 +348,17 @@ class Levelpack(object):
                 if isinstance(noun_obj, bmp.obj.GeneralNoun):
                     object_type = noun_obj.ref_type
                     if noun_negated:
-                        new_match_obj_list = [o for o in space.object_list if bmp.obj.TextAll().isreferenceof(o, all_list = self.current_level.all_list) and not isinstance(o, object_type)]
+                        new_match_obj_list = [o for o in space.get_objs_from_noun(bmp.obj.TextAll(), all_list = current_level.all_list) if not isinstance(o, object_type)]
                     else:
                         new_match_obj_list = [o for o in space.get_objs_from_type(object_type)]
                 elif type(noun_obj) is bmp.obj.TextAll:
                     if noun_negated:
-                        new_match_obj_list = [o for o in space.object_list if isinstance(o, bmp.obj.types_in_not_all)]
+                        new_match_obj_list = space.get_objs_from_type(bmp.obj.types_in_not_all)
                     else:
-                        new_match_obj_list = [o for o in space.object_list if noun_obj.isreferenceof(o, all_list = self.current_level.all_list)]
+                        new_match_obj_list = space.get_objs_from_noun(noun_obj, all_list = current_level.all_list)
                 else:
                     if noun_negated:
-                        new_match_obj_list = [o for o in space.object_list if bmp.obj.TextAll().isreferenceof(o, all_list = self.current_level.all_list) and not noun_obj.isreferenceof(o)]
+                        new_match_obj_list = [o for o in space.get_objs_from_noun(bmp.obj.TextAll(), all_list = current_level.all_list) if not noun_obj.isreferenceof(o)]
                     else:
                         new_match_obj_list = [o for o in space.get_objs_from_noun(noun_obj)]
                 for oper_info in rule_info.oper_list:
@@ -272,17 +366,21 @@ class Levelpack(object):
                     for prop_info in oper_info.prop_list:
                         prop_obj = prop_info.prop
                         prop_negated = prop_info.prop_negated
+                        rule_types.update((type(oper_obj), type(prop_obj)))
                         if issubclass(object_type, bmp.obj.Game) and isinstance(oper_obj, bmp.obj.TextIs):
-                            if not noun_negated and len(infix_info_list) == 0 and self.current_level.meet_prefix_conditions(space, bmp.obj.Object((0, 0)), prefix_info_list, True):
-                                self.current_level.game_properties.update(prop_obj, prop_negated)
+                            if not noun_negated and len(infix_info_list) == 0 and current_level.meet_prefix_conditions(space, bmp.obj.Object((0, 0)), prefix_info_list, True, rng=self.rng):
+                                current_level.game_properties.update(prop_obj, prop_negated)
                         for obj in new_match_obj_list:
-                            if self.current_level.meet_infix_conditions(space, obj, infix_info_list) and self.current_level.meet_prefix_conditions(space, obj, prefix_info_list):
+                            if current_level.meet_infix_conditions(space, obj, infix_info_list) and current_level.meet_prefix_conditions(space, obj, prefix_info_list, rng=self.rng):
                                 if type(oper_obj) == bmp.obj.TextIs:
                                     new_prop_list.append((obj, (prop_obj, prop_negated)))
                                 else:
                                     obj.operator_properties[type(oper_obj)].update(prop_obj, prop_negated)
         for obj, (prop_obj, prop_negated) in new_prop_list:
             obj.properties.update(prop_obj, prop_negated)
+        self.rule_types = rule_types
+        for space in current_level.space_list + current_level_obj_spaces:
+            space.refresh_property_index()
     def get_transform_noun(self, old_obj: bmp.obj.Object, negated: bool = False) -> list[bmp.obj.Noun]:
         new_noun_list: list[bmp.obj.Noun] = []
         get_prop_dict_func = bmp.obj.PropertyStorage.disabled_dict if negated else bmp.obj.PropertyStorage.enabled_dict
@@ -335,10 +433,10 @@ class Levelpack(object):
                     transform_success = True
                 if isinstance(new_noun, bmp.obj.SpecificSpaceNoun):
                     if new_noun.isreferenceof(old_obj) and old_obj.space_id is not None:
-                        old_obj.space_id += new_noun.delta_infinite_tier
+                        space.set_obj_space_id(old_obj, old_obj.space_id + new_noun.delta_infinite_tier)
                 continue
             new_obj = old_obj.transform(new_noun.ref_type)
-            new_obj.reset_uuid()
+            new_obj.reset_uid()
             if isinstance(old_obj, bmp.obj.SpaceObject) and isinstance(new_obj, bmp.obj.LevelObject):
                 if old_obj.space_id is not None and new_obj.level_id is not None:
                     if new_obj.level_id not in self.level_dict.keys():
@@ -348,23 +446,23 @@ class Levelpack(object):
                         )
                         self.set_level(new_obj.level_id, new_obj_level)
                         self.set_level_init_state(new_obj.level_id, new_obj_level)
-                space.new_obj(new_obj)
+                level.new_obj(space, new_obj)
                 transform_success = True
             elif isinstance(old_obj, bmp.obj.LevelObject) and isinstance(new_obj, bmp.obj.SpaceObject):
                 old_obj_level = self.get_level(old_obj.level_id)
                 if old_obj_level is not None:
                     for old_obj_space in old_obj_level.space_list:
-                        new_obj_copy = copy.deepcopy(new_obj)
-                        new_obj_copy.reset_uuid()
+                        new_obj_copy = new_obj.clone()
+                        new_obj_copy.reset_uid()
                         new_obj_copy.space_id = old_obj_space.space_id
                         level.space_included.append(old_obj_space.space_id)
-                        space.new_obj(new_obj_copy)
+                        level.new_obj(space, new_obj_copy)
                 transform_success = True
             else:
-                space.new_obj(new_obj)
+                level.new_obj(space, new_obj)
                 transform_success = True
         if transform_success:
-            space.del_obj(old_obj)
+            level.del_obj(space, old_obj)
         return transform_success
     def transform(self) -> bool:
         level_transform_success: bool = False
@@ -403,47 +501,63 @@ class Levelpack(object):
             if sub_level.map_info is not None:
                 if clear_counts >= sub_level.map_info.get("spore_for_blossom", float("inf")):
                     self.collectibles.add(bmp.obj.Collectible(bmp.obj.Blossom, sub_level.level_id))
+        self.rule_fingerprint = None
     def tick(self, op: Optional[bmp.loc.Orient]) -> ReturnInfo:
         self.prepare()
         self.current_level.sound_events = []
         self.current_level.created_levels = []
-        self.update_rules()
+        self.tick_report = {"ran": [], "skipped": []}
+        self.refresh_rules()
         game_push = False
-        game_push |= self.current_level.you(op)
-        game_push |= self.current_level.move()
+        if self.schedule("you"):
+            game_push |= self.current_level.you(op)
+        if self.schedule("move"):
+            game_push |= self.current_level.move()
         # BIY had this parsing step
-        # self.update_rules()
-        game_push |= self.current_level.shift()
-        self.update_rules()
-        transform = self.transform()
-        self.current_level.game()
-        self.current_level.text_plus_and_text_minus()
-        self.update_rules()
-        self.current_level.tele()
-        select = self.current_level.select(op)
+        # self.refresh_rules()
+        if self.schedule("shift"):
+            game_push |= self.current_level.shift()
+        self.refresh_rules()
+        transform = self.transform() if self.schedule("transform") else False
+        if self.schedule("game"):
+            self.current_level.game()
+        if self.schedule("text_plus_and_text_minus"):
+            self.current_level.text_plus_and_text_minus()
+        self.refresh_rules()
+        if self.schedule("tele"):
+            self.current_level.tele(self.rng)
+        select = self.current_level.select(op) if self.schedule("select") else None
         if select is not None:
             select = [l for l in select if l in self.level_dict.keys()]
             if len(select) == 0:
                 select = None
-        self.update_rules()
-        self.current_level.direction()
-        self.current_level.flip()
-        self.current_level.turn()
-        self.update_rules()
-        done = self.current_level.done()
-        self.current_level.sink()
-        self.current_level.hot_and_melt()
-        self.current_level.defeat()
-        self.current_level.open_and_shut()
-        self.update_rules()
-        self.current_level.make()
-        self.update_rules()
+        self.refresh_rules()
+        if self.schedule("direction"):
+            self.current_level.direction()
+        if self.schedule("flip", force=self.current_level.have_dynamic_transform()):
+            self.current_level.flip()
+        if self.schedule("turn"):
+            self.current_level.turn()
+        self.refresh_rules()
+        done = self.current_level.done() if self.schedule("done") else False
+        if self.schedule("sink"):
+            self.current_level.sink()
+        if self.schedule("hot_and_melt"):
+            self.current_level.hot_and_melt()
+        if self.schedule("defeat"):
+            self.current_level.defeat()
+        if self.schedule("open_and_shut"):
+            self.current_level.open_and_shut()
+        self.refresh_rules()
+        if self.schedule("make"):
+            self.current_level.make()
+        self.refresh_rules()
         for new_level in self.current_level.created_levels:
             self.set_level(new_level.level_id, new_level)
         self.current_level.refresh_all_list()
-        bonus = self.current_level.bonus()
-        end = self.current_level.end()
-        win = self.current_level.win()
+        bonus = self.current_level.bonus() if self.schedule("bonus") else {}
+        end = self.current_level.end() if self.schedule("end") else False
+        win = self.current_level.win() if self.schedule("win") else False
         for object_type in [t for t, b in bonus.items() if b]:
             self.collectibles.add(bmp.obj.Collectible(object_type, self.current_level.level_id))
         for space in self.current_level.space_list:
@@ -461,6 +575,32 @@ class Levelpack(object):
             "game_push": game_push,
             "select": select,
         }
+    def change_level(self, info: ReturnInfo) -> None:
+        if info["win"]:
+            self.reset_level(self.current_level_id)
+            if self.current_level.super_level_id is not None and self.current_level.super_level_id in self.level_dict.keys():
+                self.current_level_id = self.current_level.super_level_id
+        elif info["end"] or info["done"]:
+            pass
+        elif info["transform"]:
+            if self.current_level.super_level_id is not None and self.current_level.super_level_id in self.level_dict.keys():
+                self.current_level_id = self.current_level.super_level_id
+        elif info["select"] is not None:
+            selected_level_id: bmp.ref.LevelID = self.rng.choice(info["select"])
+            if selected_level_id in self.level_dict.keys():
+                self.current_level_id = selected_level_id
+        self.prepare()
+    def get_state_hash(self) -> int:
+        state_hash = bmp.base.stable_hash(("level", self.current_level_id.name))
+        for space_id, space in self.space_dict.items():
+            state_hash += bmp.base.stable_hash((
+                "space", space_id.name, space_id.infinite_tier, space.state_hash,
+                space.static_transform["direct"], space.static_transform["flip"],
+                space.dynamic_transform["direct"], space.dynamic_transform["flip"],
+            ))
+        for collectible in self.collectibles:
+            state_hash += bmp.base.stable_hash(("collectible", collectible.object_type.json_name, collectible.source.name))
+        return state_hash & bmp.base.hash_mask
     def to_json(self) -> LevelpackJson:
         json_object: LevelpackJson = {
             "ver": bmp.base.version,
@@ -472,8 +612,15 @@ class Levelpack(object):
             "collectibles": [],
             "rules": []
         }
+        uid_map: dict[int, int] = {}
         if self.name is not None: json_object["name"] = self.name
         if self.author is not None: json_object["author"] = self.author
+        random_state = self.rng.getstate()
+        if random_state != random.Random(self.get_seed()).getstate():
+            json_object["seed"] = self.get_seed()
+            json_object["random_state"] = random_state_to_json(random_state)
+        elif self.seed is not None:
+            json_object["seed"] = self.seed
         for level in tqdm(
             self.level_dict.values(),
             desc = bmp.lang.fformat("saving.levelpack.levels"),
@@ -489,7 +636,7 @@ class Levelpack(object):
             position = 0,
             **bmp.lang.default_tqdm_args,
         ):
-            json_object["spaces"].append(space.to_json())
+            json_object["spaces"].append(space.to_json(uid_map))
         for level in tqdm(
             self.level_init_state_dict.values(),
             desc = bmp.lang.fformat("saving.levelpack.levels"),
@@ -505,7 +652,7 @@ class Levelpack(object):
             position = 0,
             **bmp.lang.default_tqdm_args,
         ):
-            json_object["space_init_states"].append(space.to_json())
+            json_object["space_init_states"].append(space.to_json(uid_map))
         for collectible in tqdm(
             self.collectibles,
             desc = bmp.lang.fformat("saving.levelpack.collectibles"),
@@ -573,6 +720,7 @@ def update_json_format(json_object: AnyLevelpackJson, ver: str) -> LevelpackJson
 
 def json_to_levelpack(json_object: LevelpackJson) -> Levelpack:
     collectibles: set[bmp.obj.Collectible] = set()
+    uid_map: dict[int, int] = {}
     space_dict: dict[bmp.ref.SpaceID, bmp.space.Space] = {}
     for space_json in tqdm(
         json_object["spaces"],
@@ -581,7 +729,7 @@ def json_to_levelpack(json_object: LevelpackJson) -> Levelpack:
         position = 0,
         **bmp.lang.default_tqdm_args,
     ):
-        space = bmp.space.json_to_space(space_json)
+        space = bmp.space.json_to_space(space_json, uid_map)
         space_dict[space.space_id] = space
     level_dict: dict[bmp.ref.LevelID, bmp.level.Level] = {}
     for level_json in tqdm(
@@ -604,7 +752,7 @@ def json_to_levelpack(json_object: LevelpackJson) -> Levelpack:
             position = 0,
             **bmp.lang.default_tqdm_args,
         ):
-            space = bmp.space.json_to_space(space_json)
+            space = bmp.space.json_to_space(space_json, uid_map)
             space_init_state_dict[space.space_id] = space
     else:
         space_init_state_dict = copy.deepcopy(space_dict)
@@ -635,6 +783,8 @@ def json_to_levelpack(json_object: LevelpackJson) -> Levelpack:
         for object_type in rule:
             rule_list[-1].append(bmp.obj.name_to_class[object_type]()) # type: ignore
     current_level_id: bmp.ref.LevelID = bmp.ref.LevelID(**json_object["current_level"])
+    random_state_json = json_object.get("random_state")
+    random_state: Optional[RandomState] = json_to_random_state(random_state_json) if random_state_json is not None else None
     for collectible in tqdm(
         json_object["collectibles"],
         desc = bmp.lang.fformat("loading.levelpack.collectibles"),
@@ -656,4 +806,6 @@ def json_to_levelpack(json_object: LevelpackJson) -> Levelpack:
         current_level_id = current_level_id,
         collectibles = collectibles,
         rule_list = rule_list,
+        seed = json_object.get("seed"),
+        random_state = random_state,
     )
\ No newline at end of file
@@ -3,9 +3,10 @@ from enum import Enum, StrEnum
 from tqdm import tqdm, trange
 import json
 import os
-from typing import Any, Final, Literal, NotRequired, Optional, TypeGuard, TypedDict, Self
+from typing import Any, Final, Iterator, Literal, NotRequired, Optional, TypeGuard, TypedDict, Self
+import copy
 import math
-import uuid
+import itertools
 import bmp.base
 import bmp.color
 import bmp.lang
@@ -36,22 +37,59 @@ default_level_extra: LevelObjectExtra = {"icon": {"name": "empty", "color": 0xFF
 
 # dict[type[property], dict[negated_number, negated_count]]
 
-@dataclass(init=True, repr=True)
+@dataclass(init=True, repr=True, slots=True)
 class PropertyInfo[T: "Text"]():
     obj: T
     negated: bool
     effected: bool
 
 type PropertyDict = dict[type["Text"], list[PropertyInfo]]
+type PropertyCounter = list[int]
+
+class PropertyGeneration(object):
+    __slots__ = ("value", )
+    def __init__(self) -> None:
+        self.value: int = 0
 
 class PropertyStorage(object):
-    def __init__(self, prop: Optional[PropertyDict] = None) -> None:
+    __slots__ = ("__dict", "__counter", "generation", "stamp")
+    def __init__(self, prop: Optional[PropertyDict] = None, generation: Optional[PropertyGeneration] = None) -> None:
         self.__dict: PropertyDict = prop if prop is not None else {}
+        self.__counter: dict[type["Text"], PropertyCounter] = {k: [self.calc_count(v, False), self.calc_count(v, True)] for k, v in self.__dict.items()}
+        self.generation: Optional[PropertyGeneration] = generation
+        self.stamp: int = generation.value if generation is not None else 0
+    def __validate(self) -> None:
+        if self.generation is not None and self.stamp != self.generation.value:
+            self.__dict.clear()
+            self.__counter.clear()
+            self.stamp = self.generation.value
+    @property
+    def __valid_dict(self) -> PropertyDict:
+        self.__validate()
+        return self.__dict
+    @property
+    def __valid_counter(self) -> dict[type["Text"], PropertyCounter]:
+        self.__validate()
+        return self.__counter
+    def __deepcopy__(self, memo: dict[int, Any]) -> "PropertyStorage":
+        new_storage = PropertyStorage()
+        memo[id(self)] = new_storage
+        new_storage.__dict = copy.deepcopy(self.__valid_dict, memo)
+        new_storage.__counter = {k: v.copy() for k, v in self.__counter.items()}
+        new_storage.generation = copy.deepcopy(self.generation, memo)
+        new_storage.stamp = self.stamp
+        return new_storage
     def __bool__(self) -> bool:
-        return len(self.__dict) != 0
+        return len(self.__valid_dict) != 0
     def get_info(self) -> str:
-        string = f"property storage {self.__dict}"
+        string = f"property storage {self.__valid_dict}"
         return "<" + string + ">"
+    def bind(self, generation: Optional[PropertyGeneration]) -> None:
+        if self.generation is generation:
+            return
+        self.__validate()
+        self.generation = generation
+        self.stamp = generation.value if generation is not None else 0
     @staticmethod
     def calc_count(info_list: list[PropertyInfo], negated: bool = False) -> int:
         if len(info_list) == 0:
@@ -60,44 +98,68 @@ class PropertyStorage(object):
             return int(info_list[0].negated == negated)
         return sum([1 for i in info_list if i.negated == negated])
     def update(self, prop: "Text", negated: bool = False) -> None:
-        self.__dict.setdefault(type(prop), [])
-        self.__dict[type(prop)].append(PropertyInfo(
+        self.__validate()
+        prop_type = type(prop)
+        info_list = self.__dict.get(prop_type)
+        if info_list is None:
+            info_list = self.__dict[prop_type] = []
+            self.__counter[prop_type] = [0, 0]
+        info_list.append(PropertyInfo(
             obj = prop,
             negated = negated,
             effected = False,
         ))
+        self.__counter[prop_type][negated] += 1
     def exist(self, prop: type["Text"]) -> bool:
-        return len(self.__dict.get(prop, [])) != 0
+        return prop in self.__valid_dict
     def count(self, prop: type["Text"], *, negated: bool = False) -> int:
-        if self.__dict.get(prop) is None:
+        counter = self.__valid_counter.get(prop)
+        if counter is None:
             return 0
-        return self.calc_count(self.__dict[prop], negated)
+        return counter[negated]
     def clear(self) -> None:
         self.__dict.clear()
+        self.__counter.clear()
+        if self.generation is not None:
+            self.stamp = self.generation.value
     def enabled(self, prop: type["Text"]) -> bool:
-        return self.count(prop, negated=False) > 0
+        counter = self.__valid_counter.get(prop)
+        return counter is not None and counter[0] != 0
     def disabled(self, prop: type["Text"]) -> bool:
-        return self.count(prop, negated=True) > 0
+        counter = self.__valid_counter.get(prop)
+        return counter is not None and counter[1] != 0
     def enabled_info[T: "Text"](self, prop: type[T]) -> list[PropertyInfo[T]]:
-        return [] if self.disabled(prop) else [i for i in self.__dict.get(prop, []) if not i.negated]
+        counter = self.__valid_counter.get(prop)
+        if counter is None or counter[1] != 0:
+            return []
+        return self.__dict[prop].copy()
     def disabled_info[T: "Text"](self, prop: type[T]) -> list[PropertyInfo[T]]:
-        return [i for i in self.__dict.get(prop, []) if i.negated]
+        counter = self.__valid_counter.get(prop)
+        if counter is None or counter[1] == 0:
+            return []
+        return [i for i in self.__dict[prop] if i.negated]
     def enabled_dict(self) -> dict[type["Text"], list[PropertyInfo["Text"]]]:
-        return {k: self.enabled_info(k) for k in self.__dict.keys()}
+        return {k: self.enabled_info(k) for k in self.__valid_dict.keys()}
     def disabled_dict(self) -> dict[type["Text"], list[PropertyInfo["Text"]]]:
-        return {k: self.disabled_info(k) for k in self.__dict.keys()}
+        return {k: self.disabled_info(k) for k in self.__valid_dict.keys()}
+    def enabled_list(self) -> list[type["Text"]]:
+        return [k for k, v in self.__valid_counter.items() if v[0] != 0]
     def enabled_count(self) -> dict[type["Text"], int]:
-        return {_k: _v for _k, _v in {k: self.calc_count(v, False) for k, v in self.__dict.items()}.items() if _v != 0}
+        return {k: v[0] for k, v in self.__valid_counter.items() if v[0] != 0}
     def disabled_count(self) -> dict[type["Text"], int]:
-        return {_k: _v for _k, _v in {k: self.calc_count(v, True) for k, v in self.__dict.items()}.items() if _v != 0}
+        return {k: v[1] for k, v in self.__valid_counter.items() if v[1] != 0}
     def copy(self) -> "PropertyStorage":
-        return PropertyStorage(self.__dict.copy())
+        new_storage = PropertyStorage()
+        new_storage.__dict = {k: v.copy() for k, v in self.__valid_dict.items()}
+        new_storage.__counter = {k: v.copy() for k, v in self.__counter.items()}
+        return new_storage
 
 class OldObjectState(object):
+    __slots__ = ("uid", "pos", "orient", "prop", "space", "level", "old_surface_pos", "old_surface_size", "new_surface_pos", "new_surface_size")
     def __init__(
         self,
         *,
-        uid: Optional[uuid.UUID] = None,
+        uid: Optional[int] = None,
         pos: Optional[bmp.loc.Coord[int]] = None,
         orient: Optional[bmp.loc.Orient] = None,
         prop: Optional[PropertyStorage] = None,
@@ -108,7 +170,7 @@ class OldObjectState(object):
         new_surface_pos: Optional[bmp.loc.Coord[float]] = None,
         new_surface_size: Optional[bmp.loc.Coord[float]] = None,
     ) -> None:
-        self.uid: Optional[uuid.UUID] = uid
+        self.uid: Optional[int] = uid
         self.pos: Optional[bmp.loc.Coord[int]] = pos
         self.orient: Optional[bmp.loc.Orient] = orient
         self.prop: Optional[PropertyStorage] = prop
@@ -118,6 +180,8 @@ class OldObjectState(object):
         self.old_surface_size: Optional[bmp.loc.Coord[float]] = old_surface_size
         self.new_surface_pos: Optional[bmp.loc.Coord[float]] = new_surface_pos
         self.new_surface_size: Optional[bmp.loc.Coord[float]] = new_surface_size
+    def copy(self) -> "OldObjectState":
+        return copy.copy(self)
 
 special_operators: tuple[type["Operator"], ...]
 
@@ -139,10 +203,15 @@ class ObjectJson41(TypedDict):
     level_id: NotRequired[bmp.ref.LevelIDJson]
     level_extra: NotRequired[LevelObjectExtra]
     path_extra: NotRequired[PathExtra]
+    id: NotRequired[int]
 
 type ObjectJson = ObjectJson41
 
+object_uid_counter: Iterator[int] = itertools.count()
+default_direct_mapping: dict[bmp.loc.Orient, bmp.loc.Orient] = {d: d for d in bmp.loc.Orient}
+
 class Object(object):
+    __slots__ = ("uid", "pos", "orient", "direct_mapping", "old_state", "space_id", "level_id", "properties", "operator_properties", "move_number", "sprite_state")
     ref_type: type["Object"]
     json_name: str
     sprite_name: str
@@ -172,10 +241,10 @@ class Object(object):
         space_id: Optional[bmp.ref.SpaceID] = None,
         level_id: Optional[bmp.ref.LevelID] = None
     ) -> None:
-        self.uid: uuid.UUID = uuid.uuid4()
+        self.uid: int = next(object_uid_counter)
         self.pos: bmp.loc.Coord[int] = pos
         self.orient: bmp.loc.Orient = direct
-        self.direct_mapping: dict[bmp.loc.Orient, bmp.loc.Orient] = {d: d for d in bmp.loc.Orient}
+        self.direct_mapping: dict[bmp.loc.Orient, bmp.loc.Orient] = default_direct_mapping
         self.old_state: OldObjectState = OldObjectState()
         self.space_id: Optional[bmp.ref.SpaceID] = space_id
         self.level_id: Optional[bmp.ref.LevelID] = level_id
@@ -183,10 +252,12 @@ class Object(object):
         self.operator_properties: dict[type["Operator"], PropertyStorage] = {o: PropertyStorage() for o in special_operators}
         self.move_number: int = 0
         self.sprite_state: int = 0
-    def __eq__(self, obj: "Object") -> bool:
+    def __eq__(self, obj: object) -> bool:
+        if not isinstance(obj, Object):
+            return NotImplemented
         return self.uid == obj.uid
     def __hash__(self) -> int:
-        return hash(self.uid)
+        return self.uid
     @classmethod
     def get_name(cls, *, language_name: str = bmp.lang.current_language_name) -> str:
         lang_key = f"object.name.{cls.json_name}"
@@ -214,8 +285,27 @@ class Object(object):
     @y.setter
     def y(self, value: int) -> None:
         self.pos = (self.pos[0], value)
-    def reset_uuid(self) -> None:
-        self.uid = uuid.uuid4()
+    def reset_uid(self) -> None:
+        self.uid = next(object_uid_counter)
+    def clone(self) -> Self:
+        new_obj = copy.copy(self)
+        if self.space_id is not None:
+            new_obj.space_id = bmp.ref.SpaceID(self.space_id.name, self.space_id.infinite_tier)
+        new_obj.properties = self.properties.copy()
+        new_obj.operator_properties = {o: p.copy() for o, p in self.operator_properties.items()}
+        new_obj.old_state = self.old_state.copy()
+        if self.old_state.prop is self.properties:
+            new_obj.old_state.prop = new_obj.properties
+        elif self.old_state.prop is not None:
+            new_obj.old_state.prop = self.old_state.prop.copy()
+        return new_obj
+    def bind_properties(self, generation: Optional[PropertyGeneration]) -> None:
+        self.properties.bind(generation)
+        for prop in self.operator_properties.values():
+            prop.bind(generation)
+    def unbind_properties(self, generation: PropertyGeneration) -> None:
+        if self.properties.generation is generation:
+            self.bind_properties(None)
     def set_direct_mapping(self, mapping: dict[bmp.loc.Orient, bmp.loc.Orient]) -> None:
         self.orient = mapping[self.direct_mapping[self.orient]]
         self.direct_mapping = mapping.copy()
@@ -253,28 +343,32 @@ class Object(object):
         return json_object
 
 class NotRealObject(Object):
-    pass
+    __slots__ = ()
 Object.ref_type = NotRealObject
 
 class Cursor(Object):
+    __slots__ = ()
     json_name = "cursor"
     sprite_name = "cursor"
     sprite_category = SpriteCategory.STATIC
     sprite_palette: bmp.color.PaletteIndex = (4, 2)
 
 class Spore(Object):
+    __slots__ = ()
     json_name = "spore"
     sprite_name = "spore"
     sprite_category = SpriteCategory.STATIC
     sprite_palette: bmp.color.PaletteIndex = (0, 3)
 
 class Blossom(Object):
+    __slots__ = ()
     json_name = "blossom"
     sprite_name = "blossom"
     sprite_category = SpriteCategory.STATIC
     sprite_palette: bmp.color.PaletteIndex = (0, 3)
 
 class SpaceObject(Object):
+    __slots__ = ("space_extra", )
     sprite_name = "space"
     sprite_category = SpriteCategory.STATIC
     light_overlay: bmp.color.ColorHex = 0x000000
@@ -290,16 +384,22 @@ class SpaceObject(Object):
     ) -> None:
         super().__init__(pos, direct, space_id=space_id, level_id=level_id)
         self.space_extra: SpaceObjectExtra = space_extra.copy()
+    def clone(self) -> Self:
+        new_obj = super().clone()
+        new_obj.space_extra = self.space_extra.copy()
+        return new_obj
     def transform(self: "SpaceObject", /, _type: type["Object"]) -> "Object": ...
     def to_json(self) -> ObjectJson:
         return {**super().to_json(), "space_extra": self.space_extra}
 
 class Space(SpaceObject):
+    __slots__ = ()
     dark_overlay: bmp.color.ColorHex = 0xC0C0C0
     json_name = "space"
     sprite_palette: bmp.color.PaletteIndex = (1, 3)
         
 class Clone(SpaceObject):
+    __slots__ = ()
     light_overlay: bmp.color.ColorHex = 0x404040
     json_name = "clone"
     sprite_palette: bmp.color.PaletteIndex = (1, 4)
@@ -308,6 +408,7 @@ space_object_types: list[type[SpaceObject]] = [Space, Clone]
 default_space_object_type: type[SpaceObject] = Space
 
 class LevelObject(Object):
+    __slots__ = ("level_extra", )
     sprite_category: SpriteCategory = SpriteCategory.STATIC
     def __init__(
         self,
@@ -325,6 +426,7 @@ class LevelObject(Object):
         return {**super().to_json(), "level_extra": self.level_extra}
 
 class Level(LevelObject):
+    __slots__ = ()
     json_name = "level"
     sprite_name = "level"
     sprite_palette: bmp.color.PaletteIndex = (4, 1)
@@ -348,6 +450,7 @@ class Collectible(object):
         return {"type": self.object_type.json_name, "source": self.source.to_json()}
 
 class Path(Object):
+    __slots__ = ("unlocked", "conditions")
     json_name = "path"
     sprite_name = "line"
     sprite_category: SpriteCategory = SpriteCategory.TILED
@@ -369,6 +472,7 @@ class Path(Object):
         return {**super().to_json(), "path_extra": {"unlocked": self.unlocked, "conditions": {k.json_name: v for k, v in self.conditions.items()}}}
 
 class Game(Object):
+    __slots__ = ("ref_type", )
     def __init__(
         self,
         pos: bmp.loc.Coord[int],
@@ -388,6 +492,7 @@ class TextRenderState(StrEnum):
     # CROSSED = "crossed"
 
 class Text(Object):
+    __slots__ = ("render_state", )
     json_name = "text"
     sprite_category = SpriteCategory.STATIC
     sprite_palette: bmp.color.PaletteIndex = (0, 3)
@@ -411,119 +516,140 @@ class Text(Object):
         return bmp.lang.fformat(lang_key, language_name=language_name)
 
 class Noun(Text):
+    __slots__ = ()
     ref_type: type["Object"]
     def isreferenceof(self, other: Object, **kwds) -> bool: ...
 
 class Prefix(Text):
-    pass
+    __slots__ = ()
 
 class Infix(Text):
-    pass
+    __slots__ = ()
 
 class Operator(Text):
-    pass
+    __slots__ = ()
 
 class Property(Text):
-    pass
+    __slots__ = ()
 
 class GeneralNoun(Noun):
+    __slots__ = ()
     def isreferenceof(self, other: Object, **kwds) -> bool:
         return isinstance(other, self.ref_type)
 
 class TextCursor(GeneralNoun):
+    __slots__ = ()
     ref_type = Cursor
     json_name = "text_cursor"
     sprite_name = "text_cursor"
     sprite_palette: bmp.color.PaletteIndex = (2, 4)
 
 class TextSpore(GeneralNoun):
+    __slots__ = ()
     ref_type = Spore
     json_name = "text_spore"
     sprite_name = "text_spore"
     sprite_palette: bmp.color.PaletteIndex = (0, 3)
 
 class TextBlossom(GeneralNoun):
+    __slots__ = ()
     ref_type = Blossom
     json_name = "text_blossom"
     sprite_name = "text_blossom"
     sprite_palette: bmp.color.PaletteIndex = (0, 3)
 
 class TextText(GeneralNoun):
+    __slots__ = ()
     ref_type = Text
     json_name = "text_text"
     sprite_name = "text_text"
     sprite_palette: bmp.color.PaletteIndex = (4, 1)
 
 class TextLevelObject(GeneralNoun):
+    __slots__ = ()
     ref_type = LevelObject
 
 class TextLevel(GeneralNoun):
+    __slots__ = ()
     ref_type = Level
     json_name = "text_level"
     sprite_name = "text_level"
     sprite_palette = ref_type.sprite_palette
 
 class TextSpaceObject(GeneralNoun):
+    __slots__ = ()
     ref_type = SpaceObject
 
 class TextSpace(GeneralNoun):
+    __slots__ = ()
     ref_type = Space
     json_name = "text_space"
     sprite_name = "text_space"
     sprite_palette = ref_type.sprite_palette
 
 class TextClone(GeneralNoun):
+    __slots__ = ()
     ref_type = Clone
     json_name = "text_clone"
     sprite_name = "text_clone"
     sprite_palette = ref_type.sprite_palette
 
 class TextPath(GeneralNoun):
+    __slots__ = ()
     ref_type = Path
     json_name = "text_path"
     sprite_name = "text_path"
     sprite_palette = ref_type.sprite_palette
 
 class TextGame(GeneralNoun):
+    __slots__ = ()
     ref_type = Game
     json_name = "text_game"
     sprite_name = "text_game"
     sprite_palette: bmp.color.PaletteIndex = (4, 2)
 
 class TextOften(Prefix):
+    __slots__ = ()
     json_name = "text_often"
     sprite_name = "text_often"
     sprite_palette: bmp.color.PaletteIndex = (5, 4)
 
 class TextSeldom(Prefix):
+    __slots__ = ()
     json_name = "text_seldom"
     sprite_name = "text_seldom"
     sprite_palette: bmp.color.PaletteIndex = (3, 2)
 
 class TextMeta(Prefix):
+    __slots__ = ()
     json_name = "text_meta"
     sprite_name = "text_meta"
     sprite_palette: bmp.color.PaletteIndex = (4, 1)
 
 class TextText_(Text):
+    __slots__ = ()
     json_name = "text_text_"
     sprite_name = "text_text_underline"
     sprite_palette: bmp.color.PaletteIndex = (4, 0)
 
 class RangeInfix(Infix):
+    __slots__ = ()
     find_range: list[bmp.loc.Coord[int]]
 
 class TextOn(RangeInfix):
+    __slots__ = ()
     json_name = "text_on"
     sprite_name = "text_on"
     find_range = [(0, 0)]
 
 class TextNear(RangeInfix):
+    __slots__ = ()
     json_name = "text_near"
     sprite_name = "text_near"
     find_range = [(x, y) for x in range(-1, 2) for y in range(-1, 2)]
 
 class TextNextto(RangeInfix):
+    __slots__ = ()
     json_name = "text_nextto"
     sprite_name = "text_nextto"
     find_range = [
@@ -532,144 +658,173 @@ class TextNextto(RangeInfix):
     ]
 
 class TextFacing(Infix):
+    __slots__ = ()
     json_name = "text_facing"
     sprite_name = "text_facing"
 
 class TextWithout(Infix):
+    __slots__ = ()
     json_name = "text_without"
     sprite_name = "text_without"
 
 class TextFeeling(Infix):
+    __slots__ = ()
     json_name = "text_feeling"
     sprite_name = "text_feeling"
 
 class TextIs(Operator):
+    __slots__ = ()
     json_name = "text_is"
     sprite_name = "text_is"
 
 class TextHas(Operator):
+    __slots__ = ()
     json_name = "text_has"
     sprite_name = "text_has"
 
 class TextMake(Operator):
+    __slots__ = ()
     json_name = "text_make"
     sprite_name = "text_make"
 
 class TextWrite(Operator):
+    __slots__ = ()
     json_name = "text_write"
     sprite_name = "text_write"
 
 special_operators: tuple[type[Operator], ...] = (TextHas, TextMake, TextWrite)
 
 class TextNot(Text):
+    __slots__ = ()
     json_name = "text_not"
     sprite_name = "text_not"
     sprite_palette: bmp.color.PaletteIndex = (2, 2)
 
 class TextAnd(Text):
+    __slots__ = ()
     json_name = "text_and"
     sprite_name = "text_and"
     sprite_palette: bmp.color.PaletteIndex = (0, 3)
 
 class TextYou(Property):
+    __slots__ = ()
     json_name = "text_you"
     sprite_name = "text_you"
     sprite_palette: bmp.color.PaletteIndex = (4, 1)
 
 class TextMove(Property):
+    __slots__ = ()
     json_name = "text_move"
     sprite_name = "text_move"
     sprite_palette: bmp.color.PaletteIndex = (5, 4)
 
 class TextStop(Property):
+    __slots__ = ()
     json_name = "text_stop"
     sprite_name = "text_stop"
     sprite_palette: bmp.color.PaletteIndex = (5, 1)
 
 class TextPush(Property):
+    __slots__ = ()
     json_name = "text_push"
     sprite_name = "text_push"
     sprite_palette: bmp.color.PaletteIndex = (6, 1)
 
 class TextSink(Property):
+    __slots__ = ()
     json_name = "text_sink"
     sprite_name = "text_sink"
     sprite_palette: bmp.color.PaletteIndex = (1, 3)
 
 class TextFloat(Property):
+    __slots__ = ()
     json_name = "text_float"
     sprite_name = "text_float"
     sprite_palette: bmp.color.PaletteIndex = (1, 4)
 
 class TextOpen(Property):
+    __slots__ = ()
     json_name = "text_open"
     sprite_name = "text_open"
     sprite_palette: bmp.color.PaletteIndex = (2, 4)
 
 class TextShut(Property):
+    __slots__ = ()
     json_name = "text_shut"
     sprite_name = "text_shut"
     sprite_palette: bmp.color.PaletteIndex = (2, 2)
 
 class TextHot(Property):
+    __slots__ = ()
     json_name = "text_hot"
     sprite_name = "text_hot"
     sprite_palette: bmp.color.PaletteIndex = (2, 3)
 
 class TextMelt(Property):
+    __slots__ = ()
     json_name = "text_melt"
     sprite_name = "text_melt"
     sprite_palette: bmp.color.PaletteIndex = (1, 3)
 
 class TextWin(Property):
+    __slots__ = ()
     json_name = "text_win"
     sprite_name = "text_win"
     sprite_palette: bmp.color.PaletteIndex = (2, 4)
 
 class TextDefeat(Property):
+    __slots__ = ()
     json_name = "text_defeat"
     sprite_name = "text_defeat"
     sprite_palette: bmp.color.PaletteIndex = (2, 1)
 
 class TextShift(Property):
+    __slots__ = ()
     json_name = "text_shift"
     sprite_name = "text_shift"
     sprite_palette: bmp.color.PaletteIndex = (1, 3)
 
 class TextTele(Property):
+    __slots__ = ()
     json_name = "text_tele"
     sprite_name = "text_tele"
     sprite_palette: bmp.color.PaletteIndex = (1, 4)
 
 class TransformProperty(Property):
+    __slots__ = ()
     sprite_palette: bmp.color.PaletteIndex = (1, 4)
 
 class DirectionalProperty(TransformProperty):
+    __slots__ = ()
     ref_direct: bmp.loc.Orient
     ref_transform: bmp.loc.SpaceTransform
 
 class DirectFixProperty(DirectionalProperty):
-    pass
+    __slots__ = ()
 
 class TextUp(DirectFixProperty):
+    __slots__ = ()
     json_name = "text_up"
     sprite_name = "text_up"
     ref_direct = bmp.loc.Orient.W
     ref_transform = {"direct": ref_direct.name, "flip": False}
 
 class TextDown(DirectFixProperty):
+    __slots__ = ()
     json_name = "text_down"
     sprite_name = "text_down"
     ref_direct = bmp.loc.Orient.S
     ref_transform = {"direct": ref_direct.name, "flip": False}
 
 class TextLeft(DirectFixProperty):
+    __slots__ = ()
     json_name = "text_left"
     sprite_name = "text_left"
     ref_direct = bmp.loc.Orient.A
     ref_transform = {"direct": ref_direct.name, "flip": False}
 
 class TextRight(DirectFixProperty):
+    __slots__ = ()
     json_name = "text_right"
     sprite_name = "text_right"
     ref_direct = bmp.loc.Orient.D
@@ -678,15 +833,17 @@ class TextRight(DirectFixProperty):
 direct_fix_properties: list[type[DirectFixProperty]] = [TextLeft, TextUp, TextRight, TextDown]
 
 class DirectRotateProperty(DirectionalProperty):
-    pass
+    __slots__ = ()
 
 class TextTurn(DirectRotateProperty):
+    __slots__ = ()
     json_name = "text_turn"
     sprite_name = "text_turn"
     ref_direct = bmp.loc.Orient.A
     ref_transform = {"direct": ref_direct.name, "flip": False}
 
 class TextDeturn(DirectRotateProperty):
+    __slots__ = ()
     json_name = "text_deturn"
     sprite_name = "text_deturn"
     ref_direct = bmp.loc.Orient.D
@@ -695,10 +852,12 @@ class TextDeturn(DirectRotateProperty):
 direct_rotate_properties: list[type[DirectRotateProperty]] = [TextTurn, TextDeturn]
 
 class DirectMappingProperty(TransformProperty):
+    __slots__ = ()
     ref_mapping: dict[bmp.loc.Orient, bmp.loc.Orient]
     ref_transform: bmp.loc.SpaceTransform
 
 class TextFlip(DirectMappingProperty):
+    __slots__ = ()
     json_name = "text_flip"
     sprite_name = "text_flip"
     ref_mapping = {
@@ -712,90 +871,108 @@ class TextFlip(DirectMappingProperty):
 direct_mapping_properties: list[type[DirectMappingProperty]] = [TextFlip]
 
 class TextEnter(Property):
+    __slots__ = ()
     json_name = "text_enter"
     sprite_name = "text_enter"
     sprite_palette: bmp.color.PaletteIndex = (5, 4)
     
 class TextLeave(Property):
+    __slots__ = ()
     json_name = "text_leave"
     sprite_name = "text_leave"
     sprite_palette: bmp.color.PaletteIndex = (2, 2)
 
 class TextBonus(Property):
+    __slots__ = ()
     json_name = "text_bonus"
     sprite_name = "text_bonus"
     sprite_palette: bmp.color.PaletteIndex = (4, 1)
 
 class TextHide(Property):
+    __slots__ = ()
     json_name = "text_hide"
     sprite_name = "text_hide"
     sprite_palette: bmp.color.PaletteIndex = (3, 2)
 
 class TextWord(Property):
+    __slots__ = ()
     json_name = "text_word"
     sprite_name = "text_word"
     sprite_palette: bmp.color.PaletteIndex = (0, 3)
 
 class TextSelect(Property):
+    __slots__ = ()
     json_name = "text_select"
     sprite_name = "text_select"
     sprite_palette: bmp.color.PaletteIndex = (2, 4)
 
 class TextTextPlus(Property):
+    __slots__ = ()
     json_name = "text_text+"
     sprite_name = "text_text_plus"
     sprite_palette: bmp.color.PaletteIndex = (4, 1)
 
 class TextTextMinus(Property):
+    __slots__ = ()
     json_name = "text_text-"
     sprite_name = "text_text_minus"
     sprite_palette: bmp.color.PaletteIndex = (4, 2)
 
 class TextEnd(Property):
+    __slots__ = ()
     json_name = "text_end"
     sprite_name = "text_end"
     sprite_palette: bmp.color.PaletteIndex = (0, 3)
 
 class TextDone(Property):
+    __slots__ = ()
     json_name = "text_done"
     sprite_name = "text_done"
     sprite_palette: bmp.color.PaletteIndex = (0, 3)
 
 class Metatext(GeneralNoun):
+    __slots__ = ()
     ref_type: type[Text]
     basic_ref_type: type[Text]
     meta_tier: int
 
 class SpecialNoun(Noun):
+    __slots__ = ()
     ref_type: type[NotRealObject] = NotRealObject
     sprite_palette = (0, 3)
     def isreferenceof(self, other: Object, **kwds) -> bool:
         raise NotImplementedError()
 
 class FixedNoun(SpecialNoun):
+    __slots__ = ()
     def isreferenceof(self, other: Object, **kwds) -> bool:
         return False
 
 class RangedNoun(SpecialNoun):
+    __slots__ = ()
     ref_type: tuple[type[Noun], ...]
     def isreferenceof(self, other: Object, **kwds) -> bool:
         return any(map(lambda n: n().isreferenceof(other), self.ref_type))
 
 class TextEmpty(SpecialNoun):
+    __slots__ = ()
     json_name = "text_empty"
     sprite_name = "text_empty"
 
 class TextAll(RangedNoun):
+    __slots__ = ()
     json_name = "text_all"
     sprite_name = "text_all"
     def isreferenceof(self, other: Object, all_list: list[type[Object]], **kwds) -> bool:
         return any(map(lambda n: get_noun_from_type(n)().isreferenceof(other), all_list))
 
 class GroupNoun(RangedNoun):
+    __slots__ = ()
     def isreferenceof(self, other: Object, **kwds) -> bool:
         return other.properties.enabled(type(self))
 
 class TextGroup(GroupNoun):
+    __slots__ = ()
     json_name = "text_group"
     sprite_name = "text_group"
     sprite_palette = (3, 2)
@@ -803,11 +980,13 @@ class TextGroup(GroupNoun):
 group_noun_types: tuple[type[GroupNoun], ...] = (TextGroup, )
 
 class SpecificSpaceNoun(FixedNoun):
+    __slots__ = ()
     delta_infinite_tier: int
     def isreferenceof(self, other: Object, **kwds) -> TypeGuard[SpaceObject]:
         return isinstance(other, SpaceObject)
 
 class TextInfinity(SpecificSpaceNoun):
+    __slots__ = ()
     json_name = "text_infinity"
     sprite_name = "text_infinity"
     delta_infinite_tier = 1
@@ -818,6 +997,7 @@ class TextInfinity(SpecificSpaceNoun):
         return False
 
 class TextEpsilon(SpecificSpaceNoun):
+    __slots__ = ()
     json_name = "text_epsilon"
     sprite_name = "text_epsilon"
     delta_infinite_tier = -1
@@ -828,6 +1008,7 @@ class TextEpsilon(SpecificSpaceNoun):
         return False
 
 class TextParabox(RangedNoun):
+    __slots__ = ()
     ref_type = (TextInfinity, TextEpsilon)
     json_name = "text_parabox"
     sprite_name = "text_parabox"
@@ -1036,6 +1217,7 @@ class ObjectDefinition(TypedDict):
 def generate_metatext(T: type[Text]) -> type[Metatext]:
     new_type_name = bmp.base.snake_to_camel("text_" + T.json_name, is_big=True)
     new_type_vars: dict[str, Any] = {
+        "__slots__": (),
         "json_name": "text_" + T.json_name,
         "sprite_name": "text_" + T.sprite_name,
         "ref_type": T,
@@ -1049,6 +1231,7 @@ def generate_metatext(T: type[Text]) -> type[Metatext]:
 def create_object_class(obj_name: str, obj_def: ObjectDefinition) -> tuple[type[Object], type[GeneralNoun]]:
     noun_def = obj_def.get("noun", {})
     obj_cls_var: dict[str, Any] = {
+        "__slots__": (),
         "json_name": obj_name,
         "ref_type": NotRealObject,
         "sprite_name": obj_def.get("sprite", default_sprite_definition).get("name", obj_name),
@@ -1057,6 +1240,7 @@ def create_object_class(obj_name: str, obj_def: ObjectDefinition) -> tuple[type[
     }
     obj_cls: type[Object] = type(bmp.base.snake_to_camel(obj_name, is_big=True), (Object, ), obj_cls_var)
     noun_cls_var: dict[str, Any] = {
+        "__slots__": (),
         "json_name": "text_" + obj_name,
         "ref_type": obj_cls,
         "sprite_name": "text_" + obj_cls_var["sprite_name"],
@@ -7,7 +7,8 @@ import bmp.base
 import bmp.color
 
 import pygame
-pygame.init()
+if not bmp.base.headless:
+    pygame.init()
 
 pyinst_env = "PYINST"
 
@@ -34,10 +35,16 @@ class RepeatOptions(TypedDict):
     delay: int
     interval: int
 
+class HistoryOptions(TypedDict):
+    limit: int
+    checkpoint: int
+
 class GameplayOptions(TypedDict):
     repeat: RepeatOptions
     metatext: MetatextOptions
     bgm: BgmOptions
+    history: NotRequired[HistoryOptions]
+    speculative: NotRequired[bool]
     game_is_end: NotRequired[bool]
     game_is_done: NotRequired[bool]
 
@@ -51,6 +58,7 @@ class EditorOptions(TypedDict):
     shortcuts: list[str]
     default_space: DefaultSpaceOptions
     minimal_json: bool
+    history_limit: NotRequired[int]
 
 class Options41(TypedDict):
     ver: str
@@ -79,6 +87,12 @@ class Options4101(TypedDict):
 
 type Options = Options4101
 
+default_history_options: HistoryOptions = {
+    "limit": 4096,
+    "checkpoint": 64,
+}
+default_editor_history_limit: int = 1024
+
 default_options: Options = {
     "ver": bmp.base.version,
     "debug": False,
@@ -96,6 +110,8 @@ default_options: Options = {
             "enabled": True,
             "tier": 5,
         },
+        "history": default_history_options.copy(),
+        "speculative": False,
     },
     "render": {
         "fps": 30,
@@ -123,6 +139,7 @@ default_options: Options = {
             "color": 0x000000,
         },
         "minimal_json": True,
+        "history_limit": default_editor_history_limit,
     },
 }
 options_filename: str = "options.json"
@@ -0,0 +1,94 @@
+from typing import NotRequired, Optional, TypedDict
+import hashlib
+import json
+import random
+
+import bmp.base
+import bmp.levelpack
+import bmp.loc
+import bmp.ref
+
+class ReplayMismatchError(Exception):
+    pass
+
+class ReplayJson(TypedDict):
+    ver: str
+    levelpack: str
+    seed: int
+    random_state: NotRequired[bmp.levelpack.RandomStateJson]
+    inputs: str
+    spaces: NotRequired[list[bmp.ref.SpaceIDJson]]
+
+move_inputs: dict[str, Optional[bmp.loc.Orient]] = {
+    "W": bmp.loc.Orient.W,
+    "A": bmp.loc.Orient.A,
+    "S": bmp.loc.Orient.S,
+    "D": bmp.loc.Orient.D,
+    ".": None,
+}
+undo_input = "Z"
+restart_input = "R"
+reset_input = "X"
+escape_input = "E"
+continue_input = "+"
+space_input = "@"
+
+def levelpack_hash(levelpack: bmp.levelpack.Levelpack) -> str:
+    json_object = dict(levelpack.to_json())
+    for key in ("ver", "seed", "random_state"):
+        json_object.pop(key, None)
+    return hashlib.sha256(json.dumps(json_object, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+class Replay(object):
+    def __init__(self, levelpack_hash: str, seed: int, random_state: Optional[bmp.levelpack.RandomState] = None, inputs: str = "", space_list: Optional[list[bmp.ref.SpaceID]] = None) -> None:
+        self.levelpack_hash: str = levelpack_hash
+        self.seed: int = seed
+        self.random_state: Optional[bmp.levelpack.RandomState] = random_state
+        self.input_list: list[str] = list(inputs)
+        self.space_list: list[bmp.ref.SpaceID] = space_list if space_list is not None else []
+    @property
+    def inputs(self) -> str:
+        return "".join(self.input_list)
+    def record(self, replay_input: str) -> None:
+        self.input_list.append(replay_input)
+    def record_move(self, op: Optional[bmp.loc.Orient]) -> None:
+        self.input_list.append(op.name if op is not None else ".")
+    def record_space(self, space_id: bmp.ref.SpaceID) -> None:
+        self.input_list.append(space_input)
+        self.space_list.append(space_id)
+    def set_random(self, levelpack: bmp.levelpack.Levelpack) -> None:
+        levelpack.set_seed(self.seed)
+        if self.random_state is not None:
+            levelpack.rng.setstate(self.random_state)
+    def to_json(self) -> ReplayJson:
+        json_object: ReplayJson = {
+            "ver": bmp.base.version,
+            "levelpack": self.levelpack_hash,
+            "seed": self.seed,
+            "inputs": self.inputs,
+        }
+        if self.random_state is not None:
+            json_object["random_state"] = bmp.levelpack.random_state_to_json(self.random_state)
+        if len(self.space_list) != 0:
+            json_object["spaces"] = [s.to_json() for s in self.space_list]
+        return json_object
+
+def start(levelpack: bmp.levelpack.Levelpack) -> Replay:
+    random_state = levelpack.rng.getstate()
+    if random_state == random.Random(levelpack.get_seed()).getstate():
+        return Replay(levelpack_hash(levelpack), levelpack.get_seed())
+    return Replay(levelpack_hash(levelpack), levelpack.get_seed(), random_state)
+
+def json_to_replay(json_object: ReplayJson) -> Replay:
+    random_state_json = json_object.get("random_state")
+    return Replay(
+        levelpack_hash = json_object["levelpack"],
+        seed = json_object["seed"],
+        random_state = bmp.levelpack.json_to_random_state(random_state_json) if random_state_json is not None else None,
+        inputs = json_object["inputs"],
+        space_list = [bmp.ref.SpaceID(**s) for s in json_object.get("spaces", [])],
+    )
+
+def load(filename: str) -> Replay:
+    with open(filename, "r", encoding="utf-8") as file:
+        return json_to_replay(json.load(file))
@@ -172,16 +172,91 @@ how_to_match_rule: dict[str, list[tuple[
     ]
 }
 
+type RuleTransition = tuple[int, str, Callable[[RuleInfo, Any], RuleInfo]]
+
+def compile_rule_transition(stage: str, text_type: type[bmp.obj.Text]) -> Optional[RuleTransition]:
+    for index, (match_type, unmatch_type, next_stage, func) in enumerate(how_to_match_rule[stage]):
+        if issubclass(text_type, tuple(match_type)) and not issubclass(text_type, tuple(unmatch_type)):
+            return index, next_stage, func
+    return None
+
+rule_transition_table: dict[str, dict[type[bmp.obj.Text], Optional[RuleTransition]]] = {
+    stage: {t: compile_rule_transition(stage, t) for t in bmp.obj.text_class_list}
+    for stage in how_to_match_rule.keys()
+}
+
+rule_end_stages: frozenset[str] = frozenset(
+    stage for stage, match_list in how_to_match_rule.items()
+    if len(match_list) != 0 and match_list[0][2] == "new property"
+)
+
+def get_rule_transition(stage: str, text_type: type[bmp.obj.Text]) -> Optional[RuleTransition]:
+    stage_table = rule_transition_table[stage]
+    if text_type not in stage_table:
+        stage_table[text_type] = compile_rule_transition(stage, text_type)
+    return stage_table[text_type]
+
+def build_rule_info(rule: Rule, func_list: list[Callable[[RuleInfo, Any], RuleInfo]]) -> RuleInfo:
+    info = RuleInfo([], False, bmp.obj.Noun(), [], [OperInfo(bmp.obj.Operator(), [])])
+    for text_obj, func in zip(reversed(rule), reversed(func_list)):
+        info = func(info, text_obj)
+    return info
+
 def get_info_from_rule(rule: Rule, stage: str = "before prefix") -> RuleInfo:
-    for match_obj, unmatch_obj, next_stage, func in how_to_match_rule[stage]:
-        if len(rule) == 0 and next_stage == "new property":
-            return RuleInfo([], False, bmp.obj.Noun(), [], [OperInfo(bmp.obj.Operator(), [])])
-        if isinstance(rule[0], tuple(match_obj)) and not isinstance(rule[0], tuple(unmatch_obj)):
-            new_info = get_info_from_rule(rule[1:], next_stage)
-            if new_info is not None:
-                info_list = func(new_info, rule[0])
-                return info_list
-    raise ValueError(rule[0])
+    func_list: list[Callable[[RuleInfo, Any], RuleInfo]] = []
+    for text_obj in rule:
+        transition = get_rule_transition(stage, type(text_obj))
+        if transition is None:
+            raise ValueError(text_obj)
+        _, stage, func = transition
+        func_list.append(func)
+    if stage not in rule_end_stages:
+        raise ValueError(stage)
+    return build_rule_info(rule, func_list)
+
+type RuleTail = Optional[tuple[bmp.obj.Text, Callable[[RuleInfo, Any], RuleInfo], RuleTail]]
+
+def get_rule_from_text_run(text_run: list[list[bmp.obj.Text]]) -> list[tuple[int, Rule, RuleInfo]]:
+    tail_dict: dict[tuple[int, str], list[RuleTail]] = {}
+    def get_tails(index: int, stage: str) -> list[RuleTail]:
+        tail_list = tail_dict.get((index, stage))
+        if tail_list is not None:
+            return tail_list
+        tail_list = []
+        if index < len(text_run):
+            matched_list: list[tuple[RuleTransition, bmp.obj.Text]] = []
+            for text_obj in text_run[index]:
+                transition = get_rule_transition(stage, type(text_obj))
+                if transition is not None:
+                    matched_list.append((transition, text_obj))
+            if len(matched_list) > 1:
+                matched_list.sort(key=lambda m: m[0][0])
+            for (_, next_stage, func), matched_text in matched_list:
+                tail_list.extend((matched_text, func, t) for t in get_tails(index + 1, next_stage))
+        if stage == "after property":
+            tail_list.append(None)
+        tail_dict[(index, stage)] = tail_list
+        return tail_list
+    run_rule_list: list[tuple[int, Rule, RuleInfo]] = []
+    suffix_trie: dict[int, dict] = {}
+    for index in range(len(text_run)):
+        for tail in get_tails(index, "before prefix"):
+            rule: Rule = []
+            func_list: list[Callable[[RuleInfo, Any], RuleInfo]] = []
+            while tail is not None:
+                rule.append(tail[0])
+                func_list.append(tail[1])
+                tail = tail[2]
+            node = suffix_trie.setdefault(index + len(rule), {})
+            part_of_old_rule = True
+            for text_obj in reversed(rule):
+                if text_obj not in node:
+                    part_of_old_rule = False
+                node = node.setdefault(text_obj, {})
+            if part_of_old_rule:
+                continue
+            run_rule_list.append((index, rule, build_rule_info(rule, func_list)))
+    return run_rule_list
 
 def handle_text_text_(rule: Rule) -> Rule:
     metanumber = 0
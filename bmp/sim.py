@@ -0,0 +1,162 @@
+from typing import Iterable, NotRequired, Optional, TypedDict
+import copy
+import json
+import os
+import sys
+
+import bmp.color
+import bmp.history
+import bmp.levelpack
+import bmp.loc
+import bmp.opt
+import bmp.ref
+import bmp.replay
+
+class TickRecord(TypedDict):
+    op: Optional[bmp.loc.Orient]
+    info: bmp.levelpack.ReturnInfo
+    level: bmp.ref.LevelID
+    state: NotRequired[bmp.levelpack.LevelpackJson]
+    phases: NotRequired[bmp.levelpack.TickReport]
+
+class TickRecordJson(TypedDict):
+    op: Optional[bmp.loc.OrientStr]
+    info: dict
+    level: bmp.ref.LevelIDJson
+    state: NotRequired[bmp.levelpack.LevelpackJson]
+    phases: NotRequired[bmp.levelpack.TickReport]
+
+ops: dict[str, Optional[bmp.loc.Orient]] = {
+    "W": bmp.loc.Orient.W,
+    "A": bmp.loc.Orient.A,
+    "S": bmp.loc.Orient.S,
+    "D": bmp.loc.Orient.D,
+    " ": None,
+    ".": None,
+}
+
+def str_to_ops(op_str: str) -> list[Optional[bmp.loc.Orient]]:
+    return [ops[c] for c in op_str.upper() if c in ops]
+
+def load(filename: str) -> bmp.levelpack.Levelpack:
+    with open(filename, "r", encoding="utf-8") as file:
+        levelpack_json = json.load(file)
+    return bmp.levelpack.json_to_levelpack(levelpack_json)
+
+def start(levelpack: bmp.levelpack.Levelpack, seed: Optional[int] = None) -> None:
+    if seed is not None:
+        levelpack.set_seed(seed)
+    if len(bmp.color.current_palette) == 0:
+        bmp.color.set_palette(os.path.join(".", "palettes", bmp.opt.options["render"]["palette"]))
+    levelpack.prepare()
+    for level in levelpack.level_list:
+        levelpack.set_level_init_state(level.level_id, copy.deepcopy(level))
+
+def simulate(levelpack: bmp.levelpack.Levelpack, op_list: Iterable[Optional[bmp.loc.Orient]], *, with_state: bool = True, with_phases: bool = False) -> list[TickRecord]:
+    record_list: list[TickRecord] = []
+    for op in op_list:
+        info = levelpack.tick(op)
+        record: TickRecord = {"op": op, "info": info, "level": levelpack.current_level_id}
+        if with_state:
+            record["state"] = levelpack.to_json()
+        if with_phases:
+            record["phases"] = levelpack.tick_report
+        record_list.append(record)
+        if info["end"] or info["done"]:
+            break
+        if info["win"] or info["transform"] or info["select"] is not None:
+            levelpack.change_level(info)
+    return record_list
+
+def playback(levelpack: bmp.levelpack.Levelpack, replay: bmp.replay.Replay, *, checkpoint_interval: int = 0) -> tuple[bmp.levelpack.ReturnInfo, list[tuple[int, bmp.levelpack.Levelpack]]]:
+    if bmp.replay.levelpack_hash(levelpack) != replay.levelpack_hash:
+        raise bmp.replay.ReplayMismatchError(replay.levelpack_hash)
+    replay.set_random(levelpack)
+    start(levelpack)
+    inputs = replay.inputs
+    info: bmp.levelpack.ReturnInfo = bmp.levelpack.default_levelpack_info.copy()
+    levelpack_unchanged: Optional[bmp.levelpack.Levelpack] = copy.deepcopy(levelpack) if bmp.replay.reset_input in inputs else None
+    history: Optional[bmp.history.History] = None
+    if bmp.replay.undo_input in inputs or bmp.replay.restart_input in inputs:
+        history = bmp.history.History(levelpack, info)
+    space_iter = iter(replay.space_list)
+    checkpoint_list: list[tuple[int, bmp.levelpack.Levelpack]] = []
+    for index, replay_input in enumerate(inputs):
+        if replay_input in bmp.replay.move_inputs:
+            if history is not None:
+                history.push(levelpack)
+            info = levelpack.tick(bmp.replay.move_inputs[replay_input])
+            if history is not None:
+                history.info = info
+        elif replay_input == bmp.replay.continue_input:
+            if info["end"] or info["done"]:
+                break
+            levelpack.change_level(info)
+            info = bmp.levelpack.default_levelpack_info.copy()
+        elif replay_input == bmp.replay.undo_input and history is not None:
+            levelpack, info = history.undo()
+        elif replay_input == bmp.replay.restart_input and history is not None:
+            levelpack, info = history.restart()
+        elif replay_input == bmp.replay.reset_input and levelpack_unchanged is not None:
+            levelpack = copy.deepcopy(levelpack_unchanged)
+            info = bmp.levelpack.default_levelpack_info.copy()
+            if history is not None:
+                history = bmp.history.History(levelpack, info)
+        elif replay_input == bmp.replay.escape_input:
+            super_level_id = levelpack.current_level.super_level_id
+            if super_level_id is not None and super_level_id in levelpack.level_dict.keys():
+                levelpack.current_level_id = super_level_id
+                if history is not None:
+                    history.push(levelpack)
+        elif replay_input == bmp.replay.space_input:
+            levelpack.current_level.current_space_id = next(space_iter)
+        if checkpoint_interval > 0 and (index + 1) % checkpoint_interval == 0 and index + 1 != len(inputs):
+            checkpoint_list.append((index + 1, copy.deepcopy(levelpack)))
+    checkpoint_list.append((len(inputs), levelpack))
+    return info, checkpoint_list
+
+def record_to_json(record: TickRecord) -> TickRecordJson:
+    info = dict(record["info"])
+    if record["info"]["select"] is not None:
+        info["select"] = [l.to_json() for l in record["info"]["select"]]
+    json_object: TickRecordJson = {
+        "op": record["op"].name if record["op"] is not None else None,
+        "info": info,
+        "level": record["level"].to_json(),
+    }
+    if "state" in record:
+        json_object["state"] = record["state"]
+    if "phases" in record:
+        json_object["phases"] = record["phases"]
+    return json_object
+
+def main(argv: list[str]) -> int:
+    if len(argv) < 2:
+        print("usage: simbmp.py <levelpack.json> <ops> [--no-state] [--phases] [--seed=<seed>]", file=sys.stderr)
+        print("       simbmp.py <levelpack.json> --replay=<replay.json> [--checkpoint=<interval>]", file=sys.stderr)
+        return 2
+    seed: Optional[int] = None
+    checkpoint_interval = 0
+    replay: Optional[bmp.replay.Replay] = None
+    for arg in argv[1:]:
+        if arg.startswith("--seed="):
+            seed = int(arg.removeprefix("--seed="))
+        elif arg.startswith("--checkpoint="):
+            checkpoint_interval = int(arg.removeprefix("--checkpoint="))
+        elif arg.startswith("--replay="):
+            replay = bmp.replay.load(arg.removeprefix("--replay="))
+    levelpack = load(argv[0])
+    if replay is not None:
+        try:
+            checkpoint_list = playback(levelpack, replay, checkpoint_interval=checkpoint_interval)[1]
+        except bmp.replay.ReplayMismatchError:
+            print("replay was recorded on a different levelpack", file=sys.stderr)
+            return 1
+        for turn, checkpoint in checkpoint_list:
+            print(json.dumps({"turn": turn, "level": checkpoint.current_level_id.to_json(), "state": checkpoint.to_json()}, separators=(",", ":")))
+        return 0
+    start(levelpack, seed)
+    record_list = simulate(levelpack, str_to_ops(argv[1]), with_state="--no-state" not in argv[2:], with_phases="--phases" in argv[2:])
+    for record in record_list:
+        print(json.dumps(record_to_json(record), separators=(",", ":")))
+    return 0
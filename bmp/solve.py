@@ -0,0 +1,174 @@
+from typing import Optional, TypedDict
+import copy
+import heapq
+import json
+import multiprocessing
+import sys
+
+import bmp.base
+import bmp.history
+import bmp.levelpack
+import bmp.obj
+import bmp.ref
+import bmp.replay
+import bmp.sim
+
+class SolveResult(TypedDict):
+    replay: Optional[bmp.replay.Replay]
+    nodes: int
+    states: int
+    exhausted: bool
+
+type Child = tuple[str, int, bool, bool, int]
+
+solve_inputs: str = "WASD."
+default_node_limit: int = 100000
+default_memory_limit: int = 256 * 1024 * 1024
+default_batch_size: int = 16
+
+state_key_size: int = sys.getsizeof(bmp.base.hash_mask)
+
+def get_state_key(levelpack: bmp.levelpack.Levelpack) -> int:
+    return bmp.base.stable_hash((levelpack.get_state_hash(), levelpack.rng.getstate()))
+
+def get_state_memory(levelpack: bmp.levelpack.Levelpack) -> int:
+    return sum(sys.getsizeof(bmp.history.get_object_state(o)) for s in levelpack.space_dict.values() for o in s.object_list)
+
+def get_heuristic(levelpack: bmp.levelpack.Levelpack) -> int:
+    distance: Optional[int] = None
+    for space in levelpack.current_level.space_list:
+        win_objs = space.get_objs_from_prop(bmp.obj.TextWin)
+        if len(win_objs) == 0:
+            continue
+        for you_obj in space.get_objs_from_prop(bmp.obj.TextYou):
+            for win_obj in win_objs:
+                new_distance = abs(you_obj.pos[0] - win_obj.pos[0]) + abs(you_obj.pos[1] - win_obj.pos[1])
+                distance = new_distance if distance is None else min(distance, new_distance)
+    return distance if distance is not None else 0
+
+class Explorer(object):
+    def __init__(self, levelpack_json: bmp.levelpack.LevelpackJson) -> None:
+        self.levelpack: bmp.levelpack.Levelpack = bmp.levelpack.json_to_levelpack(levelpack_json)
+        bmp.sim.start(self.levelpack)
+        self.history: bmp.history.History = bmp.history.History(self.levelpack, limit=0, checkpoint_interval=0)
+        self.path: str = ""
+    def goto(self, path: str) -> None:
+        common = 0
+        while common < min(len(path), len(self.path)) and path[common] == self.path[common]:
+            common += 1
+        while len(self.path) > common:
+            self.levelpack = self.history.undo()[0]
+            self.path = self.path[:-1]
+        for replay_input in path[common:]:
+            self.history.push(self.levelpack)
+            self.levelpack.tick(bmp.replay.move_inputs[replay_input])
+            self.path += replay_input
+    def expand(self, path: str, astar: bool) -> list[Child]:
+        self.goto(path)
+        child_list: list[Child] = []
+        for replay_input in solve_inputs:
+            self.history.push(self.levelpack)
+            info = self.levelpack.tick(bmp.replay.move_inputs[replay_input])
+            terminal = info["end"] or info["done"] or info["transform"] or info["select"] is not None
+            heuristic = get_heuristic(self.levelpack) if astar else 0
+            child_list.append((path + replay_input, get_state_key(self.levelpack), info["win"], terminal, heuristic))
+            self.levelpack = self.history.undo()[0]
+        return child_list
+
+worker_explorer: Optional[Explorer] = None
+
+def init_worker(levelpack_json: bmp.levelpack.LevelpackJson) -> None:
+    global worker_explorer
+    worker_explorer = Explorer(levelpack_json)
+
+def expand_paths(path_list: list[str], astar: bool) -> list[list[Child]]:
+    if worker_explorer is None:
+        raise RuntimeError("worker is not initialized")
+    return [worker_explorer.expand(p, astar) for p in path_list]
+
+def solve(
+    levelpack: bmp.levelpack.Levelpack,
+    level_id: bmp.ref.LevelID,
+    *,
+    astar: bool = False,
+    node_limit: int = default_node_limit,
+    memory_limit: int = default_memory_limit,
+    processes: int = 1,
+    batch_size: int = default_batch_size,
+) -> SolveResult:
+    root = copy.deepcopy(levelpack)
+    root.current_level_id = level_id
+    root_replay = bmp.replay.start(root)
+    root_json = root.to_json()
+    explorer = Explorer(root_json)
+    visited: set[int] = {get_state_key(explorer.levelpack)}
+    frontier: list[tuple[int, str]] = [(get_heuristic(explorer.levelpack) if astar else 0, "")]
+    frontier_memory = sys.getsizeof(frontier[0]) + sys.getsizeof(frontier[0][0]) + sys.getsizeof("")
+    # every explorer keeps one history entry per step of the path it is on, each at most a full state
+    state_memory = get_state_memory(explorer.levelpack)
+    depth = 0
+    nodes = 0
+    pool = multiprocessing.Pool(processes, init_worker, (root_json,)) if processes > 1 else None
+    try:
+        while len(frontier) != 0:
+            visited_memory = sys.getsizeof(visited) + len(visited) * state_key_size
+            explorer_memory = (depth + 1) * state_memory * processes
+            if nodes >= node_limit or visited_memory + sys.getsizeof(frontier) + frontier_memory + explorer_memory > memory_limit:
+                return {"replay": None, "nodes": nodes, "states": len(visited), "exhausted": False}
+            path_list: list[str] = []
+            while len(frontier) != 0 and len(path_list) < batch_size * processes and nodes + len(path_list) < node_limit:
+                node = heapq.heappop(frontier)
+                frontier_memory -= sys.getsizeof(node) + sys.getsizeof(node[0]) + sys.getsizeof(node[1])
+                depth = max(depth, len(node[1]))
+                path_list.append(node[1])
+            nodes += len(path_list)
+            if pool is not None:
+                chunk_size = -(-len(path_list) // processes)
+                chunk_list = [(path_list[i:i + chunk_size], astar) for i in range(0, len(path_list), chunk_size)]
+                child_list_list = [c for r in pool.starmap(expand_paths, chunk_list) for c in r]
+            else:
+                child_list_list = [explorer.expand(p, astar) for p in path_list]
+            for child_list in child_list_list:
+                for path, state_hash, win, terminal, heuristic in child_list:
+                    if win:
+                        replay = bmp.replay.Replay(root_replay.levelpack_hash, root_replay.seed, root_replay.random_state, path)
+                        return {"replay": replay, "nodes": nodes, "states": len(visited), "exhausted": False}
+                    if terminal or state_hash in visited:
+                        continue
+                    visited.add(state_hash)
+                    node = (len(path) + heuristic, path)
+                    frontier_memory += sys.getsizeof(node) + sys.getsizeof(node[0]) + sys.getsizeof(path)
+                    heapq.heappush(frontier, node)
+        return {"replay": None, "nodes": nodes, "states": len(visited), "exhausted": True}
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+def main(argv: list[str]) -> int:
+    if len(argv) < 1:
+        print("usage: solvebmp.py <levelpack.json> [<level>] [--astar] [--nodes=<limit>] [--memory=<megabytes>] [--processes=<count>]", file=sys.stderr)
+        return 2
+    levelpack = bmp.sim.load(argv[0])
+    level_id = levelpack.current_level_id
+    astar = False
+    node_limit = default_node_limit
+    memory_limit = default_memory_limit
+    processes = 1
+    for arg in argv[1:]:
+        if arg == "--astar":
+            astar = True
+        elif arg.startswith("--nodes="):
+            node_limit = int(arg.removeprefix("--nodes="))
+        elif arg.startswith("--memory="):
+            memory_limit = int(arg.removeprefix("--memory=")) * 1024 * 1024
+        elif arg.startswith("--processes="):
+            processes = int(arg.removeprefix("--processes="))
+        elif not arg.startswith("--"):
+            level_id = bmp.ref.LevelID(arg)
+    result = solve(levelpack, level_id, astar=astar, node_limit=node_limit, memory_limit=memory_limit, processes=processes)
+    print(f"nodes: {result['nodes']}, states: {result['states']}, exhausted: {result['exhausted']}", file=sys.stderr)
+    if result["replay"] is None:
+        return 1
+    print(json.dumps(result["replay"].to_json()))
+    return 0
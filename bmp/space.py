@@ -1,4 +1,6 @@
-from typing import Never, NotRequired, Optional, TypeGuard, TypedDict
+import functools
+import heapq
+from typing import Literal, Never, NotRequired, Optional, TypeGuard, TypedDict
 from tqdm import tqdm
 
 import bmp.base
@@ -19,6 +21,32 @@ class SpaceJson41(SpaceJson4102):
     object_list: list[bmp.obj.ObjectJson41]
 
 type SpaceJson = SpaceJson4102
+type PropCells = dict[tuple[bmp.loc.Coord[int], bool], list[bmp.obj.Object]]
+
+object_hash_cache_size: int = 65536
+
+@functools.lru_cache(maxsize=object_hash_cache_size)
+def get_object_key_hash(object_type: type[bmp.obj.Object], key: tuple) -> int:
+    return bmp.base.stable_hash((object_type.json_name, key[0], key[1].name, *key[2:]))
+
+def get_object_hash(obj: bmp.obj.Object) -> int:
+    space_id = obj.space_id
+    level_id = obj.level_id
+    direct_mapping = None
+    if obj.direct_mapping != bmp.obj.default_direct_mapping:
+        direct_mapping = tuple(obj.direct_mapping[d].name for d in bmp.loc.Orient)
+    transform = None
+    if isinstance(obj, bmp.obj.SpaceObject):
+        static_transform = obj.space_extra["static_transform"]
+        dynamic_transform = obj.space_extra["dynamic_transform"]
+        transform = (static_transform["direct"], static_transform["flip"], dynamic_transform["direct"], dynamic_transform["flip"])
+    return get_object_key_hash(type(obj), (
+        obj.pos, obj.orient,
+        space_id.name if space_id is not None else None,
+        space_id.infinite_tier if space_id is not None else None,
+        level_id.name if level_id is not None else None,
+        direct_mapping, transform,
+    ))
 
 class Space(object):
     def __init__(
@@ -31,8 +59,21 @@ class Space(object):
         self.space_id: bmp.ref.SpaceID = space_id
         self.size: bmp.loc.Coord[int] = size
         self.color: Optional[bmp.color.ColorHex] = color
-        self.object_list: list[bmp.obj.Object] = object_list if object_list is not None else []
+        self.object_dict: dict[bmp.obj.Object, None] = dict.fromkeys(object_list) if object_list is not None else {}
         self.object_pos_index: list[list[bmp.obj.Object]]
+        self.object_type_index: dict[type[bmp.obj.Object], dict[bmp.obj.Object, int]]
+        self.object_count: int
+        self.property_index: dict[type[bmp.obj.Text], dict[bmp.obj.Object, None]]
+        self.space_object_index: dict[bmp.ref.SpaceID, dict[bmp.obj.SpaceObject, None]]
+        self.rule_dirty_rows: set[int]
+        self.rule_dirty_columns: set[int]
+        self.row_rule_dict: dict[int, list[tuple[int, bmp.rule.Rule, bmp.rule.RuleInfo]]]
+        self.column_rule_dict: dict[int, list[tuple[int, bmp.rule.Rule, bmp.rule.RuleInfo]]]
+        self.state_hash: int
+        self.modify_count: int = 0
+        self.rule_modify_count: int = 0
+        self.space_object_modify_count: int = 0
+        self.property_generation: bmp.obj.PropertyGeneration = bmp.obj.PropertyGeneration()
         self.refresh_index()
         self.properties: dict[type[bmp.obj.SpaceObject], bmp.obj.PropertyStorage] = {p: bmp.obj.PropertyStorage() for p in bmp.obj.space_object_types}
         self.special_operator_properties: dict[type[bmp.obj.SpaceObject], dict[type[bmp.obj.Operator], bmp.obj.PropertyStorage]] = {p: {o: bmp.obj.PropertyStorage() for o in bmp.obj.special_operators} for p in bmp.obj.space_object_types}
@@ -43,6 +84,14 @@ class Space(object):
     def __eq__(self, space: "Space") -> bool:
         return self.space_id == space.space_id
     @property
+    def object_list(self) -> list[bmp.obj.Object]:
+        return list(self.object_dict)
+    @object_list.setter
+    def object_list(self, value: list[bmp.obj.Object]) -> None:
+        self.object_dict = dict.fromkeys(value)
+    def has_obj(self, obj: bmp.obj.Object) -> bool:
+        return obj in self.object_dict
+    @property
     def width(self) -> int:
         return self.size[0]
     @width.setter
@@ -62,9 +111,73 @@ class Space(object):
         return self.object_pos_index[self.pos_to_index(pos)]
     def refresh_index(self) -> None:
         self.object_pos_index = [[] for _ in range(self.width * self.height)]
-        for obj in self.object_list:
+        for obj in self.object_dict:
+            obj.bind_properties(self.property_generation)
             if not self.out_of_range(obj.pos):
                 self.pos_to_objs(obj.pos).append(obj)
+        self.refresh_type_index()
+        self.refresh_space_object_index()
+        self.refresh_property_index()
+        self.refresh_hash()
+        self.modify_count += 1
+        self.rule_dirty_rows = set(range(self.height))
+        self.rule_dirty_columns = set(range(self.width))
+        self.row_rule_dict = {}
+        self.column_rule_dict = {}
+    def refresh_type_index(self) -> None:
+        self.object_type_index = {}
+        for index, obj in enumerate(self.object_dict):
+            self.object_type_index.setdefault(type(obj), {})[obj] = index
+        self.object_count = len(self.object_dict)
+    def refresh_space_object_index(self) -> None:
+        self.space_object_index = {}
+        self.space_object_modify_count += 1
+        for obj in self.object_dict:
+            if isinstance(obj, bmp.obj.SpaceObject) and obj.space_id is not None:
+                self.space_object_index.setdefault(obj.space_id, {})[obj] = None
+    def refresh_hash(self) -> None:
+        self.state_hash = sum(get_object_hash(o) for o in self.object_dict) & bmp.base.hash_mask
+    def refresh_property_index(self) -> None:
+        self.property_index = {}
+        for obj in self.object_dict:
+            if not obj.properties:
+                continue
+            for prop in obj.properties.enabled_list():
+                self.property_index.setdefault(prop, {})[obj] = None
+    def add_to_index(self, obj: bmp.obj.Object) -> None:
+        obj.bind_properties(self.property_generation)
+        self.object_type_index.setdefault(type(obj), {})[obj] = self.object_count
+        self.object_count += 1
+        if isinstance(obj, bmp.obj.SpaceObject) and obj.space_id is not None:
+            self.space_object_index.setdefault(obj.space_id, {})[obj] = None
+            self.space_object_modify_count += 1
+        for prop in obj.properties.enabled_list():
+            self.property_index.setdefault(prop, {})[obj] = None
+    def remove_from_index(self, obj: bmp.obj.Object) -> None:
+        type_objs = self.object_type_index[type(obj)]
+        del type_objs[obj]
+        if len(type_objs) == 0:
+            del self.object_type_index[type(obj)]
+        if isinstance(obj, bmp.obj.SpaceObject) and obj.space_id is not None:
+            self.remove_from_space_object_index(obj, obj.space_id)
+        for prop in obj.properties.enabled_list():
+            prop_objs = self.property_index.get(prop)
+            if prop_objs is not None and obj in prop_objs:
+                del prop_objs[obj]
+                if len(prop_objs) == 0:
+                    del self.property_index[prop]
+        obj.unbind_properties(self.property_generation)
+    def remove_from_space_object_index(self, obj: bmp.obj.SpaceObject, space_id: bmp.ref.SpaceID) -> None:
+        space_objs = self.space_object_index.get(space_id)
+        if space_objs is not None and obj in space_objs:
+            del space_objs[obj]
+            self.space_object_modify_count += 1
+            if len(space_objs) == 0:
+                del self.space_object_index[space_id]
+    def set_rule_dirty(self, obj: bmp.obj.Object) -> None:
+        if isinstance(obj, bmp.obj.Text) and not self.out_of_range(obj.pos):
+            self.rule_dirty_rows.add(obj.pos[1])
+            self.rule_dirty_columns.add(obj.pos[0])
     @staticmethod
     def auto_refresh(func):
         def wrapper(self: "Space", *args, **kwds):
@@ -78,9 +191,27 @@ class Space(object):
         return wrapper
     # @auto_refresh
     def new_obj(self, obj: bmp.obj.Object) -> None:
-        self.object_list.append(obj)
+        self.object_dict[obj] = None
+        self.state_hash = (self.state_hash + get_object_hash(obj)) & bmp.base.hash_mask
+        self.modify_count += 1
         if not self.out_of_range(obj.pos):
             self.pos_to_objs(obj.pos).append(obj)
+        self.add_to_index(obj)
+        self.set_rule_dirty(obj)
+    # @auto_refresh
+    def insert_obj(self, index: int, obj: bmp.obj.Object) -> None:
+        object_list = self.object_list
+        object_list.insert(index, obj)
+        self.object_list = object_list
+        obj.bind_properties(self.property_generation)
+        if not self.out_of_range(obj.pos):
+            self.pos_to_objs(obj.pos).append(obj)
+        self.refresh_type_index()
+        self.refresh_space_object_index()
+        self.refresh_property_index()
+        self.state_hash = (self.state_hash + get_object_hash(obj)) & bmp.base.hash_mask
+        self.modify_count += 1
+        self.set_rule_dirty(obj)
     # @auto_refresh
     def get_objs_from_pos(self, pos: bmp.loc.Coord[int]) -> list[bmp.obj.Object]:
         if self.out_of_range(pos):
@@ -97,23 +228,51 @@ class Space(object):
             return []
         return [o for o in self.pos_to_objs(pos) if noun.isreferenceof(o)]
     # @auto_refresh
-    def get_objs_from_type[T: bmp.obj.Object](self, object_type: type[T]) -> list[T]:
-        return [o for o in self.object_list if isinstance(o, object_type)]
+    def get_objs_from_type[T: bmp.obj.Object](self, object_type: type[T] | tuple[type[T], ...]) -> list[T]:
+        type_objs_list = [d for t, d in self.object_type_index.items() if issubclass(t, object_type)]
+        if len(type_objs_list) == 1:
+            return list(type_objs_list[0]) # type: ignore
+        return [o for _, o in heapq.merge(*(((i, o) for o, i in d.items()) for d in type_objs_list))] # type: ignore
     # @auto_refresh
-    def get_objs_from_noun(self, noun: bmp.obj.Noun) -> list[bmp.obj.Object]:
-        return [o for o in self.object_list if noun.isreferenceof(o)]
+    def get_objs_from_noun(self, noun: bmp.obj.Noun, all_list: Optional[list[type[bmp.obj.Object]]] = None) -> list[bmp.obj.Object]:
+        if isinstance(noun, bmp.obj.GeneralNoun):
+            return self.get_objs_from_type(noun.ref_type)
+        if isinstance(noun, bmp.obj.TextAll) and all_list is not None:
+            return self.get_objs_from_type(tuple(bmp.obj.get_noun_from_type(t).ref_type for t in all_list))
+        if isinstance(noun, (bmp.obj.SpecificSpaceNoun, bmp.obj.TextParabox)):
+            return [o for o in self.get_spaces() if noun.isreferenceof(o)]
+        return [o for o in self.object_list if noun.isreferenceof(o, all_list=all_list)]
+    def get_objs_from_prop(self, prop: type[bmp.obj.Text]) -> list[bmp.obj.Object]:
+        return list(self.property_index.get(prop, {}))
+    def get_prop_count(self, prop: type[bmp.obj.Text]) -> int:
+        return len(self.property_index.get(prop, {}))
+    def has_prop_obj(self, prop: type[bmp.obj.Text], obj: bmp.obj.Object) -> bool:
+        return obj in self.property_index.get(prop, {})
+    def get_prop_cells(self, prop: type[bmp.obj.Text], float_layer: bool = True) -> PropCells:
+        prop_cells: PropCells = {}
+        for obj in self.property_index.get(prop, {}):
+            prop_cells.setdefault((obj.pos, float_layer and obj.properties.enabled(bmp.obj.TextFloat)), []).append(obj)
+        return prop_cells
     # @auto_refresh
     def del_obj(self, obj: bmp.obj.Object) -> None:
-        self.object_list.remove(obj)
+        del self.object_dict[obj]
+        self.state_hash = (self.state_hash - get_object_hash(obj)) & bmp.base.hash_mask
+        self.modify_count += 1
         if not self.out_of_range(obj.pos):
             self.pos_to_objs(obj.pos).remove(obj)
+        self.remove_from_index(obj)
+        self.set_rule_dirty(obj)
     # @auto_refresh
     def del_objs_from_pos(self, pos: bmp.loc.Coord[int]) -> bool:
         if self.out_of_range(pos):
             return False
         deleted = len(self.pos_to_objs(pos)) != 0
         for obj in self.pos_to_objs(pos):
-            self.object_list.remove(obj)
+            del self.object_dict[obj]
+            self.state_hash = (self.state_hash - get_object_hash(obj)) & bmp.base.hash_mask
+            self.modify_count += 1
+            self.remove_from_index(obj)
+            self.set_rule_dirty(obj)
         self.object_pos_index[self.pos_to_index(pos)].clear()
         return deleted
     # @auto_refresh
@@ -122,9 +281,13 @@ class Space(object):
         deleted = False
         for obj in del_objects:
             deleted = True
-            self.object_list.remove(obj)
+            del self.object_dict[obj]
+            self.state_hash = (self.state_hash - get_object_hash(obj)) & bmp.base.hash_mask
+            self.modify_count += 1
             if not self.out_of_range(obj.pos):
                 self.pos_to_objs(pos).remove(obj)
+            self.remove_from_index(obj)
+            self.set_rule_dirty(obj)
         return deleted
     # @auto_refresh
     def del_objs_from_pos_and_noun(self, pos: bmp.loc.Coord[int], noun: bmp.obj.Noun) -> bool:
@@ -132,18 +295,60 @@ class Space(object):
         deleted = False
         for obj in del_objects:
             deleted = True
-            self.object_list.remove(obj)
+            del self.object_dict[obj]
+            self.state_hash = (self.state_hash - get_object_hash(obj)) & bmp.base.hash_mask
+            self.modify_count += 1
             if not self.out_of_range(obj.pos):
                 self.pos_to_objs(pos).remove(obj)
+            self.remove_from_index(obj)
+            self.set_rule_dirty(obj)
         return deleted
     # @auto_refresh
     def set_obj_pos(self, obj: bmp.obj.Object, pos: bmp.loc.Coord[int]) -> None:
         self.pos_to_objs(obj.pos).remove(obj)
+        self.set_rule_dirty(obj)
+        self.state_hash -= get_object_hash(obj)
+        self.modify_count += 1
         obj.pos = pos
+        self.state_hash = (self.state_hash + get_object_hash(obj)) & bmp.base.hash_mask
         self.pos_to_objs(pos).append(obj)
+        self.set_rule_dirty(obj)
+    def set_obj_orient(self, obj: bmp.obj.Object, orient: bmp.loc.Orient) -> None:
+        self.state_hash -= get_object_hash(obj)
+        self.modify_count += 1
+        obj.orient = orient
+        self.state_hash = (self.state_hash + get_object_hash(obj)) & bmp.base.hash_mask
+    def set_obj_space_id(self, obj: bmp.obj.Object, space_id: Optional[bmp.ref.SpaceID]) -> None:
+        self.state_hash -= get_object_hash(obj)
+        self.modify_count += 1
+        if isinstance(obj, bmp.obj.SpaceObject) and obj in self.object_dict:
+            if obj.space_id is not None:
+                self.remove_from_space_object_index(obj, obj.space_id)
+            if space_id is not None:
+                self.space_object_index.setdefault(space_id, {})[obj] = None
+                self.space_object_modify_count += 1
+        obj.space_id = space_id
+        self.state_hash = (self.state_hash + get_object_hash(obj)) & bmp.base.hash_mask
+    def set_obj_direct_mapping(self, obj: bmp.obj.Object, mapping: dict[bmp.loc.Orient, bmp.loc.Orient]) -> None:
+        self.state_hash -= get_object_hash(obj)
+        self.modify_count += 1
+        obj.set_direct_mapping(mapping)
+        self.state_hash = (self.state_hash + get_object_hash(obj)) & bmp.base.hash_mask
+    def set_obj_transform(self, obj: bmp.obj.SpaceObject, key: Literal["static_transform", "dynamic_transform"], transform: bmp.loc.SpaceTransform) -> None:
+        self.state_hash -= get_object_hash(obj)
+        self.modify_count += 1
+        obj.space_extra[key] = transform
+        self.state_hash = (self.state_hash + get_object_hash(obj)) & bmp.base.hash_mask
     # @auto_refresh
     def get_spaces(self) -> list[bmp.obj.SpaceObject]:
-        return [o for o in self.object_list if isinstance(o, bmp.obj.SpaceObject)]
+        return self.get_objs_from_type(bmp.obj.SpaceObject)
+    def get_spaces_from_space_id(self, space_id: bmp.ref.SpaceID) -> list[bmp.obj.SpaceObject]:
+        space_objs = self.space_object_index.get(space_id)
+        if space_objs is None:
+            return []
+        if len(space_objs) == 1:
+            return list(space_objs)
+        return sorted(space_objs, key=lambda o: self.object_type_index[type(o)][o])
     # @auto_refresh
     def get_spaces_from_pos(self, pos: bmp.loc.Coord[int]) -> list[bmp.obj.SpaceObject]:
         if self.out_of_range(pos):
@@ -151,67 +356,52 @@ class Space(object):
         return [o for o in self.pos_to_objs(pos) if isinstance(o, bmp.obj.SpaceObject)]
     # @auto_refresh
     def get_levels(self) -> list[bmp.obj.LevelObject]:
-        return [o for o in self.object_list if isinstance(o, bmp.obj.LevelObject)]
+        return self.get_objs_from_type(bmp.obj.LevelObject)
     # @auto_refresh
     def get_levels_from_pos(self, pos: bmp.loc.Coord[int]) -> list[bmp.obj.LevelObject]:
         if self.out_of_range(pos):
             return []
         return [o for o in self.pos_to_objs(pos) if isinstance(o, bmp.obj.LevelObject)]
-    def get_rule_from_pos_and_direct(self, pos: bmp.loc.Coord[int], direct: bmp.loc.Orient, stage: str = "before prefix") -> tuple[list[bmp.rule.Rule], list[bmp.rule.RuleInfo]]:
-        new_rule_list: list[bmp.rule.Rule] = []
-        new_info_list: list[bmp.rule.RuleInfo] = []
-        for match_type, unmatch_type, next_stage, func in bmp.rule.how_to_match_rule[stage]:
-            text_list: list[bmp.obj.Text] = self.get_objs_from_pos_and_type(pos, bmp.obj.Text)
-            text_list += [
-                o.transform(bmp.obj.get_noun_from_type(type(o)))
-                for o in self.get_objs_from_pos(pos)
-                if o.old_state.prop is not None and o.old_state.prop.enabled(bmp.obj.TextWord)
-            ] # type: ignore
-            matched_list = [o for o in text_list if isinstance(o, tuple(match_type))]
-            if len(unmatch_type) != 0:
-                matched_list = [o for o in matched_list if not isinstance(o, tuple(unmatch_type))]
-            if len(matched_list) != 0:
-                rule_list, info_list = self.get_rule_from_pos_and_direct(bmp.loc.front_position(pos, direct), direct, next_stage)
-                for matched_text in matched_list:
-                    new_rule_list.extend([matched_text] + r for r in rule_list)
-                    new_info_list.extend(func(i, matched_text) for i in info_list)
-            if stage == "after property":
-                new_rule_list.append([])
-                new_info_list.append(bmp.rule.RuleInfo([], False, bmp.obj.Noun(), [], [bmp.rule.OperInfo(bmp.obj.Operator(), [])]))
-        return new_rule_list, new_info_list
+    def get_texts_from_pos(self, pos: bmp.loc.Coord[int]) -> list[bmp.obj.Text]:
+        text_list: list[bmp.obj.Text] = self.get_objs_from_pos_and_type(pos, bmp.obj.Text)
+        text_list += [
+            o.transform(bmp.obj.get_noun_from_type(type(o)))
+            for o in self.get_objs_from_pos(pos)
+            if o.old_state.prop is not None and o.old_state.prop.enabled(bmp.obj.TextWord)
+        ] # type: ignore
+        return text_list
+    def get_rule_from_line(self, pos: bmp.loc.Coord[int], direct: bmp.loc.Orient, length: int) -> list[tuple[int, bmp.rule.Rule, bmp.rule.RuleInfo]]:
+        line_rule_list: list[tuple[int, bmp.rule.Rule, bmp.rule.RuleInfo]] = []
+        text_run: list[list[bmp.obj.Text]] = []
+        for index in range(length + 1):
+            text_list = self.get_texts_from_pos(pos) if index < length else []
+            if len(text_list) != 0:
+                text_run.append(text_list)
+            elif len(text_run) != 0:
+                run_start = index - len(text_run)
+                line_rule_list.extend((run_start + i, r, n) for i, r, n in bmp.rule.get_rule_from_text_run(text_run))
+                text_run = []
+            pos = bmp.loc.front_position(pos, direct)
+        return line_rule_list
     def set_rule(self) -> None:
         for text_obj in self.get_objs_from_type(bmp.obj.Text):
             text_obj.render_state = bmp.obj.TextRenderState.UNUSED
-        self.rule_list = []
-        self.rule_info = []
-        x_rule_dict: dict[int, list[bmp.rule.Rule]] = {}
-        y_rule_dict: dict[int, list[bmp.rule.Rule]] = {}
-        for x in range(self.width):
-            for y in range(self.height):
-                x_rule_dict.setdefault(x, [])
-                new_rule_list, new_rule_info = self.get_rule_from_pos_and_direct((x, y), bmp.loc.Orient.D)
-                for rule_index in range(len(new_rule_list)):
-                    part_of_old_rule = False
-                    for old_x, old_rule_list in x_rule_dict.items():
-                        old_rule_list_test = list(map(lambda r: list(r[x - old_x:]), old_rule_list))
-                        if list(new_rule_list[rule_index]) in old_rule_list_test:
-                            part_of_old_rule = True
-                    if not part_of_old_rule:
-                        x_rule_dict[x].append(new_rule_list[rule_index])
-                        self.rule_list.append(new_rule_list[rule_index])
-                        self.rule_info.append(new_rule_info[rule_index])
-                y_rule_dict.setdefault(y, [])
-                new_rule_list, new_rule_info = self.get_rule_from_pos_and_direct((x, y), bmp.loc.Orient.S)
-                for rule_index in range(len(new_rule_list)):
-                    part_of_old_rule = False
-                    for old_y, old_rule_list in y_rule_dict.items():
-                        old_rule_list_test = list(map(lambda r: list(r[y - old_y:]), old_rule_list))
-                        if list(new_rule_list[rule_index]) in old_rule_list_test:
-                            part_of_old_rule = True
-                    if not part_of_old_rule:
-                        y_rule_dict[y].append(new_rule_list[rule_index])
-                        self.rule_list.append(new_rule_list[rule_index])
-                        self.rule_info.append(new_rule_info[rule_index])
+        if len(self.rule_dirty_rows) != 0 or len(self.rule_dirty_columns) != 0:
+            self.rule_modify_count += 1
+        for y in self.rule_dirty_rows:
+            self.row_rule_dict[y] = self.get_rule_from_line((0, y), bmp.loc.Orient.D, self.width)
+        for x in self.rule_dirty_columns:
+            self.column_rule_dict[x] = self.get_rule_from_line((x, 0), bmp.loc.Orient.S, self.height)
+        self.rule_dirty_rows.clear()
+        self.rule_dirty_columns.clear()
+        rule_entry_list: list[tuple[tuple[int, int, int, int], bmp.rule.Rule, bmp.rule.RuleInfo]] = []
+        for y, line_rule_list in self.row_rule_dict.items():
+            rule_entry_list.extend(((x, y, 0, i), r, n) for i, (x, r, n) in enumerate(line_rule_list))
+        for x, line_rule_list in self.column_rule_dict.items():
+            rule_entry_list.extend(((x, y, 1, i), r, n) for i, (y, r, n) in enumerate(line_rule_list))
+        rule_entry_list.sort(key=lambda e: e[0])
+        self.rule_list = [r for _, r, _ in rule_entry_list]
+        self.rule_info = [n for _, _, n in rule_entry_list]
         for rule in self.rule_list:
             for text_obj in rule:
                 text_obj.render_state = bmp.obj.TextRenderState.USED
@@ -283,7 +473,7 @@ class Space(object):
                 return (-1, int((new_transnum * self.height)))
             case bmp.loc.Orient.D:
                 return (self.width, int((new_transnum * self.height)))
-    def to_json(self) -> SpaceJson:
+    def to_json(self, uid_map: Optional[dict[int, int]] = None) -> SpaceJson:
         json_object: SpaceJson = {
             "id": self.space_id.to_json(),
             "size": (self.width, self.height),
@@ -298,7 +488,10 @@ class Space(object):
             position = 2,
             **bmp.lang.default_tqdm_args,
         ):
-            json_object["objects"].append(obj.to_json())
+            obj_json = obj.to_json()
+            if uid_map is not None:
+                obj_json["id"] = uid_map.setdefault(obj.uid, len(uid_map))
+            json_object["objects"].append(obj_json)
         return json_object
 
 type AnySpaceJson = SpaceJson41 | SpaceJson4102 | SpaceJson
@@ -335,13 +528,9 @@ def update_json_format(json_object: AnySpaceJson, ver: str) -> SpaceJson:
     else:
         raise bmp.base.UpgradeError(json_object)
 
-def json_to_space(json_object: SpaceJson) -> Space:
+def json_to_space(json_object: SpaceJson, uid_map: Optional[dict[int, int]] = None) -> Space:
     space_id: bmp.ref.SpaceID = bmp.ref.SpaceID(**json_object["id"])
-    new_space = Space(
-        space_id = space_id,
-        size = (json_object["size"][0], json_object["size"][1]),
-        color=json_object.get("color")
-    )
+    object_list: list[bmp.obj.Object] = []
     for obj in tqdm(
         json_object["objects"],
         desc = bmp.lang.fformat("loading.space.objects"),
@@ -349,6 +538,13 @@ def json_to_space(json_object: SpaceJson) -> Space:
         position = 2,
         **bmp.lang.default_tqdm_args,
     ):
-        new_space.object_list.append(bmp.obj.json_to_object(obj))
-    new_space.refresh_index()
-    return new_space
\ No newline at end of file
+        new_obj = bmp.obj.json_to_object(obj)
+        if uid_map is not None and "id" in obj:
+            new_obj.uid = uid_map.setdefault(obj["id"], new_obj.uid)
+        object_list.append(new_obj)
+    return Space(
+        space_id = space_id,
+        size = (json_object["size"][0], json_object["size"][1]),
+        color = json_object.get("color"),
+        object_list = object_list,
+    )
\ No newline at end of file
@@ -0,0 +1,52 @@
+from typing import Optional
+import copy
+import threading
+
+import bmp.levelpack
+import bmp.loc
+import bmp.ref
+
+type SpeculationKey = tuple[int, int, bmp.levelpack.RandomState, bmp.ref.LevelID, bmp.ref.SpaceID]
+type SpeculationResult = tuple[bmp.levelpack.Levelpack, bmp.levelpack.ReturnInfo]
+
+speculation_ops: list[Optional[bmp.loc.Orient]] = [bmp.loc.Orient.W, bmp.loc.Orient.A, bmp.loc.Orient.S, bmp.loc.Orient.D, None]
+
+def get_speculation_key(levelpack: bmp.levelpack.Levelpack) -> SpeculationKey:
+    return (
+        id(levelpack),
+        levelpack.get_state_hash(),
+        levelpack.rng.getstate(),
+        levelpack.current_level_id,
+        levelpack.current_level.current_space_id,
+    )
+
+class Speculator(object):
+    def __init__(self) -> None:
+        self.generation: int = 0
+        self.key: Optional[SpeculationKey] = None
+        self.result_dict: dict[Optional[bmp.loc.Orient], SpeculationResult] = {}
+        self.last_op: Optional[bmp.loc.Orient] = None
+    def start(self, levelpack: bmp.levelpack.Levelpack) -> None:
+        self.cancel()
+        self.key = get_speculation_key(levelpack)
+        op_list = [self.last_op] + [o for o in speculation_ops if o != self.last_op]
+        thread = threading.Thread(target=self.run, args=(self.generation, copy.deepcopy(levelpack), op_list, self.result_dict), daemon=True)
+        thread.start()
+    def run(self, generation: int, levelpack: bmp.levelpack.Levelpack, op_list: list[Optional[bmp.loc.Orient]], result_dict: dict[Optional[bmp.loc.Orient], SpeculationResult]) -> None:
+        for index, op in enumerate(op_list):
+            if generation != self.generation:
+                return
+            speculative_levelpack = levelpack if index == len(op_list) - 1 else copy.deepcopy(levelpack)
+            info = speculative_levelpack.tick(op)
+            result_dict[op] = (speculative_levelpack, info)
+    def cancel(self) -> None:
+        self.generation += 1
+        self.key = None
+        self.result_dict = {}
+    def take(self, levelpack: bmp.levelpack.Levelpack, op: Optional[bmp.loc.Orient]) -> Optional[SpeculationResult]:
+        result: Optional[SpeculationResult] = None
+        if self.key is not None and self.key == get_speculation_key(levelpack):
+            result = self.result_dict.get(op)
+        self.last_op = op
+        self.cancel()
+        return result
@@ -0,0 +1,102 @@
+from typing import Optional
+import copy
+import queue
+import threading
+
+import bmp.history
+import bmp.levelpack
+import bmp.loc
+import bmp.ref
+import bmp.space
+import bmp.speculate
+
+type TickInput = tuple[Optional[bmp.loc.Orient]]
+type TickResult = tuple[bmp.levelpack.Levelpack, bmp.levelpack.ReturnInfo, Optional[bmp.loc.Orient], bool]
+
+def set_sprite_states(levelpack: bmp.levelpack.Levelpack, round_num: int) -> None:
+    for space in levelpack.current_level.space_list:
+        space.set_sprite_states(round_num)
+
+def copy_for_render(levelpack: bmp.levelpack.Levelpack) -> bmp.levelpack.Levelpack:
+    level = levelpack.current_level
+    space_dict: dict[bmp.ref.SpaceID, bmp.space.Space] = {}
+    render_level, render_space_list = copy.deepcopy((level, level.space_list), {id(level.space_dict): space_dict})
+    space_dict.update({s.space_id: s for s in render_space_list})
+    render_levelpack = copy.copy(levelpack)
+    render_levelpack.level_dict = levelpack.level_dict | {level.level_id: render_level}
+    render_levelpack.space_dict = levelpack.space_dict | space_dict
+    return render_levelpack
+
+def need_continue(info: bmp.levelpack.ReturnInfo) -> bool:
+    return info["win"] or info["end"] or info["done"] or info["transform"] or info["select"] is not None
+
+class Ticker(object):
+    def __init__(
+        self,
+        levelpack: bmp.levelpack.Levelpack,
+        history: bmp.history.History,
+        info: bmp.levelpack.ReturnInfo,
+        speculator: Optional[bmp.speculate.Speculator] = None,
+    ) -> None:
+        self.levelpack: bmp.levelpack.Levelpack = levelpack
+        self.history: bmp.history.History = history
+        self.info: bmp.levelpack.ReturnInfo = info
+        self.press_key_to_continue: bool = False
+        self.speculator: Optional[bmp.speculate.Speculator] = speculator
+        self.input_queue: queue.Queue[Optional[TickInput]] = queue.Queue()
+        self.result_queue: queue.Queue[TickResult | BaseException] = queue.Queue()
+        self.pending: int = 0
+        self.thread: threading.Thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+    def idle(self) -> bool:
+        return self.pending == 0
+    def set_state(self, levelpack: bmp.levelpack.Levelpack, history: bmp.history.History, info: bmp.levelpack.ReturnInfo, press_key_to_continue: bool) -> None:
+        if not self.idle():
+            raise RuntimeError("ticker is busy")
+        self.levelpack = levelpack
+        self.history = history
+        self.info = info
+        self.press_key_to_continue = press_key_to_continue
+    def put(self, op: Optional[bmp.loc.Orient]) -> None:
+        self.pending += 1
+        self.input_queue.put((op, ))
+    def get(self) -> Optional[TickResult]:
+        try:
+            result = self.result_queue.get_nowait()
+        except queue.Empty:
+            return None
+        self.pending -= 1
+        if isinstance(result, BaseException):
+            raise result
+        if self.idle():
+            _, info, op, continued = result
+            return self.levelpack, info, op, continued
+        return result
+    def stop(self) -> None:
+        self.input_queue.put(None)
+    def run(self) -> None:
+        while True:
+            tick_input = self.input_queue.get()
+            if tick_input is None:
+                return
+            try:
+                self.result_queue.put(self.step(tick_input[0]))
+            except BaseException as error:
+                self.result_queue.put(error)
+    def step(self, op: Optional[bmp.loc.Orient]) -> TickResult:
+        continued = self.press_key_to_continue
+        if continued:
+            self.levelpack.change_level(self.info)
+            self.press_key_to_continue = False
+        else:
+            self.history.push(self.levelpack)
+            speculation = self.speculator.take(self.levelpack, op) if self.speculator is not None else None
+            if speculation is not None:
+                self.levelpack, self.info = speculation
+                self.history.replace(self.levelpack)
+            else:
+                self.info = self.levelpack.tick(op)
+            self.history.info = self.info
+            self.press_key_to_continue = need_continue(self.info)
+        set_sprite_states(self.levelpack, len(self.history))
+        return copy_for_render(self.levelpack), self.info, op, continued
@@ -0,0 +1,10 @@
+#!/usr/bin/python3
+
+import os
+os.environ["BMP_HEADLESS"] = "TRUE"
+
+import bmp
+import sys
+
+if __name__ == "__main__":
+    sys.exit(bmp.sim.main(sys.argv[1:]))
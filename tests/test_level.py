@@ -0,0 +1,378 @@
+import os
+os.environ["BMP_HEADLESS"] = "TRUE"
+
+import json
+import unittest
+from typing import Callable, Optional
+
+import bmp.base
+import bmp.level
+import bmp.levelpack
+import bmp.loc
+import bmp.obj
+import bmp.ref
+import bmp.space
+
+# the recursive resolver from before moves were memoised, kept as the reference
+def get_reference_move_list(level: bmp.level.Level, space: bmp.space.Space, obj: bmp.obj.Object, \
+    direct: bmp.loc.Orient, pos: Optional[bmp.loc.Coord[int]] = None, \
+        pushed: Optional[list[bmp.obj.Object]] = None, passed: Optional[list[bmp.ref.SpaceID]] = None, \
+            transnum: Optional[float] = None, depth: int = 0) -> Optional[list[bmp.level.MoveInfo]]:
+    if depth > 100:
+        return None
+    depth += 1
+    pushed = pushed[:] if pushed is not None else []
+    if obj in pushed:
+        return None
+    passed = passed[:] if passed is not None else []
+    pos = pos if pos is not None else obj.pos
+    new_pos = bmp.loc.front_position(pos, direct)
+    leave_space = False
+    leave_list: list[bmp.level.MoveInfo] = []
+    if space.out_of_range(new_pos) and not obj.properties.disabled(bmp.obj.TextLeave):
+        old_space_id = space.space_id
+        old_space = level.get_space(old_space_id)
+        if passed.count(space.space_id) > bmp.level.infinite_move_number:
+            old_space_id = space.space_id + 1
+        passed.append(space.space_id)
+        if old_space is not None:
+            super_space_list = level.find_super_spaces(old_space_id)
+            for super_space, space_obj in super_space_list:
+                if old_space.properties[type(space_obj)].disabled(bmp.obj.TextLeave):
+                    continue
+                transform = space.get_stacked_transform(space_obj.space_extra["static_transform"], space_obj.space_extra["dynamic_transform"])
+                new_direct = bmp.loc.swap_direction(direct) if transform["flip"] and direct in (bmp.loc.Orient.A, bmp.loc.Orient.D) else direct
+                new_direct = bmp.loc.turn(new_direct, bmp.loc.Orient[transform["direct"]])
+                if transnum is not None:
+                    new_transnum = space.calc_leave_transnum(transnum, space_obj.pos, direct, transform)
+                else:
+                    new_transnum = space.get_leave_transnum_from_pos(obj.pos, direct, transform)
+                new_move_list = get_reference_move_list(level, super_space, obj, new_direct, space_obj.pos, pushed, passed, new_transnum, depth)
+                if new_move_list is not None:
+                    leave_space = True
+                    leave_list.extend(new_move_list)
+        else:
+            leave_space = True
+            leave_list.append((obj, []))
+    push_objects = [o for o in space.get_objs_from_pos(new_pos) if o.properties.enabled(bmp.obj.TextPush)]
+    unpushable_objects: list[bmp.obj.Object] = []
+    push = False
+    push_list: list[bmp.level.MoveInfo] = []
+    if len(push_objects) != 0 and not space.out_of_range(new_pos):
+        push = True
+        for push_object in push_objects:
+            new_move_list = get_reference_move_list(level, space, push_object, direct, pushed=pushed + [obj], depth=depth)
+            if new_move_list is None:
+                unpushable_objects.append(push_object)
+                push = False
+            else:
+                push_list.extend(new_move_list)
+        if push:
+            push_list.append((obj, [(space.space_id, new_pos, direct)]))
+    simple = False
+    stop_objects: list[bmp.obj.Object] = []
+    if not space.out_of_range(new_pos):
+        stop_objects = [o for o in space.get_objs_from_pos(new_pos) if o.properties.enabled(bmp.obj.TextStop) and not o.properties.enabled(bmp.obj.TextPush)]
+        if len(stop_objects + unpushable_objects) != 0:
+            push = False
+            if obj.properties.enabled(bmp.obj.TextOpen):
+                simple = True
+                for stop_object in stop_objects + unpushable_objects:
+                    if not stop_object.properties.enabled(bmp.obj.TextShut):
+                        simple = False
+            elif obj.properties.enabled(bmp.obj.TextShut):
+                simple = True
+                for stop_object in stop_objects + unpushable_objects:
+                    if not stop_object.properties.enabled(bmp.obj.TextOpen):
+                        simple = False
+        else:
+            simple = True
+    squeeze = False
+    squeeze_list: list[bmp.level.MoveInfo] = []
+    if isinstance(obj, bmp.obj.SpaceObject) and (not space.out_of_range(new_pos)) and (not simple) and len(stop_objects) == 0:
+        squeeze_space = level.get_space(obj.space_id)
+        if squeeze_space is not None:
+            if not squeeze_space.properties[type(obj)].disabled(bmp.obj.TextEnter):
+                squeeze = True
+                for new_push_object in push_objects:
+                    if new_push_object.properties.disabled(bmp.obj.TextEnter):
+                        squeeze = False
+                        break
+                    transform = bmp.loc.inverse_transform(squeeze_space.get_stacked_transform(obj.space_extra["static_transform"], obj.space_extra["dynamic_transform"]))
+                    new_direct = bmp.loc.swap_direction(direct) if transform["flip"] and direct in (bmp.loc.Orient.A, bmp.loc.Orient.D) else direct
+                    new_direct = bmp.loc.turn(new_direct, bmp.loc.Orient[transform["direct"]])
+                    input_pos = squeeze_space.get_enter_pos_by_default(new_direct, transform)
+                    squeeze_move_list = get_reference_move_list(level, squeeze_space, new_push_object, bmp.loc.swap_direction(new_direct), input_pos, pushed=pushed + [obj], depth=depth)
+                    if squeeze_move_list is None:
+                        squeeze = False
+                        break
+                    squeeze_list.extend(squeeze_move_list)
+        else:
+            squeeze = True
+            for new_push_object in push_objects:
+                if new_push_object.properties.disabled(bmp.obj.TextEnter):
+                    squeeze = False
+                    break
+                squeeze_list.append((new_push_object, []))
+        if squeeze:
+            squeeze_list.append((obj, [(space.space_id, new_pos, direct)]))
+    enter_space = False
+    enter_list: list[bmp.level.MoveInfo] = []
+    if not space.out_of_range(new_pos) and not obj.properties.disabled(bmp.obj.TextEnter):
+        sub_space_obj_list = [o for o in space.get_spaces_from_pos(new_pos) if not o.properties.disabled(bmp.obj.TextEnter)]
+        for sub_space_obj in sub_space_obj_list:
+            sub_space = level.get_space(sub_space_obj.space_id)
+            if sub_space is None:
+                enter_space = True
+                continue
+            if sub_space.properties[type(sub_space_obj)].disabled(bmp.obj.TextEnter):
+                continue
+            if passed.count(sub_space.space_id) > bmp.level.infinite_move_number:
+                epsilon_space_id = sub_space.space_id - 1
+                epsilon_space = level.get_space(epsilon_space_id)
+                if epsilon_space is None:
+                    enter_space = True
+                    continue
+                if epsilon_space.properties[type(sub_space_obj)].disabled(bmp.obj.TextEnter):
+                    continue
+                epsilon_space_list = level.find_super_spaces(epsilon_space.space_id)
+                for _, epsilon_space_obj in epsilon_space_list:
+                    if epsilon_space_obj.properties.disabled(bmp.obj.TextEnter):
+                        continue
+                    transform = bmp.loc.inverse_transform(epsilon_space.get_stacked_transform(epsilon_space_obj.space_extra["static_transform"], epsilon_space_obj.space_extra["dynamic_transform"]))
+                    inversed_transform = bmp.loc.inverse_transform(transform)
+                    new_direct = bmp.loc.swap_direction(direct) if inversed_transform["flip"] and direct in (bmp.loc.Orient.A, bmp.loc.Orient.D) else direct
+                    new_direct = bmp.loc.turn(new_direct, bmp.loc.Orient[transform["direct"]])
+                    input_pos = epsilon_space.get_enter_pos_by_default(bmp.loc.swap_direction(new_direct), inversed_transform)
+                    new_transnum = 0.5
+                    passed.append(space.space_id)
+                    new_move_list = get_reference_move_list(level, epsilon_space, obj, new_direct, input_pos, pushed, passed, new_transnum, depth)
+                    if new_move_list is not None:
+                        enter_list.extend(new_move_list)
+                        enter_space = True
+                continue
+            transform = sub_space.get_stacked_transform(sub_space_obj.space_extra["static_transform"], sub_space_obj.space_extra["dynamic_transform"])
+            inversed_transform = bmp.loc.inverse_transform(transform)
+            new_direct = bmp.loc.swap_direction(direct) if inversed_transform["flip"] and direct in (bmp.loc.Orient.A, bmp.loc.Orient.D) else direct
+            new_direct = bmp.loc.turn(new_direct, bmp.loc.Orient[transform["direct"]])
+            if transnum is not None:
+                input_pos = sub_space.get_enter_pos(transnum, bmp.loc.swap_direction(direct), inversed_transform)
+                new_transnum = space.calc_enter_transnum(transnum, sub_space_obj.pos, bmp.loc.swap_direction(direct), inversed_transform)
+            else:
+                input_pos = sub_space.get_enter_pos_by_default(bmp.loc.swap_direction(direct), inversed_transform)
+                new_transnum = 0.5
+            passed.append(space.space_id)
+            new_move_list = get_reference_move_list(level, sub_space, obj, new_direct, input_pos, pushed, passed, new_transnum, depth)
+            if new_move_list is not None:
+                enter_list.extend(new_move_list)
+                enter_space = True
+    if enter_space and len(enter_list) == 0:
+        enter_list.append((obj, []))
+    if leave_space:
+        return level.merge_move_list(leave_list)
+    elif push:
+        return level.merge_move_list(push_list)
+    elif enter_space:
+        return level.merge_move_list(enter_list)
+    elif squeeze:
+        return level.merge_move_list(squeeze_list)
+    elif simple:
+        return [(obj, [(space.space_id, new_pos, direct)])]
+    else:
+        return None
+
+# the MOVE rounds from before movers were queued, which always ran for max_move_count rounds
+def reference_move(level: bmp.level.Level) -> bool:
+    level.reset_move_numbers()
+    pushing_game = False
+    finished = False
+    for _ in range(bmp.level.max_move_count):
+        if finished:
+            return pushing_game
+        move_list = []
+        finished = True
+        for space in level.space_list:
+            move_objs = [o for o in space.get_objs_from_prop(bmp.obj.TextMove) if o.move_number < o.properties.count(bmp.obj.TextMove)]
+            if len(move_objs) != 0:
+                finished = False
+            for obj in move_objs:
+                new_move_list = level.get_move_list(space, obj, obj.orient)
+                if new_move_list is not None:
+                    move_list = new_move_list
+                    obj.move_number += 1
+                else:
+                    space.set_obj_orient(obj, bmp.loc.swap_direction(obj.orient))
+                    new_move_list = level.get_move_list(space, obj, obj.orient)
+                    if new_move_list is not None:
+                        move_list = new_move_list
+                        obj.move_number += 1
+                    else:
+                        pushing_game = True
+        level.move_objs_from_move_list(move_list)
+    return pushing_game
+
+def make_object(object_type: str, pos: bmp.loc.Coord[int], orient: str = "S", space: Optional[str] = None, tier: int = 0) -> dict:
+    json_object = {"type": object_type, "pos": list(pos), "orient": orient}
+    if space is not None:
+        json_object["space_id"] = {"name": space, "infinite_tier": tier}
+    return json_object
+
+def make_rule(y: int, word_list: list[str]) -> list[dict]:
+    return [make_object(f"text_{w}", (x, y)) for x, w in enumerate(word_list)]
+
+def make_levelpack(space_list: list[tuple[str, int, bmp.loc.Coord[int], list[dict]]]) -> bmp.levelpack.Levelpack:
+    space_id_list = [{"name": n, "infinite_tier": t} for n, t, _, _ in space_list]
+    return bmp.levelpack.json_to_levelpack({
+        "ver": bmp.base.version,
+        "current_level": {"name": "test"},
+        "levels": [{"id": {"name": "test"}, "spaces": space_id_list, "current_space": space_id_list[0]}],
+        "spaces": [{"id": i, "size": list(s[2]), "objects": s[3]} for i, s in zip(space_id_list, space_list)],
+        "collectibles": [],
+        "rules": [],
+    }) # type: ignore
+
+def push_chain_levelpack() -> bmp.levelpack.Levelpack:
+    object_list = make_rule(0, ["baba", "is", "you"]) + make_rule(1, ["keke", "is", "you"]) + make_rule(2, ["rock", "is", "push"]) + make_rule(3, ["wall", "is", "stop"])
+    object_list += [make_object("baba", (0, 5), "D"), make_object("keke", (0, 5), "D"), make_object("keke", (0, 6), "D")]
+    object_list += [make_object("rock", (x, 5)) for x in range(1, 110)] + [make_object("wall", (119, 5))]
+    object_list += [make_object("rock", (x, 6)) for x in range(1, 20)]
+    return make_levelpack([("chain", 0, (120, 8), object_list)])
+
+def squeeze_levelpack() -> bmp.levelpack.Levelpack:
+    object_list = make_rule(0, ["baba", "is", "you"]) + make_rule(1, ["space", "is", "push"]) + make_rule(2, ["rock", "is", "push"]) + make_rule(3, ["wall", "is", "stop"])
+    object_list += [make_object("baba", (0, 5)), make_object("space", (1, 5), space="inner"), make_object("rock", (2, 5)), make_object("rock", (3, 5)), make_object("wall", (4, 5))]
+    object_list += [make_object("baba", (0, 7)), make_object("space", (1, 7), space="missing"), make_object("rock", (2, 7)), make_object("wall", (3, 7))]
+    inner_list = [make_object("rock", (1, 1)), make_object("wall", (2, 2))]
+    return make_levelpack([("outer", 0, (8, 8), object_list), ("inner", 0, (3, 3), inner_list)])
+
+def enter_leave_levelpack() -> bmp.levelpack.Levelpack:
+    object_list = make_rule(0, ["baba", "is", "you"]) + make_rule(1, ["rock", "is", "push"]) + make_rule(2, ["keke", "is", "shut"]) + make_rule(3, ["wall", "is", "open"])
+    object_list += make_rule(4, ["wall", "is", "stop"])
+    object_list += [make_object("baba", (1, 6)), make_object("space", (3, 6), space="inner"), make_object("rock", (2, 6))]
+    object_list += [make_object("space", (5, 6), "A", space="turned"), make_object("keke", (6, 7)), make_object("wall", (6, 6))]
+    inner_list = [make_object("baba", (1, 1)), make_object("rock", (0, 2)), make_object("keke", (2, 0))]
+    turned_list = [make_object("rock", (1, 1)), make_object("baba", (0, 0))]
+    return make_levelpack([("outer", 0, (8, 8), object_list), ("inner", 0, (3, 3), inner_list), ("turned", 0, (3, 3), turned_list)])
+
+def infinity_levelpack() -> bmp.levelpack.Levelpack:
+    object_list = make_rule(0, ["baba", "is", "you"]) + make_rule(1, ["rock", "is", "push"])
+    object_list += [make_object("baba", (1, 5)), make_object("space", (2, 5), space="loop"), make_object("rock", (4, 5))]
+    object_list += [make_object("space", (6, 2), "D", space="loop", tier=-1)]
+    loop_list = [make_object("space", (0, 1), space="loop"), make_object("space", (2, 1), space="loop"), make_object("baba", (1, 0)), make_object("rock", (1, 2))]
+    infinity_list = [make_object("space", (1, 1), space="loop", tier=1), make_object("baba", (0, 0))]
+    epsilon_list = [make_object("rock", (1, 1)), make_object("baba", (2, 2))]
+    return make_levelpack([
+        ("outer", 0, (8, 8), object_list),
+        ("loop", 0, (3, 3), loop_list),
+        ("loop", 1, (3, 3), infinity_list),
+        ("loop", -1, (3, 3), epsilon_list),
+    ])
+
+def load_bundled_levelpack(filename: str) -> Optional[bmp.levelpack.Levelpack]:
+    with open(os.path.join("levelpacks", filename), "r", encoding="utf-8") as file:
+        levelpack_json = json.load(file)
+    try:
+        levelpack_json = bmp.levelpack.update_json_format(levelpack_json, levelpack_json["ver"])
+    except bmp.base.UpgradeError:
+        return None
+    return bmp.levelpack.json_to_levelpack(levelpack_json)
+
+class MoveListTest(unittest.TestCase):
+    def assert_same_move_lists(self, levelpack: bmp.levelpack.Levelpack, op_list: list[Optional[bmp.loc.Orient]]) -> int:
+        levelpack.prepare()
+        count = 0
+        for op in [None] + op_list:
+            levelpack.tick(op)
+            level = levelpack.current_level
+            memo: bmp.level.MoveMemo = {}
+            for space in level.space_list:
+                for obj in space.object_list:
+                    for direct in bmp.loc.Orient:
+                        move_list = level.get_move_list(space, obj, direct, memo=memo)
+                        self.assertEqual(move_list, get_reference_move_list(level, space, obj, direct), (space.space_id, obj, direct))
+                        count += 1
+        return count
+    def test_constructed_levels(self) -> None:
+        op_list = [bmp.loc.Orient.D, bmp.loc.Orient.D, bmp.loc.Orient.S, bmp.loc.Orient.D, bmp.loc.Orient.W, bmp.loc.Orient.A, bmp.loc.Orient.D]
+        for make in [push_chain_levelpack, squeeze_levelpack, enter_leave_levelpack, infinity_levelpack]:
+            with self.subTest(level=make.__name__):
+                self.assertNotEqual(self.assert_same_move_lists(make(), op_list), 0)
+    def test_memo_record_overflow(self) -> None:
+        levelpack = push_chain_levelpack()
+        levelpack.prepare()
+        levelpack.tick(None)
+        level = levelpack.current_level
+        space = level.current_space
+        rock_list = sorted((o for o in space.get_objs_from_type(bmp.obj.name_to_class["rock"]) if o.pos[1] == 6), key=lambda o: o.pos[0])
+        memo: bmp.level.MoveMemo = {}
+        pushed_list = [[r] for r in rock_list[1:bmp.level.max_move_records * 2 + 2]] + [[]]
+        for pushed in pushed_list:
+            move_list = level.get_move_list(space, rock_list[0], bmp.loc.Orient.D, pushed=pushed, memo=memo)
+            self.assertEqual(move_list, get_reference_move_list(level, space, rock_list[0], bmp.loc.Orient.D, pushed=pushed), pushed)
+        self.assertIsNone(level.get_move_list(space, rock_list[0], bmp.loc.Orient.D, pushed=[rock_list[-1]], memo=memo))
+        self.assertEqual(max(len(r) for r in memo.values()), bmp.level.max_move_records)
+    def test_memo_across_rounds(self) -> None:
+        object_list = make_rule(0, ["baba", "is", "you"]) + make_rule(1, ["baba", "is", "you"]) + make_rule(2, ["keke", "is", "move"]) + make_rule(3, ["keke", "is", "move"])
+        object_list += make_rule(4, ["rock", "is", "push"]) + make_rule(5, ["wall", "is", "stop"]) + make_rule(6, ["keke", "is", "stop"])
+        object_list += [make_object("baba", (0, 7)), make_object("rock", (1, 7)), make_object("rock", (2, 7)), make_object("wall", (5, 7))]
+        # the first keke is stopped by the second one only until the second one has moved away
+        object_list += [make_object("keke", (0, 8), "D"), make_object("keke", (1, 8), "D")]
+        levelpack = make_levelpack([("rounds", 0, (8, 9), object_list)])
+        levelpack.prepare()
+        level = levelpack.current_level
+        get_move_list = level.get_move_list
+        memo_hits = 0
+        def checked_get_move_list(space: bmp.space.Space, obj: bmp.obj.Object, direct: bmp.loc.Orient, memo: bmp.level.MoveMemo) -> Optional[list[bmp.level.MoveInfo]]:
+            nonlocal memo_hits
+            memo_hits += len(memo) != 0
+            move_list = get_move_list(space, obj, direct, memo=memo)
+            self.assertEqual(move_list, get_reference_move_list(level, space, obj, direct), (obj, direct))
+            return move_list
+        level.get_move_list = checked_get_move_list # type: ignore
+        for op in [None, bmp.loc.Orient.D, bmp.loc.Orient.D, bmp.loc.Orient.S, bmp.loc.Orient.W, bmp.loc.Orient.D]:
+            levelpack.tick(op)
+        self.assertNotEqual(memo_hits, 0)
+        space = level.current_space
+        self.assertEqual({o.pos for o in space.get_objs_from_type(bmp.obj.name_to_class["rock"])}, {(3, 7), (4, 7)})
+    def test_bundled_levelpacks(self) -> None:
+        op_list = [bmp.loc.Orient.D, bmp.loc.Orient.S, bmp.loc.Orient.A, bmp.loc.Orient.W, None]
+        for filename in sorted(f for f in os.listdir("levelpacks") if f.endswith(".json")):
+            with self.subTest(levelpack=filename):
+                levelpack = load_bundled_levelpack(filename)
+                if levelpack is None:
+                    self.skipTest(f"{filename} needs a format upgrade")
+                self.assert_same_move_lists(levelpack, op_list)
+
+def blocked_movers_levelpack(move_count: int, boxed_count: int, free: bool) -> bmp.levelpack.Levelpack:
+    object_list = make_rule(0, ["wall", "is", "stop"])
+    object_list += sum((make_rule(y, ["keke", "is", "move"]) for y in range(1, move_count + 1)), [])
+    for index in range(boxed_count):
+        y = move_count + 2 + index
+        object_list += [make_object("wall", (0, y)), make_object("keke", (1, y), "D"), make_object("wall", (2, y))]
+    if free:
+        object_list += [make_object("keke", (4, move_count + 2), "S")]
+    return make_levelpack([("movers", 0, (8, move_count + boxed_count + 8), object_list)])
+
+class MoveRoundTest(unittest.TestCase):
+    def get_move_result(self, levelpack: bmp.levelpack.Levelpack, move: Callable[[bmp.level.Level], bool]) -> tuple[bool, list[tuple[str, bmp.loc.Coord[int], bmp.loc.Orient, int]]]:
+        levelpack.prepare()
+        levelpack.update_rules()
+        level = levelpack.current_level
+        pushing_game = move(level)
+        return pushing_game, [(type(o).json_name, o.pos, o.orient, o.move_number) for o in level.current_space.object_list]
+    def assert_same_as_reference(self, move_count: int, boxed_count: int, free: bool) -> None:
+        result = self.get_move_result(blocked_movers_levelpack(move_count, boxed_count, free), bmp.level.Level.move)
+        self.assertEqual(result, self.get_move_result(blocked_movers_levelpack(move_count, boxed_count, free), reference_move))
+    def test_single_blocked_mover(self) -> None:
+        for move_count in range(1, 4):
+            with self.subTest(move_count=move_count):
+                self.assert_same_as_reference(move_count, 1, False)
+    def test_blocked_after_free_mover(self) -> None:
+        # the free keke keeps moving for move_count rounds, so the blocked rounds start on an odd or even round
+        for move_count in range(1, 4):
+            for boxed_count in (1, 3):
+                with self.subTest(move_count=move_count, boxed_count=boxed_count):
+                    self.assert_same_as_reference(move_count, boxed_count, True)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+os.environ["BMP_HEADLESS"] = "TRUE"
+
+import copy
+import unittest
+
+import bmp.base
+import bmp.levelpack
+import bmp.obj
+
+def make_levelpack(size: tuple[int, int], object_list: list[dict]) -> bmp.levelpack.Levelpack:
+    space_id = {"name": "test", "infinite_tier": 0}
+    return bmp.levelpack.json_to_levelpack({
+        "ver": bmp.base.version,
+        "current_level": {"name": "test"},
+        "levels": [{"id": {"name": "test"}, "spaces": [space_id], "current_space": space_id}],
+        "spaces": [{"id": space_id, "size": list(size), "objects": object_list}],
+        "collectibles": [],
+        "rules": [],
+    }) # type: ignore
+
+def make_rule(y: int, word_list: list[str]) -> list[dict]:
+    return [{"type": f"text_{w}", "pos": [x, y], "orient": "S"} for x, w in enumerate(word_list)]
+
+class TransformTest(unittest.TestCase):
+    def test_transform_whole_row(self) -> None:
+        object_list = make_rule(0, ["baba", "is", "you"]) + make_rule(1, ["rock", "is", "keke"])
+        object_list += [{"type": "baba", "pos": [0, 3], "orient": "S"}]
+        object_list += [{"type": "rock", "pos": [x, 4], "orient": "S"} for x in range(6)]
+        levelpack = make_levelpack((6, 5), object_list)
+        levelpack.tick(None)
+        space = levelpack.current_level.current_space
+        self.assertEqual(len(space.get_objs_from_type(bmp.obj.name_to_class["rock"])), 0)
+        self.assertEqual({o.pos for o in space.get_objs_from_type(bmp.obj.name_to_class["keke"])}, {(x, 4) for x in range(6)})
+
+class ObjectIdTest(unittest.TestCase):
+    def test_ids_survive_reload(self) -> None:
+        object_list = make_rule(0, ["baba", "is", "you"]) + [{"type": "rock", "pos": [x, 2], "orient": "S"} for x in range(3)]
+        levelpack = make_levelpack((3, 3), object_list)
+        levelpack_json = levelpack.to_json()
+        self.assertEqual(sorted(o["id"] for s in levelpack_json["spaces"] for o in s["objects"]), list(range(len(object_list))))
+        new_levelpack = bmp.levelpack.json_to_levelpack(copy.deepcopy(levelpack_json))
+        self.assertEqual(new_levelpack.to_json(), levelpack_json)
+        space_id = levelpack.current_level.current_space_id
+        self.assertEqual(
+            [o.uid for o in new_levelpack.space_dict[space_id].object_list],
+            [o.uid for o in new_levelpack.space_init_state_dict[space_id].object_list],
+        )
+
+class InfixTest(unittest.TestCase):
+    def is_push(self, word_list: list[str], object_list: list[dict]) -> bool:
+        levelpack = make_levelpack((6, 6), make_rule(0, word_list) + object_list)
+        levelpack.tick(None)
+        baba = levelpack.current_level.current_space.get_objs_from_type(bmp.obj.name_to_class["baba"])[0]
+        return baba.properties.enabled(bmp.obj.TextPush)
+    def test_without(self) -> None:
+        baba = {"type": "baba", "pos": [0, 3], "orient": "S"}
+        rock = {"type": "rock", "pos": [2, 3], "orient": "S"}
+        self.assertTrue(self.is_push(["baba", "without", "rock", "is", "push"], [baba]))
+        self.assertFalse(self.is_push(["baba", "without", "rock", "is", "push"], [baba, rock]))
+    def test_facing(self) -> None:
+        self.assertTrue(self.is_push(["baba", "facing", "right", "is", "push"], [{"type": "baba", "pos": [0, 3], "orient": "D"}]))
+        self.assertFalse(self.is_push(["baba", "facing", "right", "is", "push"], [{"type": "baba", "pos": [0, 3], "orient": "S"}]))
+
+class SeedTest(unittest.TestCase):
+    def make_random_levelpack(self) -> bmp.levelpack.Levelpack:
+        object_list = make_rule(0, ["baba", "is", "you"]) + make_rule(1, ["often", "baba", "is", "win"]) + make_rule(2, ["rock", "is", "tele"])
+        object_list += [{"type": "baba", "pos": [0, 5], "orient": "S"}]
+        object_list += [{"type": "rock", "pos": [x, 5], "orient": "S"} for x in range(0, 6, 2)]
+        return make_levelpack((6, 6), object_list)
+    def get_outcomes(self, levelpack: bmp.levelpack.Levelpack) -> list[tuple[bool, tuple[int, int]]]:
+        outcome_list = []
+        for _ in range(12):
+            info = levelpack.tick(None)
+            baba = levelpack.current_level.current_space.get_objs_from_type(bmp.obj.name_to_class["baba"])[0]
+            outcome_list.append((info["win"], baba.pos))
+        return outcome_list
+    def test_seed_only_when_set(self) -> None:
+        levelpack = self.make_random_levelpack()
+        self.assertIsNone(levelpack.seed)
+        self.assertNotIn("seed", levelpack.to_json())
+        levelpack.set_seed(5)
+        self.assertEqual(bmp.levelpack.json_to_levelpack(levelpack.to_json()).seed, 5)
+    def test_reload_continues_rng(self) -> None:
+        levelpack = self.make_random_levelpack()
+        levelpack.set_seed(7)
+        for _ in range(3):
+            levelpack.tick(None)
+        reloaded_levelpack = bmp.levelpack.json_to_levelpack(levelpack.to_json())
+        self.assertIsNotNone(reloaded_levelpack.seed)
+        outcome_list = self.get_outcomes(levelpack)
+        self.assertEqual(self.get_outcomes(reloaded_levelpack), outcome_list)
+        self.assertEqual(len({w for w, _ in outcome_list}), 2)
+        self.assertNotEqual(len({p for _, p in outcome_list}), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import os
+os.environ["BMP_HEADLESS"] = "TRUE"
+
+from typing import Any
+import copy
+import unittest
+
+import bmp.loc
+import bmp.obj
+import bmp.ref
+
+def get_storage_state(storage: bmp.obj.PropertyStorage) -> tuple[Any, ...]:
+    return (storage.enabled_count(), storage.disabled_count(), {k: [(type(i.obj), i.negated, i.effected) for i in v] for k, v in storage.enabled_dict().items()})
+
+def get_state(obj: bmp.obj.Object) -> tuple[Any, ...]:
+    old_state = obj.old_state
+    return (
+        type(obj), obj.uid, obj.to_json(), obj.direct_mapping, obj.move_number, obj.sprite_state,
+        get_storage_state(obj.properties),
+        {o: get_storage_state(p) for o, p in obj.operator_properties.items()},
+        (old_state.uid, old_state.pos, old_state.orient, old_state.space, old_state.level),
+        (old_state.old_surface_pos, old_state.old_surface_size, old_state.new_surface_pos, old_state.new_surface_size),
+        None if old_state.prop is None else get_storage_state(old_state.prop),
+        old_state.prop is obj.properties,
+        getattr(obj, "level_extra", None), getattr(obj, "unlocked", None), getattr(obj, "conditions", None),
+    )
+
+def make_objects() -> dict[str, bmp.obj.Object]:
+    space_extra: bmp.obj.SpaceObjectExtra = {
+        "static_transform": {"direct": "A", "flip": True},
+        "dynamic_transform": {"direct": "D", "flip": False},
+    } # type: ignore
+    return {
+        "plain": bmp.obj.name_to_class["baba"]((1, 2), bmp.loc.Orient.D),
+        "text": bmp.obj.TextYou((3, 4), bmp.loc.Orient.A),
+        "space": bmp.obj.Space((5, 6), space_id=bmp.ref.SpaceID("space", 1), space_extra=space_extra),
+        "level": bmp.obj.Level((7, 8), level_id=bmp.ref.LevelID("level"), level_extra={"icon": {"name": "baba", "color": 0x123456}}),
+        "path": bmp.obj.Path((9, 10), unlocked=True, conditions={bmp.obj.Spore: 2}),
+    }
+
+def set_state(obj: bmp.obj.Object, alias_prop: bool) -> None:
+    obj.properties.update(bmp.obj.TextYou())
+    obj.properties.update(bmp.obj.TextPush(), negated=True)
+    obj.operator_properties[bmp.obj.TextHas].update(bmp.obj.TextText())
+    obj.move_number = 2
+    obj.sprite_state = 3
+    old_prop = obj.properties if alias_prop else bmp.obj.PropertyStorage()
+    if not alias_prop:
+        old_prop.update(bmp.obj.TextWin())
+    obj.old_state = bmp.obj.OldObjectState(
+        uid = obj.uid,
+        pos = (0, 0),
+        orient = bmp.loc.Orient.W,
+        prop = old_prop,
+        space = bmp.ref.SpaceID("old"),
+        level = bmp.ref.LevelID("old"),
+        new_surface_pos = (1.0, 2.0),
+        new_surface_size = (3.0, 4.0),
+    )
+
+class CloneTest(unittest.TestCase):
+    def test_matches_deepcopy(self) -> None:
+        for alias_prop in (True, False):
+            for name, obj in make_objects().items():
+                with self.subTest(name, alias_prop=alias_prop):
+                    set_state(obj, alias_prop)
+                    self.assertEqual(get_state(obj.clone()), get_state(copy.deepcopy(obj)))
+    def test_properties_independent(self) -> None:
+        for name, obj in make_objects().items():
+            with self.subTest(name):
+                set_state(obj, False)
+                new_obj = obj.clone()
+                new_obj.properties.update(bmp.obj.TextWin())
+                new_obj.operator_properties[bmp.obj.TextHas].update(bmp.obj.TextText())
+                new_obj.old_state.prop.update(bmp.obj.TextStop()) # type: ignore
+                self.assertEqual(get_state(obj), get_state(copy.deepcopy(obj)))
+                self.assertFalse(obj.properties.enabled(bmp.obj.TextWin))
+                self.assertEqual(obj.operator_properties[bmp.obj.TextHas].count(bmp.obj.TextText), 1)
+                self.assertFalse(obj.old_state.prop.enabled(bmp.obj.TextStop)) # type: ignore
+    def test_old_state_prop_alias(self) -> None:
+        for name, obj in make_objects().items():
+            with self.subTest(name):
+                set_state(obj, True)
+                new_obj = obj.clone()
+                self.assertIs(new_obj.old_state.prop, new_obj.properties)
+                self.assertIsNot(new_obj.properties, obj.properties)
+                set_state(obj, False)
+                new_obj = obj.clone()
+                self.assertIsNot(new_obj.old_state.prop, new_obj.properties)
+                self.assertIsNot(new_obj.old_state.prop, obj.old_state.prop)
+                new_obj.old_state.new_surface_pos = (5.0, 6.0)
+                self.assertEqual(obj.old_state.new_surface_pos, (1.0, 2.0))
+    def test_space_object_independent(self) -> None:
+        obj = make_objects()["space"]
+        assert isinstance(obj, bmp.obj.SpaceObject) and obj.space_id is not None
+        new_obj = obj.clone()
+        self.assertEqual(new_obj.space_extra, copy.deepcopy(obj).space_extra)
+        self.assertIsNot(new_obj.space_extra, obj.space_extra)
+        new_obj.space_extra["static_transform"] = bmp.loc.default_space_transform.copy()
+        new_obj.space_extra["dynamic_transform"] = bmp.loc.get_stacked_transform(new_obj.space_extra["dynamic_transform"], {"direct": "A", "flip": True})
+        self.assertEqual(obj.space_extra, {"static_transform": {"direct": "A", "flip": True}, "dynamic_transform": {"direct": "D", "flip": False}})
+        assert new_obj.space_id is not None
+        new_obj.space_id.infinite_tier += 1
+        self.assertEqual(obj.space_id, bmp.ref.SpaceID("space", 1))
+
+class EqualityTest(unittest.TestCase):
+    def test_compare_with_class(self) -> None:
+        obj = make_objects()["text"]
+        self.assertIs(obj.__eq__(bmp.obj.TextFeeling), NotImplemented)
+        self.assertFalse(obj == bmp.obj.TextFeeling)
+        self.assertTrue(obj != bmp.obj.TextFeeling)
+        self.assertNotIn(obj, [bmp.obj.TextFeeling, bmp.obj.TextWithout])
+        self.assertEqual(obj, copy.deepcopy(obj))
+        new_obj = obj.clone()
+        new_obj.reset_uid()
+        self.assertNotEqual(obj, new_obj)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import os
+os.environ["BMP_HEADLESS"] = "TRUE"
+
+import json
+import unittest
+
+import bmp.base
+import bmp.levelpack
+import bmp.ref
+import bmp.replay
+import bmp.sim
+
+def make_levelpack() -> bmp.levelpack.Levelpack:
+    outer_id = {"name": "outer", "infinite_tier": 0}
+    inner_id = {"name": "inner", "infinite_tier": 0}
+    outer_list = [{"type": f"text_{w}", "pos": [x, 0], "orient": "S"} for x, w in enumerate(["baba", "is", "you"])]
+    outer_list += [{"type": "baba", "pos": [0, 2], "orient": "S"}, {"type": "space", "pos": [2, 2], "orient": "S", "space_id": inner_id}]
+    return bmp.levelpack.json_to_levelpack({
+        "ver": bmp.base.version,
+        "current_level": {"name": "test"},
+        "levels": [{"id": {"name": "test"}, "spaces": [outer_id, inner_id], "current_space": outer_id}],
+        "spaces": [
+            {"id": outer_id, "size": [4, 4], "objects": outer_list},
+            {"id": inner_id, "size": [3, 3], "objects": []},
+        ],
+        "collectibles": [],
+        "rules": [],
+    }) # type: ignore
+
+class SpaceInputTest(unittest.TestCase):
+    def test_playback_space_input(self) -> None:
+        replay = bmp.replay.start(make_levelpack())
+        replay.record_move(None)
+        replay.record_space(bmp.ref.SpaceID("inner"))
+        replay.record_move(None)
+        replay.record_space(bmp.ref.SpaceID("outer"))
+        replay.record_space(bmp.ref.SpaceID("inner"))
+        replay = bmp.replay.json_to_replay(json.loads(json.dumps(replay.to_json())))
+        self.assertEqual(replay.inputs, ".@.@@")
+        levelpack = make_levelpack()
+        _, checkpoint_list = bmp.sim.playback(levelpack, replay, checkpoint_interval=2)
+        self.assertEqual([l.current_level.current_space_id for _, l in checkpoint_list], [bmp.ref.SpaceID("inner"), bmp.ref.SpaceID("outer"), bmp.ref.SpaceID("inner")])
+
+if __name__ == "__main__":
+    unittest.main()
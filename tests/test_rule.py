@@ -0,0 +1,44 @@
+import os
+os.environ["BMP_HEADLESS"] = "TRUE"
+
+import unittest
+
+import bmp.obj
+import bmp.ref
+import bmp.rule
+import bmp.space
+
+class StackedTextTest(unittest.TestCase):
+    def test_stacked_nouns(self) -> None:
+        cursor, level = bmp.obj.TextCursor((0, 0)), bmp.obj.TextLevel((0, 0))
+        text_is, text_you = bmp.obj.TextIs((1, 0)), bmp.obj.TextYou((2, 0))
+        rule_list = bmp.rule.get_rule_from_text_run([[cursor, level], [text_is], [text_you]])
+        self.assertEqual([r for _, r, _ in rule_list], [[cursor, text_is, text_you], [level, text_is, text_you]])
+        self.assertIs(rule_list[0][2].noun, cursor)
+        self.assertIs(rule_list[1][2].noun, level)
+        self.assertIsNot(rule_list[0][2], rule_list[1][2])
+    def test_stacked_properties(self) -> None:
+        cursor, text_is = bmp.obj.TextCursor((0, 0)), bmp.obj.TextIs((1, 0))
+        text_you, text_win = bmp.obj.TextYou((2, 0)), bmp.obj.TextWin((2, 0))
+        rule_list = bmp.rule.get_rule_from_text_run([[cursor], [text_is], [text_you, text_win]])
+        self.assertEqual(len(rule_list), 2)
+        for (_, _, info), text_prop in zip(rule_list, [text_you, text_win]):
+            self.assertIs(info.oper_list[-1].oper, text_is)
+            self.assertEqual([p.prop for p in info.oper_list[-1].prop_list], [text_prop])
+    def test_stacked_negation(self) -> None:
+        text_not, cursor, level = bmp.obj.TextNot((0, 0)), bmp.obj.TextCursor((1, 0)), bmp.obj.TextLevel((1, 0))
+        text_is, text_you = bmp.obj.TextIs((2, 0)), bmp.obj.TextYou((3, 0))
+        rule_list = bmp.rule.get_rule_from_text_run([[text_not], [cursor, level], [text_is], [text_you]])
+        negated_rule_list = [(r[1], n.noun_negated) for i, r, n in rule_list if i == 0]
+        self.assertEqual(negated_rule_list, [(cursor, True), (level, True)])
+    def test_space_rule_info(self) -> None:
+        object_list: list[bmp.obj.Object] = [
+            bmp.obj.TextCursor((0, 0)), bmp.obj.TextLevel((0, 0)),
+            bmp.obj.TextIs((1, 0)), bmp.obj.TextYou((2, 0)),
+        ]
+        space = bmp.space.Space(bmp.ref.SpaceID("test"), (3, 1), object_list=object_list)
+        space.set_rule()
+        self.assertEqual([type(n.noun) for n in space.rule_info], [bmp.obj.TextCursor, bmp.obj.TextLevel])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+os.environ["BMP_HEADLESS"] = "TRUE"
+
+import unittest
+from typing import Callable
+
+import bmp.base
+import bmp.levelpack
+import bmp.sim
+import bmp.solve
+
+def make_object(object_type: str, pos: tuple[int, int]) -> dict:
+    return {"type": object_type, "pos": list(pos), "orient": "S"}
+
+def make_rule(y: int, word_list: list[str]) -> list[dict]:
+    return [make_object(f"text_{w}", (x, y)) for x, w in enumerate(word_list)]
+
+def make_levelpack(size: tuple[int, int], object_list: list[dict]) -> bmp.levelpack.Levelpack:
+    space_id = {"name": "test", "infinite_tier": 0}
+    return bmp.levelpack.json_to_levelpack({
+        "ver": bmp.base.version,
+        "current_level": {"name": "test"},
+        "levels": [{"id": {"name": "test"}, "spaces": [space_id], "current_space": space_id}],
+        "spaces": [{"id": space_id, "size": list(size), "objects": object_list}],
+        "collectibles": [],
+        "rules": [],
+    }) # type: ignore
+
+def walk_levelpack() -> bmp.levelpack.Levelpack:
+    object_list = make_rule(0, ["baba", "is", "you"]) + make_rule(1, ["flag", "is", "win"])
+    object_list += [make_object("baba", (0, 3)), make_object("flag", (3, 3))]
+    return make_levelpack((4, 4), object_list)
+
+def seldom_levelpack() -> bmp.levelpack.Levelpack:
+    # baba cannot move at all, so every input leaves the board as it was and only the rng decides the win
+    object_list = make_rule(0, ["baba", "is", "you"]) + make_rule(1, ["seldom", "flag", "is", "win"]) + make_rule(2, ["wall", "is", "stop"])
+    object_list += [make_object("baba", (3, 3)), make_object("flag", (3, 3)), make_object("wall", (2, 3)), make_object("wall", (3, 2))]
+    levelpack = make_levelpack((4, 4), object_list)
+    levelpack.set_seed(3)
+    return levelpack
+
+class SolveTest(unittest.TestCase):
+    def assert_replay_wins(self, make: Callable[[], bmp.levelpack.Levelpack], result: bmp.solve.SolveResult) -> None:
+        replay = result["replay"]
+        self.assertIsNotNone(replay)
+        assert replay is not None
+        info, _ = bmp.sim.playback(make(), replay)
+        self.assertTrue(info["win"])
+    def test_solvable(self) -> None:
+        levelpack = walk_levelpack()
+        result = bmp.solve.solve(levelpack, levelpack.current_level_id, node_limit=1000)
+        self.assert_replay_wins(walk_levelpack, result)
+        assert result["replay"] is not None
+        self.assertEqual(len(result["replay"].inputs), 3)
+    def test_unsolvable(self) -> None:
+        object_list = make_rule(0, ["baba", "is", "you"]) + make_rule(1, ["flag", "is", "win"]) + [make_object("baba", (0, 3))]
+        levelpack = make_levelpack((4, 4), object_list)
+        result = bmp.solve.solve(levelpack, levelpack.current_level_id, node_limit=1000)
+        self.assertIsNone(result["replay"])
+        self.assertTrue(result["exhausted"])
+    def test_node_limit(self) -> None:
+        object_list = make_rule(0, ["baba", "is", "you"]) + [make_object("baba", (0, 3))]
+        levelpack = make_levelpack((6, 6), object_list)
+        result = bmp.solve.solve(levelpack, levelpack.current_level_id, node_limit=3)
+        self.assertIsNone(result["replay"])
+        self.assertFalse(result["exhausted"])
+        self.assertLessEqual(result["nodes"], 3)
+    def test_memory_limit(self) -> None:
+        levelpack = walk_levelpack()
+        result = bmp.solve.solve(levelpack, levelpack.current_level_id, memory_limit=1)
+        self.assertIsNone(result["replay"])
+        self.assertFalse(result["exhausted"])
+        self.assertEqual(result["nodes"], 0)
+    def test_random_rule(self) -> None:
+        levelpack = seldom_levelpack()
+        result = bmp.solve.solve(levelpack, levelpack.current_level_id, node_limit=1000)
+        self.assert_replay_wins(seldom_levelpack, result)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+os.environ["BMP_HEADLESS"] = "TRUE"
+
+import unittest
+
+import bmp.base
+import bmp.levelpack
+import bmp.obj
+import bmp.space
+
+def make_levelpack(word_list: list[str], space_extra: dict = {}) -> bmp.levelpack.Levelpack:
+    outer_id = {"name": "outer", "infinite_tier": 0}
+    inner_id = {"name": "inner", "infinite_tier": 0}
+    outer_list = [{"type": f"text_{w}", "pos": [x, 0], "orient": "S"} for x, w in enumerate(word_list)]
+    outer_list += [{"type": "space", "pos": [1, 2], "orient": "D", "space_id": inner_id, "space_extra": space_extra}]
+    return bmp.levelpack.json_to_levelpack({
+        "ver": bmp.base.version,
+        "current_level": {"name": "test"},
+        "levels": [{"id": {"name": "test"}, "spaces": [outer_id, inner_id], "current_space": outer_id}],
+        "spaces": [
+            {"id": outer_id, "size": [4, 4], "objects": outer_list},
+            {"id": inner_id, "size": [3, 3], "objects": []},
+        ],
+        "collectibles": [],
+        "rules": [],
+    }) # type: ignore
+
+def get_space_hash(space: bmp.space.Space) -> int:
+    return sum(bmp.space.get_object_hash(o) for o in space.object_list) & bmp.base.hash_mask
+
+class StateHashTest(unittest.TestCase):
+    def test_transform_in_hash(self) -> None:
+        levelpack = make_levelpack([])
+        turned_levelpack = make_levelpack([], {"static_transform": {"direct": "A", "flip": False}})
+        flipped_levelpack = make_levelpack([], {"dynamic_transform": {"direct": "S", "flip": True}})
+        state_hash_set = {l.get_state_hash() for l in (levelpack, turned_levelpack, flipped_levelpack)}
+        self.assertEqual(len(state_hash_set), 3)
+    def test_hash_after_transform(self) -> None:
+        for word in ["turn", "flip", "up"]:
+            with self.subTest(word=word):
+                levelpack = make_levelpack(["space", "is", word])
+                old_state_hash = levelpack.get_state_hash()
+                levelpack.tick(None)
+                space = levelpack.current_level.current_space
+                self.assertEqual(space.state_hash, get_space_hash(space))
+                self.assertNotEqual(levelpack.get_state_hash(), old_state_hash)
+    def test_hash_cache_bounded(self) -> None:
+        obj = bmp.obj.name_to_class["baba"]((0, 0))
+        first_hash = bmp.space.get_object_hash(obj)
+        for x in range(bmp.space.object_hash_cache_size + 1):
+            obj.pos = (x, 1)
+            bmp.space.get_object_hash(obj)
+        self.assertLessEqual(bmp.space.get_object_key_hash.cache_info().currsize, bmp.space.object_hash_cache_size)
+        obj.pos = (0, 0)
+        self.assertEqual(bmp.space.get_object_hash(obj), first_hash)
+
+if __name__ == "__main__":
+    unittest.main()